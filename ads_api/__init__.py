@@ -1,9 +1,58 @@
 """
 Google Ads API 集成模块
 提供与Google Ads API交互的功能
+
+导出的名称在第一次访问时才导入对应的子模块 (PEP 562)，
+import ads_api 不会加载google-ads库、gRPC和protobuf模块，也不会读取config.py。
 """
 
-from .client import GoogleAdsClient
-from .keyword_data import get_keyword_data, analyze_keyword_type
+import logging
+import importlib
+
+# 导出的名称 -> 所在的子模块
+_EXPORTS = {
+    'GoogleAdsClient': '.client',
+    'get_keyword_data': '.keyword_data',
+    'get_keyword_data_multi_location': '.keyword_data',
+    'get_keywords_data_batch': '.keyword_data',
+    'analyze_keyword_type': '.keyword_data',
+    'get_keywords_metrics': '.keyword_metrics',
+    'IdeaCache': '.idea_cache',
+    'default_idea_cache': '.idea_cache',
+    'KeywordRecord': '.records',
+    'KeywordBatch': '.records',
+    'LinearScoringModel': '.scoring',
+    'register_model': '.scoring',
+    'score_batch': '.scoring',
+    'IntentClassifier': '.intent',
+    'classify_batch': '.intent',
+    'KeywordBatcher': '.batcher',
+    'ResultCache': '.result_cache',
+    'get_keyword_data_cached': '.result_cache',
+    'TokenBucket': '.rate_limit',
+    'RetryPolicy': '.retry',
+    'CircuitBreaker': '.retry',
+    'call_with_retry': '.retry',
+    'AccountPool': '.account_pool',
+    'PoolMember': '.account_pool',
+    'AsyncGoogleAdsClient': '.async_client',
+    'async_get_keyword_data': '.async_keyword_data',
+    'async_get_keywords_data': '.async_keyword_data',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    """第一次访问导出的名称时导入所在的子模块，之后直接从模块属性中读取"""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
-__all__ = ['GoogleAdsClient', 'get_keyword_data', 'analyze_keyword_type']
+# 包本身不配置日志，由调用方配置
+logging.getLogger(__name__).addHandler(logging.NullHandler())
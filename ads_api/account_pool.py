@@ -0,0 +1,243 @@
+"""
+账户池模块
+在多组API凭据和客户账户之间分配请求，配额耗尽的账户在冷却期间退出轮换
+"""
+
+import time
+import logging
+import threading
+from .client import GoogleAdsClient
+from .retry import RetryPolicy, CircuitBreaker, classify_error, default_retry_policy
+
+logger = logging.getLogger(__name__)
+
+# 分配策略
+STRATEGY_LEAST_LOADED = 'least_loaded'                  # 选择 (进行中的请求数 / 权重) 最小的账户
+STRATEGY_WEIGHTED_ROUND_ROBIN = 'weighted_round_robin'  # 按权重平滑轮询
+STRATEGIES = (STRATEGY_LEAST_LOADED, STRATEGY_WEIGHTED_ROUND_ROBIN)
+
+# 账户配额耗尽后第一次冷却的时长 (秒)，连续耗尽时加倍，最长不超过DEFAULT_MAX_COOLDOWN
+DEFAULT_COOLDOWN = 60.0
+DEFAULT_MAX_COOLDOWN = 900.0
+
+class PoolMember:
+    """
+    账户池中的一个账户
+    
+    每个账户有自己的GoogleAdsClient和熔断器，配额耗尽时只有该账户进入冷却。
+    账户自身不重试请求，熔断器也不等待冷却 (fail_fast)，由账户池换用其他账户重试。
+    """
+    
+    def __init__(self, name, config, weight=1, cooldown=DEFAULT_COOLDOWN, max_cooldown=DEFAULT_MAX_COOLDOWN, limiter=None):
+        """
+        初始化账户
+        
+        Args:
+            name: 账户名称 (用于日志)
+            config: 该账户的API配置字典 (格式与config.GOOGLE_ADS相同)
+            weight: 权重 (大于0)
+            cooldown: 配额耗尽后第一次冷却的时长 (秒)
+            max_cooldown: 冷却时长上限 (秒)
+            limiter: 所有账户共享的TokenBucket (可选，每个RPC获取一个令牌)
+        """
+        if weight <= 0:
+            raise ValueError(f"账户 {name} 的权重必须大于0: {weight}")
+        self.name = name
+        self.config = config
+        self.customer_id = config.get('login_customer_id', '')
+        self.weight = weight
+        self.breaker = CircuitBreaker(cooldown=cooldown, max_cooldown=max_cooldown, fail_fast=True)
+        self.client = GoogleAdsClient(config, retry_policy=RetryPolicy(max_attempts=1), breaker=self.breaker, limiter=limiter)
+        self.in_flight = 0
+        self.request_count = 0
+        self.error_count = 0
+        # 平滑加权轮询的当前权重
+        self.current_weight = 0
+    
+    def available(self):
+        """账户是否可用 (不在冷却中)"""
+        return self.breaker.remaining() <= 0
+    
+    def __repr__(self):
+        return f"PoolMember(name={self.name!r}, customer_id={self.customer_id!r}, weight={self.weight})"
+
+class AccountPool:
+    """
+    账户池
+    
+    call(func, ...) 选择一个可用的账户，以 func(client, customer_id, ...) 的形式调用，
+    与get_keyword_data等函数的参数顺序相同。配额耗尽的账户进入冷却并立即换用其他账户重试，
+    其他可重试的错误按重试策略等待后重试；所有账户都在冷却时等待最早恢复的账户。
+    """
+    
+    def __init__(self, members, strategy=STRATEGY_LEAST_LOADED, retry_policy=None):
+        """
+        初始化账户池
+        
+        Args:
+            members: PoolMember列表
+            strategy: 分配策略 (见STRATEGIES)
+            retry_policy: 账户池的重试策略 (默认使用进程内共享的重试策略)
+        
+        Raises:
+            ValueError: 如果没有账户或分配策略无效
+        """
+        if not members:
+            raise ValueError("账户池至少需要一个账户")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"无效的分配策略: {strategy}")
+        self.members = list(members)
+        self.strategy = strategy
+        self.retry_policy = retry_policy or default_retry_policy
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, base_config, accounts, cooldown=DEFAULT_COOLDOWN, limiter=None, **kwargs):
+        """
+        根据配置创建账户池
+        
+        Args:
+            base_config: 公共的API配置字典 (如config.GOOGLE_ADS)
+            accounts: 账户配置列表，每项覆盖base_config中的字段 (如developer_token、login_customer_id)，
+                      还可以包含name和weight
+            cooldown: 配额耗尽后第一次冷却的时长 (秒)
+            limiter: 所有账户共享的TokenBucket (可选)
+            **kwargs: 传给AccountPool的其他参数
+        
+        Returns:
+            AccountPool
+        """
+        members = []
+        for index, account in enumerate(accounts, 1):
+            config = dict(base_config)
+            config.update(account)
+            name = account.get('name') or config.get('login_customer_id') or f"account{index}"
+            members.append(PoolMember(name, config, weight=account.get('weight', 1), cooldown=cooldown, limiter=limiter))
+        return cls(members, **kwargs)
+    
+    @classmethod
+    def from_accessible_customers(cls, client, base_config, **kwargs):
+        """
+        使用当前凭据可以直接访问的所有客户账户创建账户池
+        
+        Args:
+            client: GoogleAdsClient实例
+            base_config: 公共的API配置字典
+            **kwargs: 传给from_config的其他参数
+        
+        Returns:
+            AccountPool
+        """
+        customer_service = client.get_service("CustomerService")
+        resource_names = customer_service.list_accessible_customers().resource_names
+        accounts = []
+        for resource_name in resource_names:
+            customer_id = resource_name.split('/')[-1].replace('-', '')
+            # 直接访问的账户使用自身作为login-customer-id
+            accounts.append({'login_customer_id': customer_id, 'manager_customer_id': customer_id})
+        logger.info(f"找到 {len(accounts)} 个可访问的客户账户")
+        return cls.from_config(base_config, accounts, **kwargs)
+    
+    def _select(self):
+        """选择一个可用的账户并计入进行中的请求，没有可用账户时返回None"""
+        with self._lock:
+            candidates = [member for member in self.members if member.available()]
+            if not candidates:
+                return None
+            if self.strategy == STRATEGY_LEAST_LOADED:
+                member = min(candidates, key=lambda m: (m.in_flight / m.weight, m.request_count / m.weight))
+            else:
+                total = sum(m.weight for m in candidates)
+                for candidate in candidates:
+                    candidate.current_weight += candidate.weight
+                member = max(candidates, key=lambda m: m.current_weight)
+                member.current_weight -= total
+            member.in_flight += 1
+            member.request_count += 1
+            return member
+    
+    def acquire(self):
+        """
+        获取一个可用的账户 (所有账户都在冷却时等待)，使用完后需要调用release
+        
+        Returns:
+            PoolMember
+        """
+        while True:
+            member = self._select()
+            if member is not None:
+                return member
+            wait = min(m.breaker.remaining() for m in self.members)
+            logger.warning(f"所有账户都在冷却中，等待 {wait:.1f} 秒")
+            time.sleep(max(wait, 0.01))
+    
+    def release(self, member):
+        """
+        归还账户
+        
+        Args:
+            member: acquire返回的账户
+        """
+        with self._lock:
+            member.in_flight -= 1
+    
+    def call(self, func, *args, **kwargs):
+        """
+        使用池中的账户调用func(client, customer_id, *args, **kwargs)
+        
+        Args:
+            func: 调用函数 (如get_keyword_data)
+            *args, **kwargs: 传给func的其他参数
+        
+        Returns:
+            func的返回值
+        
+        Raises:
+            最后一次调用的异常 (不可重试或重试次数用尽时)
+        """
+        # 配额耗尽时换用其他账户，每个账户至少有一次机会
+        max_attempts = self.retry_policy.max_attempts + len(self.members) - 1
+        attempt = 0
+        while True:
+            member = self.acquire()
+            attempt += 1
+            try:
+                return func(member.client, member.customer_id, *args, **kwargs)
+            except Exception as e:
+                info = classify_error(e)
+                with self._lock:
+                    member.error_count += 1
+                if info.quota_exhausted:
+                    if member.available():
+                        member.breaker.record_quota_error(info.retry_delay)
+                    logger.warning(f"账户 {member.name} 配额耗尽，冷却 {member.breaker.remaining():.1f} 秒")
+                if not info.retryable or attempt >= max_attempts:
+                    raise
+                if not info.quota_exhausted:
+                    if self.retry_policy.exceeds_max_delay(info.retry_delay):
+                        raise
+                    delay = self.retry_policy.compute_delay(attempt, info.retry_delay)
+                    logger.warning(f"账户 {member.name} 请求失败 (第{attempt}次): {e}，{delay:.1f}秒后重试")
+                    time.sleep(delay)
+            finally:
+                self.release(member)
+    
+    def stats(self):
+        """
+        获取每个账户的统计信息
+        
+        Returns:
+            list: 每个账户的 name、customer_id、in_flight、requests、errors、cooldown (剩余冷却秒数)
+        """
+        with self._lock:
+            return [
+                {
+                    'name': member.name,
+                    'customer_id': member.customer_id,
+                    'in_flight': member.in_flight,
+                    'requests': member.request_count,
+                    'errors': member.error_count,
+                    'cooldown': round(member.breaker.remaining(), 1),
+                }
+                for member in self.members
+            ]
@@ -0,0 +1,277 @@
+"""
+Google Ads API 异步客户端
+基于grpc.aio传输，在单个事件循环中并发发送请求
+"""
+
+import asyncio
+import logging
+import grpc
+from google.auth.transport.grpc import AuthMetadataPlugin
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google.ads.googleads.errors import GoogleAdsException
+from .client import GoogleAdsClient
+from .retry import async_call_with_retry
+
+logger = logging.getLogger(__name__)
+
+# Google Ads API服务地址
+DEFAULT_ENDPOINT = "googleads.googleapis.com:443"
+# OAuth令牌地址
+TOKEN_URI = "https://oauth2.googleapis.com/token"
+# 默认的最大并发请求数
+DEFAULT_MAX_CONCURRENCY = 100
+
+class AsyncGoogleAdsClient:
+    """
+    Google Ads API异步客户端封装类
+    
+    请求对象、枚举和资源名称由同步的GoogleAdsClient构建 (不涉及网络)，
+    RPC通过grpc.aio通道发送。所有请求共享一个信号量以限制并发数量。
+    """
+    
+    def __init__(self, config, max_concurrency=DEFAULT_MAX_CONCURRENCY, endpoint=None):
+        """
+        初始化Google Ads API异步客户端
+        
+        Args:
+            config: 包含API凭据的配置字典
+            max_concurrency: 最大并发请求数
+            endpoint: API服务地址 (默认: googleads.googleapis.com:443)
+        """
+        self.config = config
+        self.sync_client = GoogleAdsClient(config)
+        self.version = self.sync_client.version
+        self.endpoint = endpoint or config.get('endpoint', DEFAULT_ENDPOINT)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self._channel = None
+        self._methods = {}
+    
+    def _create_channel(self):
+        """创建带OAuth凭据的grpc.aio通道 (config中insecure为True时创建不加密、不带凭据的通道)"""
+        if self.config.get('insecure'):
+            logger.warning(f"使用不加密的异步gRPC通道连接 {self.endpoint} (只用于本地测试)")
+            return grpc.aio.insecure_channel(self.endpoint)
+        credentials = Credentials(
+            None,
+            refresh_token=self.config['refresh_token'],
+            client_id=self.config['client_id'],
+            client_secret=self.config['client_secret'],
+            token_uri=TOKEN_URI,
+        )
+        call_credentials = grpc.metadata_call_credentials(AuthMetadataPlugin(credentials, Request()))
+        channel_credentials = grpc.composite_channel_credentials(grpc.ssl_channel_credentials(), call_credentials)
+        logger.info(f"创建异步gRPC通道: {self.endpoint}")
+        return grpc.aio.secure_channel(self.endpoint, channel_credentials)
+    
+    def get_channel(self):
+        """
+        获取grpc.aio通道 (首次调用时创建)
+        
+        Returns:
+            grpc.aio.Channel
+        """
+        if self._channel is None:
+            self._channel = self._create_channel()
+        return self._channel
+    
+    def get_metadata(self, extra=None):
+        """
+        获取请求元数据
+        
+        Args:
+            extra: 额外的请求元数据 (同名键覆盖默认值)
+        
+        Returns:
+            list: gRPC元数据
+        """
+        metadata = {"developer-token": self.config['developer_token']}
+        login_customer_id = self.config.get('manager_customer_id') or self.config.get('login_customer_id')
+        if login_customer_id:
+            metadata["login-customer-id"] = str(login_customer_id)
+        for key, value in extra or ():
+            if value:
+                metadata[key] = str(value)
+        return list(metadata.items())
+    
+    def get_method(self, service_name, method_name, request_type, response_type):
+        """
+        获取一元RPC方法 (每个方法只创建一次)
+        
+        Args:
+            service_name: 服务名称 (如KeywordPlanIdeaService)
+            method_name: 方法名称 (如GenerateKeywordIdeas)
+            request_type: 请求类型名称
+            response_type: 响应类型名称
+        
+        Returns:
+            grpc.aio.UnaryUnaryMultiCallable
+        """
+        path = f"/google.ads.googleads.{self.version}.services.{service_name}/{method_name}"
+        method = self._methods.get(path)
+        if method is None:
+            request_class = type(self.sync_client.get_type(request_type))
+            response_class = type(self.sync_client.get_type(response_type))
+            method = self.get_channel().unary_unary(
+                path,
+                request_serializer=message_serializer(request_class),
+                response_deserializer=message_deserializer(response_class),
+            )
+            self._methods[path] = method
+        return method
+    
+    async def call(self, service_name, method_name, request, request_type, response_type, timeout=None, metadata=None, deadline=None):
+        """
+        发送一元RPC请求 (可重试的错误按默认重试策略重试)
+        
+        timeout和deadline限制的是整个调用：每次尝试的gRPC超时为剩余时间，
+        重试等待会超过截止时间时不再重试。
+        
+        Args:
+            service_name: 服务名称
+            method_name: 方法名称
+            request: 请求对象
+            request_type: 请求类型名称
+            response_type: 响应类型名称
+            timeout: 整个调用 (包括重试) 的超时秒数
+            metadata: 额外的请求元数据
+            deadline: 整个调用的截止时间 (事件循环的loop.time())，指定时忽略timeout
+        
+        Returns:
+            响应对象
+        
+        Raises:
+            GoogleAdsException: 如果API返回了GoogleAdsFailure
+        """
+        method = self.get_method(service_name, method_name, request_type, response_type)
+        loop = asyncio.get_running_loop()
+        if deadline is None and timeout is not None:
+            deadline = loop.time() + timeout
+        
+        async def call_once():
+            async with self.semaphore:
+                # 等待信号量的时间也计入截止时间
+                remaining = None if deadline is None else max(0.0, deadline - loop.time())
+                try:
+                    return await method(request, timeout=remaining, metadata=self.get_metadata(metadata))
+                except grpc.aio.AioRpcError as error:
+                    converted = self._convert_error(error)
+                    if converted is error:
+                        raise
+                    raise converted from error
+        
+        # 重试等待期间不占用信号量
+        return await async_call_with_retry(call_once, description=f"{method_name}请求", deadline=deadline)
+    
+    async def generate_keyword_ideas(self, request, timeout=None, metadata=None):
+        """
+        发送GenerateKeywordIdeas请求并获取所有分页结果
+        
+        Args:
+            request: GenerateKeywordIdeasRequest
+            timeout: 整个调用 (包括所有分页) 的超时秒数
+            metadata: 额外的请求元数据
+        
+        Returns:
+            list: GenerateKeywordIdeaResult列表
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        results = []
+        while True:
+            response = await self.call(
+                "KeywordPlanIdeaService", "GenerateKeywordIdeas", request,
+                "GenerateKeywordIdeasRequest", "GenerateKeywordIdeaResponse",
+                metadata=metadata, deadline=deadline
+            )
+            results.extend(response.results)
+            if not response.next_page_token:
+                return results
+            request.page_token = response.next_page_token
+    
+    async def generate_keyword_historical_metrics(self, request, timeout=None, metadata=None):
+        """
+        发送GenerateKeywordHistoricalMetrics请求
+        
+        Args:
+            request: GenerateKeywordHistoricalMetricsRequest
+            timeout: 整个调用 (包括重试) 的超时秒数
+            metadata: 额外的请求元数据
+        
+        Returns:
+            GenerateKeywordHistoricalMetricsResponse
+        """
+        return await self.call(
+            "KeywordPlanIdeaService", "GenerateKeywordHistoricalMetrics", request,
+            "GenerateKeywordHistoricalMetricsRequest", "GenerateKeywordHistoricalMetricsResponse",
+            timeout=timeout, metadata=metadata
+        )
+    
+    def _convert_error(self, error):
+        """
+        把AioRpcError转换为GoogleAdsException (与同步客户端一致)
+        
+        Args:
+            error: grpc.aio.AioRpcError
+        
+        Returns:
+            Exception: GoogleAdsException，没有GoogleAdsFailure时返回原始错误
+        """
+        failure = None
+        request_id = None
+        for key, value in error.trailing_metadata() or ():
+            if key.endswith("googleadsfailure-bin"):
+                failure_class = type(self.sync_client.get_type("GoogleAdsFailure"))
+                failure = message_deserializer(failure_class)(value)
+            elif key == "request-id":
+                request_id = value
+        if failure is None:
+            return error
+        return GoogleAdsException(error, error, failure, request_id)
+    
+    async def close(self):
+        """关闭grpc.aio通道"""
+        if self._channel is not None:
+            await self._channel.close()
+            self._channel = None
+            self._methods.clear()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    def __getattr__(self, name):
+        # 请求构建相关的方法 (get_type, get_enum, new_keyword_ideas_request等) 委托给同步客户端
+        if name == 'sync_client':
+            raise AttributeError(name)
+        return getattr(self.sync_client, name)
+
+def message_serializer(message_class):
+    """
+    获取消息类的序列化函数 (同时支持proto-plus和原生protobuf)
+    
+    Args:
+        message_class: 消息类
+    
+    Returns:
+        callable: 消息 -> bytes
+    """
+    if hasattr(message_class, 'SerializeToString'):
+        return message_class.SerializeToString
+    return message_class.serialize
+
+def message_deserializer(message_class):
+    """
+    获取消息类的反序列化函数 (同时支持proto-plus和原生protobuf)
+    
+    Args:
+        message_class: 消息类
+    
+    Returns:
+        callable: bytes -> 消息
+    """
+    if hasattr(message_class, 'FromString'):
+        return message_class.FromString
+    return message_class.deserialize
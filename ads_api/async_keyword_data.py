@@ -0,0 +1,134 @@
+"""
+异步关键词数据模块
+get_keyword_data的asyncio版本，基于AsyncGoogleAdsClient
+"""
+
+import asyncio
+import logging
+from google.ads.googleads.errors import GoogleAdsException
+from .idea_cache import default_idea_cache
+from .keyword_data import (
+    build_keyword_ideas_request,
+    build_request_metadata,
+    get_cached_keyword_data,
+    merge_keyword_data,
+    process_response,
+)
+
+logger = logging.getLogger(__name__)
+
+async def async_get_keyword_data(client, customer_id, keyword, language_id="1000", location_id="2840", idea_cache=default_idea_cache, timeout=None):
+    """
+    异步获取关键词数据
+    
+    特定国家请求和全球请求并发发送。取消协程时会同时取消进行中的RPC。
+    
+    Args:
+        client: AsyncGoogleAdsClient实例
+        customer_id: 客户ID
+        keyword: 要查询的关键词
+        language_id: 语言ID (默认为1000，英语)
+        location_id: 位置ID (默认为2840，美国)
+        idea_cache: 关键词提示缓存 (为None时不使用缓存)
+        timeout: 每个请求的超时秒数 (deadline)
+        
+    Returns:
+        dict: 包含关键词数据的字典
+    """
+    logger.info("开始异步获取关键词数据: %s, 客户ID: %s", keyword, customer_id)
+    
+    # 先查询关键词提示缓存
+    if idea_cache is not None:
+        cached_data = get_cached_keyword_data(idea_cache, keyword, language_id, location_id)
+        if cached_data:
+            logger.info("从关键词提示缓存获取数据: %s", keyword)
+            return cached_data
+    
+    metadata = build_request_metadata(client)
+    
+    us_request = build_keyword_ideas_request(client, customer_id, language_id, location_id)
+    us_request.keyword_seed.keywords.append(keyword)
+    # 不设置geo_target_constants，以获取全球数据
+    global_request = build_keyword_ideas_request(client, customer_id, language_id)
+    global_request.keyword_seed.keywords.append(keyword)
+    
+    us_task = asyncio.ensure_future(client.generate_keyword_ideas(us_request, timeout=timeout, metadata=metadata))
+    global_task = asyncio.ensure_future(client.generate_keyword_ideas(global_request, timeout=timeout, metadata=metadata))
+    
+    try:
+        us_response = await us_task
+    except GoogleAdsException as ex:
+        global_task.cancel()
+        logger.error("Google Ads API错误 (美国请求): %s", ex)
+        for error in ex.failure.errors:
+            logger.error("\t%s: %s", error.error_code, error.message)
+        raise
+    except BaseException:
+        # 包括CancelledError：取消另一个进行中的请求
+        global_task.cancel()
+        raise
+    
+    try:
+        global_response = await global_task
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error("获取全球数据失败: %s", e)
+        logger.warning("将使用美国数据作为全球数据的替代")
+        global_response = None
+    
+    keyword_data = {}
+    us_keyword_data = process_response(
+        us_response, keyword,
+        idea_cache=idea_cache, language_id=language_id, location_id=location_id
+    )
+    if us_keyword_data:
+        global_keyword_data = None
+        if global_response:
+            global_keyword_data = process_response(
+                global_response, keyword,
+                idea_cache=idea_cache, language_id=language_id, location_id=None
+            )
+            if not global_keyword_data:
+                logger.warning("未找到全球数据，使用美国数据作为替代")
+        else:
+            logger.warning("全球请求失败，使用美国数据作为替代")
+        keyword_data = merge_keyword_data(us_keyword_data, global_keyword_data)
+    else:
+        logger.warning("未找到关键词 '%s' 的数据", keyword)
+    
+    return keyword_data
+
+async def async_get_keywords_data(client, customer_id, keywords, language_id="1000", location_id="2840", concurrency=None, timeout=None, return_exceptions=False):
+    """
+    异步并发获取多个关键词的数据
+    
+    Args:
+        client: AsyncGoogleAdsClient实例
+        customer_id: 客户ID
+        keywords: 要查询的关键词列表
+        language_id: 语言ID (默认为1000，英语)
+        location_id: 位置ID (默认为2840，美国)
+        concurrency: 同时处理的关键词数量上限 (为None时只受客户端信号量限制)
+        timeout: 每个请求的超时秒数 (deadline)
+        return_exceptions: 为True时把出错关键词的异常作为结果返回，否则第一个错误会取消其余请求
+        
+    Returns:
+        dict: 关键词 -> 关键词数据字典 (或异常)
+    """
+    semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+    
+    async def lookup(keyword):
+        if semaphore is None:
+            return await async_get_keyword_data(client, customer_id, keyword, language_id, location_id, timeout=timeout)
+        async with semaphore:
+            return await async_get_keyword_data(client, customer_id, keyword, language_id, location_id, timeout=timeout)
+    
+    tasks = [asyncio.ensure_future(lookup(keyword)) for keyword in keywords]
+    try:
+        results = await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    return dict(zip(keywords, results))
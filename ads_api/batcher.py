@@ -0,0 +1,185 @@
+"""
+关键词查询微批处理模块
+把多个调用方各自提交的单个关键词查询在短时间窗口内收集起来，合并为一个多种子关键词请求
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from .keyword_data import MAX_SEED_KEYWORDS, get_keywords_data_batch
+from .idea_cache import default_idea_cache
+
+logger = logging.getLogger(__name__)
+
+# 默认的收集窗口 (秒)，第一个关键词提交后最多等待这么久就发送请求
+DEFAULT_MAX_WAIT = 0.05
+# 同时发送的批量请求数量
+DEFAULT_MAX_CONCURRENT_BATCHES = 4
+
+class KeywordBatcher:
+    """
+    关键词查询微批处理器
+    
+    submit提交单个关键词并立即返回Future。相同语言和位置的关键词进入同一个批次，
+    批次达到max_batch_size个关键词或第一个关键词已等待max_wait秒时，
+    由后台线程通过get_keywords_data_batch发送一个请求，再把结果分别设置到每个调用方的Future。
+    并发量低时每个查询最多增加max_wait秒的延迟，并发量高时请求数按批次大小成倍减少。
+    
+    与get_keyword_data不同，没有精确匹配的关键词得到空字典，不会退回到第一个关键词提示。
+    """
+    
+    def __init__(self, client, customer_id, max_batch_size=MAX_SEED_KEYWORDS, max_wait=DEFAULT_MAX_WAIT,
+                 max_concurrent_batches=DEFAULT_MAX_CONCURRENT_BATCHES, idea_cache=default_idea_cache,
+                 fetch_batch=get_keywords_data_batch):
+        """
+        初始化微批处理器
+        
+        Args:
+            client: GoogleAdsClient实例
+            customer_id: 客户ID
+            max_batch_size: 每个批次最多包含的关键词数量 (最大为MAX_SEED_KEYWORDS)
+            max_wait: 收集窗口 (秒)
+            max_concurrent_batches: 同时发送的批量请求数量
+            idea_cache: 关键词提示缓存 (为None时不使用缓存)
+            fetch_batch: 批量查询函数 (参数与get_keywords_data_batch相同)
+        """
+        self.client = client
+        self.customer_id = customer_id
+        self.max_batch_size = max(1, min(max_batch_size, MAX_SEED_KEYWORDS))
+        self.max_wait = max_wait
+        self.idea_cache = idea_cache
+        self.fetch_batch = fetch_batch
+        self.batch_count = 0
+        self.keyword_count = 0
+        # (语言ID, 位置ID) -> [(关键词, Future)]，以及每组的发送时间
+        self._groups = OrderedDict()
+        self._deadlines = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_batches, thread_name_prefix='keyword-batch')
+        self._thread = threading.Thread(target=self._run, name='keyword-batcher', daemon=True)
+        self._thread.start()
+    
+    def submit(self, keyword, language_id="1000", location_id="2840"):
+        """
+        提交一个关键词查询
+        
+        Args:
+            keyword: 关键词
+            language_id: 语言ID (默认为1000，英语)
+            location_id: 位置ID (默认为2840，美国)
+        
+        Returns:
+            concurrent.futures.Future: 结果为关键词数据字典 (未找到数据时为空字典)
+        
+        Raises:
+            RuntimeError: 如果微批处理器已关闭
+        """
+        future = Future()
+        group = (str(language_id), str(location_id))
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("微批处理器已关闭")
+            items = self._groups.get(group)
+            if items is None:
+                items = self._groups[group] = []
+                self._deadlines[group] = time.monotonic() + self.max_wait
+            items.append((keyword, future))
+            self.keyword_count += 1
+            if len(items) >= self.max_batch_size:
+                self._dispatch(group)
+            elif len(items) == 1:
+                self._condition.notify()
+        return future
+    
+    def lookup(self, keyword, language_id="1000", location_id="2840", timeout=None):
+        """
+        查询单个关键词 (阻塞直到所在的批次完成)
+        
+        Args:
+            keyword: 关键词
+            language_id: 语言ID
+            location_id: 位置ID
+            timeout: 最长等待秒数 (为None时一直等待)
+        
+        Returns:
+            dict: 关键词数据 (未找到数据时为空字典)
+        
+        Raises:
+            批量查询抛出的异常，或concurrent.futures.TimeoutError
+        """
+        return self.submit(keyword, language_id, location_id).result(timeout)
+    
+    def _dispatch(self, group):
+        """把一组关键词交给线程池发送 (调用时需持有锁)"""
+        items = self._groups.pop(group)
+        del self._deadlines[group]
+        self.batch_count += 1
+        self._executor.submit(self._send, group, items)
+    
+    def _run(self):
+        """后台线程: 在每组的收集窗口结束时发送该组"""
+        with self._condition:
+            while True:
+                if not self._groups:
+                    if self._closed:
+                        return
+                    self._condition.wait()
+                    continue
+                now = time.monotonic()
+                for group, deadline in list(self._deadlines.items()):
+                    if deadline <= now:
+                        self._dispatch(group)
+                if self._deadlines:
+                    self._condition.wait(min(self._deadlines.values()) - now)
+    
+    def _send(self, group, items):
+        """发送一个批次并设置每个调用方的结果"""
+        # 跳过已被调用方取消的查询
+        items = [(keyword, future) for keyword, future in items if future.set_running_or_notify_cancel()]
+        if not items:
+            return
+        language_id, location_id = group
+        keywords = [keyword for keyword, _ in items]
+        logger.debug("发送微批次: %s 个关键词 (语言 %s, 位置 %s)", len(keywords), language_id, location_id)
+        try:
+            results = self.fetch_batch(
+                self.client, self.customer_id, keywords,
+                language_id=language_id,
+                location_id=location_id,
+                batch_size=self.max_batch_size,
+                idea_cache=self.idea_cache
+            )
+        except Exception as e:
+            for _, future in items:
+                future.set_exception(e)
+            return
+        for keyword, future in items:
+            future.set_result(dict(results.get(keyword) or {}))
+    
+    def flush(self):
+        """立即发送所有正在收集的批次"""
+        with self._condition:
+            for group in list(self._groups):
+                self._dispatch(group)
+    
+    def close(self):
+        """发送剩余的批次，等待所有请求完成后停止后台线程"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            for group in list(self._groups):
+                self._dispatch(group)
+            self._condition.notify()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        return False
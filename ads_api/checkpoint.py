@@ -0,0 +1,165 @@
+"""
+批处理检查点模块
+记录批量任务中每个关键词的处理状态，用于中断后恢复
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 关键词处理状态
+STATUS_DONE = 'done'
+STATUS_NO_DATA = 'no_data'
+STATUS_FAILED = 'failed'
+
+# 恢复任务时可以跳过的状态 (失败的关键词会重新处理)
+FINISHED_STATUSES = {STATUS_DONE, STATUS_NO_DATA}
+
+class CheckpointJournal:
+    """
+    检查点日志
+    
+    以JSON Lines格式追加记录每个关键词的处理状态，同一关键词以最后一条记录为准。
+    每条记录写入后立即flush，进程被终止时最多丢失正在写入的一条记录。
+    只有恢复任务时读取的已有记录保存在内存中，本次写入的记录只计数，内存占用不随输入增长。
+    """
+    
+    def __init__(self, path, fsync=False):
+        """
+        初始化检查点日志
+        
+        Args:
+            path: 日志文件路径
+            fsync: 是否在每条记录后调用fsync (更安全但更慢)
+        """
+        self.path = path
+        self.fsync = fsync
+        self.statuses = {}
+        self.counts = {}
+        self._file = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def path_for(output_file):
+        """
+        获取输出文件对应的检查点日志路径
+        
+        Args:
+            output_file: 输出文件路径
+        
+        Returns:
+            str: 检查点日志路径
+        """
+        return f"{output_file}.journal"
+    
+    def load(self):
+        """
+        读取已有的检查点日志
+        
+        Returns:
+            dict: 关键词 -> 最后记录的状态
+        """
+        self.statuses = {}
+        if not os.path.exists(self.path):
+            return self.statuses
+        
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    self.statuses[record['keyword']] = record['status']
+                except (ValueError, KeyError):
+                    # 进程中断时最后一行可能不完整
+                    logger.warning(f"忽略检查点日志中无效的第{line_number}行")
+        logger.info(f"读取检查点日志: {len(self.statuses)} 个关键词")
+        return self.statuses
+    
+    def open(self, resume=False):
+        """
+        打开检查点日志用于写入
+        
+        Args:
+            resume: 为True时追加到已有日志，否则清空日志
+        """
+        if resume:
+            self.load()
+        else:
+            self.statuses = {}
+        self.counts = {}
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+    
+    def is_finished(self, keyword):
+        """
+        关键词是否已经处理完成 (包括没有数据的关键词)
+        
+        Args:
+            keyword: 关键词
+        
+        Returns:
+            bool
+        """
+        return self.statuses.get(keyword) in FINISHED_STATUSES
+    
+    def record(self, keyword, status):
+        """
+        记录关键词的处理状态
+        
+        Args:
+            keyword: 关键词
+            status: 处理状态 (STATUS_DONE / STATUS_NO_DATA / STATUS_FAILED)
+        """
+        line = json.dumps({'keyword': keyword, 'status': status, 'ts': round(time.time(), 3)}, ensure_ascii=False)
+        with self._lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+            self._file.write(line + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+    
+    def record_many(self, keywords, status):
+        """
+        批量记录关键词的处理状态 (只flush一次)
+        
+        Args:
+            keywords: 关键词列表
+            status: 处理状态
+        """
+        now = round(time.time(), 3)
+        lines = "".join(
+            json.dumps({'keyword': keyword, 'status': status, 'ts': now}, ensure_ascii=False) + "\n"
+            for keyword in keywords
+        )
+        with self._lock:
+            self.counts[status] = self.counts.get(status, 0) + len(keywords)
+            self._file.write(lines)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+    
+    def summary(self):
+        """
+        统计本次写入的各状态记录数量
+        
+        Returns:
+            dict: 状态 -> 数量
+        """
+        return dict(self.counts)
+    
+    def close(self):
+        """关闭检查点日志"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -5,29 +5,47 @@ Google Ads API 客户端
 
 import os
 import logging
-from google.ads.googleads.client import GoogleAdsClient as Client
-from google.ads.googleads.errors import GoogleAdsException
+import threading
+from collections import OrderedDict
+from .reports import row_projector
 
-# 配置日志
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 使用的Google Ads API版本
+API_VERSION = "v19"
+
+# 每个客户端缓存的服务、类型、枚举和资源名称的最大数量
+REGISTRY_MAX_ENTRIES = 1024
+
 class GoogleAdsClient:
     """Google Ads API客户端封装类"""
     
-    def __init__(self, config):
+    def __init__(self, config, retry_policy=None, breaker=None, limiter=None):
         """
         初始化Google Ads API客户端
         
         Args:
             config: 包含API凭据的配置字典
+            retry_policy: 该客户端请求使用的RetryPolicy (默认使用进程内共享的重试策略)
+            breaker: 该客户端请求使用的CircuitBreaker (默认使用进程内共享的熔断器)
+            limiter: 该客户端请求使用的TokenBucket (每个RPC获取一个令牌，默认不限速)
         """
         self.config = config
+        self.retry_policy = retry_policy
+        self.breaker = breaker
+        self.limiter = limiter
         self.client = None
+        self.version = config.get('version', API_VERSION)
+        # 服务、类型、枚举、资源名称和请求模板的缓存，按 (类别, 版本, 名称...) 索引
+        self._registry = OrderedDict()
+        self._registry_lock = threading.Lock()
         self._initialize_client()
     
     def _initialize_client(self):
         """初始化Google Ads API客户端"""
+        # google-ads库导入耗时较长，在创建客户端时才导入
+        from google.ads.googleads.client import GoogleAdsClient as Client
+        
         try:
             # 创建客户端配置字典
             client_config = {
@@ -36,9 +54,13 @@ class GoogleAdsClient:
                 "client_secret": self.config['client_secret'],
                 "refresh_token": self.config['refresh_token'],
                 "use_proto_plus": self.config.get('use_proto_plus', True),
-                "version": "v19",  # 使用v19版本的API，这是当前可用的版本
+                "version": self.version,  # 默认使用v19版本的API，这是当前可用的版本
             }
             
+            # 自定义服务地址 (如本地模拟服务器)
+            if self.config.get('endpoint'):
+                client_config["endpoint"] = self.config['endpoint']
+            
             # 如果提供了manager_customer_id，则添加到配置中
             if 'manager_customer_id' in self.config and self.config['manager_customer_id']:
                 client_config["login_customer_id"] = self.config['manager_customer_id']
@@ -46,7 +68,16 @@ class GoogleAdsClient:
                 client_config["login_customer_id"] = self.config['login_customer_id']
             
             # 初始化客户端
-            self.client = Client.load_from_dict(client_config)
+            if self.config.get('insecure'):
+                # 本地模拟服务器不校验OAuth凭据，load_from_dict会立即刷新访问令牌，因此直接创建客户端
+                from google.auth.credentials import AnonymousCredentials
+                
+                client_config.pop("client_id")
+                client_config.pop("client_secret")
+                client_config.pop("refresh_token")
+                self.client = Client(credentials=AnonymousCredentials(), **client_config)
+            else:
+                self.client = Client.load_from_dict(client_config)
             logger.info("Google Ads API客户端初始化成功")
             logger.info(f"使用的API版本: {client_config['version']}")
             
@@ -65,9 +96,38 @@ class GoogleAdsClient:
             self._initialize_client()
         return self.client
     
+    def _memoize(self, key, factory):
+        """
+        从缓存中获取对象，不存在时调用factory创建并缓存
+        
+        Args:
+            key: 缓存键 (不含版本)
+            factory: 创建对象的函数
+            
+        Returns:
+            缓存的对象
+        """
+        key = (self.version,) + key
+        with self._registry_lock:
+            if key in self._registry:
+                self._registry.move_to_end(key)
+                return self._registry[key]
+        
+        value = factory()
+        with self._registry_lock:
+            self._registry[key] = value
+            while len(self._registry) > REGISTRY_MAX_ENTRIES:
+                self._registry.popitem(last=False)
+        return value
+    
+    def clear_registry(self):
+        """清空服务、类型、枚举和资源名称缓存"""
+        with self._registry_lock:
+            self._registry.clear()
+    
     def get_service(self, service_name):
         """
-        获取指定的Google Ads API服务
+        获取指定的Google Ads API服务 (每个客户端只创建一次)
         
         Args:
             service_name: 服务名称
@@ -75,19 +135,133 @@ class GoogleAdsClient:
         Returns:
             指定的Google Ads API服务
         """
-        return self.get_client().get_service(service_name)
+        return self._memoize(
+            ("service", service_name),
+            lambda: self._create_service(service_name)
+        )
+    
+    def _create_service(self, service_name):
+        """
+        创建Google Ads API服务
+        
+        config中insecure为True时使用不加密的通道连接endpoint，且不发送OAuth凭据，
+        只用于本地模拟服务器 (见benchmarks/fake_ads_server.py)。
+        请求元数据和异常转换与google-ads库创建的服务相同。
+        """
+        if not self.config.get('insecure'):
+            return self.get_client().get_service(service_name, version=self.version)
+        
+        import grpc
+        import importlib
+        from google.ads.googleads.interceptors import MetadataInterceptor, ExceptionInterceptor
+        
+        client = self.get_client()
+        api_module = importlib.import_module(f"google.ads.googleads.{self.version}")
+        service_client_class = getattr(api_module, f"{service_name}Client")
+        transport_class = service_client_class.get_transport_class()
+        logger.warning(f"使用不加密的通道连接 {self.config['endpoint']} (只用于本地测试)")
+        channel = grpc.intercept_channel(
+            grpc.insecure_channel(self.config['endpoint']),
+            MetadataInterceptor(client.developer_token, client.login_customer_id),
+            ExceptionInterceptor(self.version, use_proto_plus=client.use_proto_plus),
+        )
+        return service_client_class(transport=transport_class(channel=channel))
     
     def get_type(self, type_name):
         """
         获取指定的Google Ads API类型
         
+        类型只解析一次，之后每次调用直接创建新的空实例。
+        
         Args:
             type_name: 类型名称
             
         Returns:
-            指定的Google Ads API类型
+            指定的Google Ads API类型的新实例
         """
-        return self.get_client().get_type(type_name)
+        message_class = self._memoize(
+            ("type", type_name),
+            lambda: type(self.get_client().get_type(type_name, version=self.version))
+        )
+        return message_class()
+    
+    def get_enum(self, enum_name, value_name):
+        """
+        获取指定的Google Ads API枚举值
+        
+        Args:
+            enum_name: 枚举名称 (如KeywordPlanNetworkEnum)
+            value_name: 枚举值名称 (如GOOGLE_SEARCH_AND_PARTNERS)
+            
+        Returns:
+            枚举值
+        """
+        return self._memoize(
+            ("enum", enum_name, value_name),
+            lambda: getattr(getattr(self.get_client().enums, enum_name), value_name)
+        )
+    
+    def language_constant_path(self, language_id):
+        """
+        获取语言资源名称
+        
+        Args:
+            language_id: 语言ID
+            
+        Returns:
+            str: 语言资源名称
+        """
+        return self._memoize(
+            ("language_constant", str(language_id)),
+            lambda: self.get_service("GoogleAdsService").language_constant_path(language_id)
+        )
+    
+    def geo_target_constant_path(self, location_id):
+        """
+        获取地理位置资源名称
+        
+        Args:
+            location_id: 位置ID
+            
+        Returns:
+            str: 地理位置资源名称
+        """
+        return self._memoize(
+            ("geo_target_constant", str(location_id)),
+            lambda: self.get_service("GeoTargetConstantService").geo_target_constant_path(location_id)
+        )
+    
+    def new_keyword_ideas_request(self, customer_id, language_id, location_id=None, network="GOOGLE_SEARCH_AND_PARTNERS"):
+        """
+        创建不含种子关键词的GenerateKeywordIdeasRequest
+        
+        相同参数的请求只构建一次作为模板，之后每次调用复制模板。
+        
+        Args:
+            customer_id: 客户ID
+            language_id: 语言ID
+            location_id: 位置ID (为None时不指定地理位置，获取全球数据)
+            network: 关键词规划网络名称
+            
+        Returns:
+            GenerateKeywordIdeasRequest
+        """
+        def build_template():
+            request = self.get_type("GenerateKeywordIdeasRequest")
+            request.customer_id = customer_id
+            request.language = self.language_constant_path(language_id)
+            if location_id is not None:
+                request.geo_target_constants.append(self.geo_target_constant_path(location_id))
+            request.include_adult_keywords = False
+            request.keyword_plan_network = self.get_enum("KeywordPlanNetworkEnum", network)
+            return request
+        
+        template = self._memoize(
+            ("keyword_ideas_request", str(customer_id), str(language_id),
+             str(location_id) if location_id is not None else None, network),
+            build_template
+        )
+        return clone_message(template)
     
     def execute_query(self, customer_id, query):
         """
@@ -103,15 +277,15 @@ class GoogleAdsClient:
         Raises:
             GoogleAdsException: 如果查询执行失败
         """
+        from google.ads.googleads.errors import GoogleAdsException
+        
         try:
             ga_service = self.get_service("GoogleAdsService")
-            search_request = self.get_type("SearchGoogleAdsRequest")
             
             # 设置请求参数
-            request = search_request(
-                customer_id=customer_id,
-                query=query,
-            )
+            request = self.get_type("SearchGoogleAdsRequest")
+            request.customer_id = customer_id
+            request.query = query
             
             # 执行查询
             response = ga_service.search(request=request)
@@ -122,3 +296,70 @@ class GoogleAdsClient:
             for error in ex.failure.errors:
                 logger.error(f"\t{error.error_code.message}: {error.message}")
             raise
+    
+    def execute_query_stream(self, customer_id, query, fields=None, row_factory=None):
+        """
+        流式执行GAQL查询 (GoogleAdsService.search_stream)
+        
+        服务器按批次推送所有结果，不需要逐页请求；返回生成器，按需读取，
+        内存中只保留当前批次。调用方提前停止读取 (关闭生成器) 时取消RPC。
+        
+        Args:
+            customer_id: 客户ID
+            query: GAQL查询字符串
+            fields: 投影的字段列表 (如 ['campaign.id', 'metrics.clicks'])，为None时生成原始的GoogleAdsRow
+            row_factory: 投影后调用的构造函数 (如namedtuple类)，为None时生成元组
+            
+        Yields:
+            GoogleAdsRow，或投影后的元组 (row_factory的返回值)
+            
+        Raises:
+            GoogleAdsException: 如果查询执行失败
+            ValueError: 如果指定了row_factory但没有指定fields
+        """
+        from google.ads.googleads.errors import GoogleAdsException
+        
+        if row_factory is not None and not fields:
+            raise ValueError("使用row_factory时必须指定fields")
+        project = row_projector(fields, row_factory) if fields else None
+        
+        stream = None
+        try:
+            ga_service = self.get_service("GoogleAdsService")
+            stream = ga_service.search_stream(customer_id=customer_id, query=query)
+            for batch in stream:
+                if project is None:
+                    yield from batch.results
+                else:
+                    for row in batch.results:
+                        yield project(row)
+            
+        except GoogleAdsException as ex:
+            logger.error(f"执行流式查询时出错: {ex}")
+            for error in ex.failure.errors:
+                logger.error(f"\t{error.error_code.message}: {error.message}")
+            raise
+        except GeneratorExit:
+            # 调用方不再读取，取消RPC使服务器停止发送
+            if stream is not None and hasattr(stream, 'cancel'):
+                stream.cancel()
+            raise
+
+def clone_message(message):
+    """
+    复制protobuf消息 (同时支持proto-plus和原生protobuf)
+    
+    Args:
+        message: 要复制的消息
+        
+    Returns:
+        消息的副本
+    """
+    clone = type(message)()
+    if hasattr(message, 'CopyFrom'):
+        # 原生protobuf消息
+        clone.CopyFrom(message)
+    else:
+        # proto-plus消息
+        type(message).copy_from(clone, message)
+    return clone
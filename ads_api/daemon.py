@@ -0,0 +1,270 @@
+"""
+关键词查询守护进程模块
+在后台进程中保持一个已初始化的GoogleAdsClient和gRPC连接，通过本地Unix套接字提供关键词查询，
+命令行工具每次调用不再承担导入google-ads库、交换OAuth令牌和建立连接的开销
+
+协议: 每行一个JSON请求，每行一个JSON响应
+    请求: {"op": "lookup", "keyword": "...", "language": "1000", "location": "2840", "cache": true, "refresh": false}
+          {"op": "ping"}、{"op": "shutdown"}
+    响应: {"ok": true, "data": {...}} 或 {"ok": false, "error": "..."}
+
+客户端部分只使用标准库，不导入google-ads库
+"""
+
+import os
+import json
+import socket
+import logging
+import threading
+import socketserver
+
+logger = logging.getLogger(__name__)
+
+# 默认套接字路径 (与结果缓存放在同一目录)
+DEFAULT_SOCKET_PATH = os.path.join(os.path.expanduser("~"), ".cache", "ads_api", "keyword_daemon.sock")
+# 客户端连接守护进程的超时时间 (秒)
+CONNECT_TIMEOUT = 1.0
+# 客户端等待查询结果的超时时间 (秒)，查询可能因为重试而耗时较长
+REQUEST_TIMEOUT = 120.0
+
+class DaemonUnavailable(Exception):
+    """守护进程没有运行 (或当前平台不支持Unix套接字)"""
+
+def daemon_request(request, socket_path=DEFAULT_SOCKET_PATH, timeout=REQUEST_TIMEOUT):
+    """
+    向守护进程发送一个请求
+    
+    Args:
+        request: 请求字典
+        socket_path: 套接字路径
+        timeout: 等待响应的超时时间 (秒)
+    
+    Returns:
+        dict: 响应字典
+    
+    Raises:
+        DaemonUnavailable: 如果无法连接到守护进程
+        OSError: 如果连接后通信失败
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        raise DaemonUnavailable("当前平台不支持Unix套接字")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(socket_path)
+        except OSError as e:
+            raise DaemonUnavailable(f"无法连接到守护进程 {socket_path}: {e}")
+        sock.settimeout(timeout)
+        with sock.makefile('rwb') as stream:
+            stream.write(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+            stream.flush()
+            line = stream.readline()
+        if not line:
+            raise ConnectionError("守护进程关闭了连接")
+        return json.loads(line)
+    finally:
+        sock.close()
+
+def daemon_lookup(keyword, language_id="1000", location_id="2840", use_cache=True, refresh=False,
+                  socket_path=DEFAULT_SOCKET_PATH, timeout=REQUEST_TIMEOUT):
+    """
+    通过守护进程查询关键词数据
+    
+    Args:
+        keyword: 关键词
+        language_id: 语言ID
+        location_id: 位置ID (逗号分隔的多个位置ID时查询所有位置)
+        use_cache: 是否使用守护进程的结果缓存
+        refresh: 为True时忽略已缓存的数据
+        socket_path: 套接字路径
+        timeout: 等待结果的超时时间 (秒)
+    
+    Returns:
+        dict: 关键词数据 (未找到数据时为空字典)
+    
+    Raises:
+        DaemonUnavailable: 如果守护进程没有运行
+        RuntimeError: 如果守护进程查询失败
+    """
+    response = daemon_request({
+        'op': 'lookup',
+        'keyword': keyword,
+        'language': str(language_id),
+        'location': str(location_id),
+        'cache': use_cache,
+        'refresh': refresh,
+    }, socket_path, timeout)
+    if not response.get('ok'):
+        raise RuntimeError(response.get('error') or "守护进程查询失败")
+    return response.get('data') or {}
+
+def daemon_running(socket_path=DEFAULT_SOCKET_PATH):
+    """
+    检查守护进程是否正在运行
+    
+    Returns:
+        bool: 守护进程是否响应ping
+    """
+    try:
+        return bool(daemon_request({'op': 'ping'}, socket_path, CONNECT_TIMEOUT).get('ok'))
+    except (DaemonUnavailable, OSError, ValueError):
+        return False
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """处理一个客户端连接 (一个连接上可以依次发送多个请求)"""
+    
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                response = self.server.keyword_daemon.handle(request)
+            except ValueError as e:
+                response = {'ok': False, 'error': f"无效的请求: {e}"}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+class KeywordDaemon:
+    """
+    关键词查询守护进程
+    
+    持有一个GoogleAdsClient、结果缓存和请求合并器，每个客户端连接在单独的线程中处理，
+    同一个 (关键词, 语言, 位置) 的并发查询合并为一次。
+    """
+    
+    def __init__(self, ads_config, socket_path=DEFAULT_SOCKET_PATH, cache=None):
+        """
+        初始化守护进程
+        
+        Args:
+            ads_config: Google Ads API配置字典
+            socket_path: 监听的套接字路径
+            cache: ResultCache实例 (为None时不使用结果缓存)
+        """
+        from .client import GoogleAdsClient
+        from .singleflight import SingleFlight
+        
+        self.ads_config = ads_config
+        self.customer_id = ads_config.get('login_customer_id', '')
+        self.socket_path = socket_path
+        self.cache = cache
+        self.client = GoogleAdsClient(ads_config)
+        self.flights = SingleFlight()
+        self.request_count = 0
+        self._server = None
+    
+    def warm_up(self, timeout=10.0):
+        """
+        创建服务和请求模板，并建立到关键词规划服务的gRPC连接
+        
+        OAuth令牌在创建客户端时已经交换；这里只等待通道连接就绪，不发送任何查询，
+        因此不消耗关键词规划的API配额。
+        
+        Args:
+            timeout: 等待连接就绪的最长时间 (秒)
+        """
+        import grpc
+        
+        service = self.client.get_service("KeywordPlanIdeaService")
+        self.client.new_keyword_ideas_request(self.customer_id, "1000", "2840")
+        try:
+            grpc.channel_ready_future(service.transport.grpc_channel).result(timeout=timeout)
+        except grpc.FutureTimeoutError:
+            logger.warning("预热连接在 %s 秒内没有就绪，将在第一个请求时建立连接", timeout)
+        logger.info("关键词查询守护进程已预热")
+    
+    def lookup(self, keyword, language_id="1000", location_id="2840", use_cache=True, refresh=False):
+        """
+        查询单个关键词的数据 (并发的相同查询合并为一次)
+        
+        Returns:
+            dict: 关键词数据 (未找到数据时为空字典)
+        """
+        from .result_cache import get_keyword_data_cached
+        from .normalize import normalize_keyword
+        
+        cache = self.cache if use_cache else None
+        key = (normalize_keyword(keyword), language_id, location_id, cache is not None, refresh)
+        keyword_data = self.flights.do(
+            key, get_keyword_data_cached, self.client, self.customer_id, keyword,
+            language_id=language_id,
+            location_id=location_id,
+            cache=cache,
+            refresh=refresh
+        )
+        return dict(keyword_data or {})
+    
+    def handle(self, request):
+        """
+        处理一个请求
+        
+        Args:
+            request: 请求字典
+        
+        Returns:
+            dict: 响应字典
+        """
+        op = request.get('op', 'lookup')
+        if op == 'ping':
+            return {'ok': True, 'pid': os.getpid(), 'requests': self.request_count}
+        if op == 'shutdown':
+            logger.info("收到停止请求")
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {'ok': True}
+        if op != 'lookup':
+            return {'ok': False, 'error': f"未知的操作: {op}"}
+        
+        keyword = str(request.get('keyword') or '').strip()
+        if not keyword:
+            return {'ok': False, 'error': "缺少keyword"}
+        self.request_count += 1
+        try:
+            keyword_data = self.lookup(
+                keyword,
+                language_id=str(request.get('language') or "1000"),
+                location_id=str(request.get('location') or "2840"),
+                use_cache=bool(request.get('cache', True)),
+                refresh=bool(request.get('refresh', False))
+            )
+        except Exception as e:
+            logger.error(f"查询关键词 '{keyword}' 时出错: {e}")
+            return {'ok': False, 'error': str(e)}
+        return {'ok': True, 'data': keyword_data}
+    
+    def serve_forever(self):
+        """
+        在套接字上监听请求，直到调用shutdown
+        
+        Raises:
+            RuntimeError: 如果已有守护进程在同一个套接字上运行
+        """
+        if daemon_running(self.socket_path):
+            raise RuntimeError(f"守护进程已在运行: {self.socket_path}")
+        # 清理上次异常退出留下的套接字文件
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        os.makedirs(os.path.dirname(self.socket_path) or '.', exist_ok=True)
+        
+        # 套接字只允许当前用户访问
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        self._server.keyword_daemon = self
+        logger.info(f"关键词查询守护进程已启动: {self.socket_path} (PID {os.getpid()})")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            logger.info("关键词查询守护进程已停止")
+    
+    def shutdown(self):
+        """停止监听 (从其他线程调用)"""
+        if self._server is not None:
+            self._server.shutdown()
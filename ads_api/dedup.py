@@ -0,0 +1,119 @@
+"""
+关键词去重模块
+把规范化后相同的关键词合并为一次查询，并把结果复制回每个原始关键词
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from .normalize import normalize_keyword
+
+logger = logging.getLogger(__name__)
+
+# 保存最近查询结果的数量 (用于复制给之后出现的重复关键词)
+DEFAULT_MAX_RESULTS = 100000
+
+class _Flight:
+    """正在进行的一次查询"""
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+
+class KeywordDeduplicator:
+    """
+    关键词去重查询
+    
+    包装一个批量查询函数 (关键词列表 -> {关键词: 关键词数据})。规范化后相同的关键词
+    (大小写、全角/半角、空白或标点不同) 只查询一次：
+      - 同一批次中的重复关键词合并到同一个请求中
+      - 其他线程正在查询的关键词等待该查询完成
+      - 最近查询过的关键词直接复制保存的结果
+    最近的结果只保存max_results个，内存占用有上限。
+    结果被淘汰后再次出现的关键词会重新查询 (通常会命中结果缓存或关键词提示缓存)。
+    """
+    
+    def __init__(self, fetch_many, max_results=DEFAULT_MAX_RESULTS):
+        """
+        初始化去重查询
+        
+        Args:
+            fetch_many: 批量查询函数
+            max_results: 保存最近查询结果的数量
+        """
+        self.fetch_many = fetch_many
+        self.max_results = max_results
+        # 实际查询的关键词数量和不需要查询的重复关键词数量
+        self.fetched_count = 0
+        self.duplicate_count = 0
+        self._results = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+    
+    def _remember(self, key, keyword_data):
+        """保存查询结果 (调用时需持有锁)"""
+        self._results[key] = keyword_data
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+    
+    def lookup(self, keywords):
+        """
+        查询关键词数据
+        
+        Args:
+            keywords: 关键词列表
+        
+        Returns:
+            dict: 原始关键词 -> 关键词数据字典 (未找到数据时为空字典)
+        
+        Raises:
+            fetch_many抛出的异常
+        """
+        results = {}
+        fetch = OrderedDict()
+        waiting = []
+        keys = {}
+        with self._lock:
+            for keyword in keywords:
+                key = normalize_keyword(keyword)
+                keys[keyword] = key
+                if key in fetch:
+                    self.duplicate_count += 1
+                elif key in self._results:
+                    self._results.move_to_end(key)
+                    results[keyword] = dict(self._results[key])
+                    self.duplicate_count += 1
+                elif key in self._flights:
+                    waiting.append((keyword, self._flights[key]))
+                    self.duplicate_count += 1
+                else:
+                    fetch[key] = keyword
+                    self._flights[key] = _Flight()
+                    self.fetched_count += 1
+        
+        if fetch:
+            fetched = None
+            try:
+                fetched = self.fetch_many(list(fetch.values()))
+            finally:
+                with self._lock:
+                    for key, keyword in fetch.items():
+                        flight = self._flights.pop(key)
+                        if fetched is not None:
+                            flight.result = fetched.get(keyword) or {}
+                            self._remember(key, flight.result)
+                        flight.event.set()
+            for keyword in keywords:
+                key = keys[keyword]
+                if key in fetch:
+                    results[keyword] = dict(fetched.get(fetch[key]) or {})
+        
+        for keyword, flight in waiting:
+            flight.event.wait()
+            if flight.result is None:
+                # 其他线程的查询失败时单独重新查询
+                results[keyword] = dict(self.fetch_many([keyword]).get(keyword) or {})
+            else:
+                results[keyword] = dict(flight.result)
+        return results
@@ -0,0 +1,128 @@
+"""
+关键词提示缓存模块
+保存generate_keyword_ideas响应中的所有关键词提示，供后续查询直接使用
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from .normalize import normalize_keyword
+from .records import KeywordRecord
+
+logger = logging.getLogger(__name__)
+
+# 默认的关键词规划网络
+DEFAULT_NETWORK = "GOOGLE_SEARCH_AND_PARTNERS"
+# 条目的默认有效期 (秒)
+DEFAULT_IDEA_MAX_AGE = 3600
+
+class IdeaCache:
+    """
+    进程内关键词提示缓存
+    
+    以 (规范化关键词, 语言ID, 位置ID, 网络) 为键保存单个关键词提示的数据和写入时间。
+    位置ID为None表示全球数据。超过max_entries时淘汰最早写入的条目。
+    数据以KeywordRecord保存，每个条目占用的内存远小于字典。
+    """
+    
+    def __init__(self, max_entries=200000, max_age=DEFAULT_IDEA_MAX_AGE):
+        """
+        初始化关键词提示缓存
+        
+        Args:
+            max_entries: 最多保存的条目数
+            max_age: 条目有效期 (秒)，为None时不过期
+        """
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(keyword, language_id, location_id, network=DEFAULT_NETWORK):
+        """
+        创建缓存键
+        
+        Args:
+            keyword: 关键词
+            language_id: 语言ID
+            location_id: 位置ID (None表示全球)
+            network: 关键词规划网络名称
+        
+        Returns:
+            tuple: 缓存键
+        """
+        return (
+            normalize_keyword(keyword),
+            str(language_id),
+            str(location_id) if location_id is not None else None,
+            network,
+        )
+    
+    def get(self, keyword, language_id, location_id, network=DEFAULT_NETWORK):
+        """
+        查询关键词提示数据
+        
+        Args:
+            keyword: 关键词
+            language_id: 语言ID
+            location_id: 位置ID (None表示全球)
+            network: 关键词规划网络名称
+        
+        Returns:
+            dict: 关键词数据的副本，未命中或已过期时返回None
+        """
+        key = self.make_key(keyword, language_id, location_id, network)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, record = entry
+            if self.max_age is not None and time.time() - stored_at > self.max_age:
+                del self._entries[key]
+                return None
+        return record.to_dict()
+    
+    def put(self, keyword, language_id, location_id, data, network=DEFAULT_NETWORK):
+        """
+        保存关键词提示数据
+        
+        Args:
+            keyword: 关键词
+            language_id: 语言ID
+            location_id: 位置ID (None表示全球)
+            data: 关键词数据字典或KeywordRecord
+            network: 关键词规划网络名称
+        """
+        key = self.make_key(keyword, language_id, location_id, network)
+        record = data if isinstance(data, KeywordRecord) else KeywordRecord.from_dict(data)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time(), record)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def set_max_age(self, max_age):
+        """
+        修改条目有效期 (对已保存的条目同样生效)
+        
+        Args:
+            max_age: 条目有效期 (秒)，为None时不过期
+        """
+        with self._lock:
+            self.max_age = max_age
+    
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, key):
+        return key in self._entries
+
+# 默认的进程级关键词提示缓存 (长期运行的服务和守护进程通过set_max_age使其与结果缓存的有效期一致)
+default_idea_cache = IdeaCache()
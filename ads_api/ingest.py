@@ -0,0 +1,72 @@
+"""
+关键词输入模块
+按行惰性读取关键词文件 (支持标准输入和gzip压缩文件)，内存占用与文件大小无关
+"""
+
+import io
+import sys
+import gzip
+import logging
+from itertools import islice
+
+logger = logging.getLogger(__name__)
+
+# 表示从标准输入读取的文件名
+STDIN_NAME = '-'
+
+def open_keyword_file(file_path):
+    """
+    打开关键词文件
+    
+    Args:
+        file_path: 文件路径；'-'表示标准输入，以.gz结尾时按gzip解压
+    
+    Returns:
+        文本文件对象
+    """
+    if file_path == STDIN_NAME:
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+    if file_path.endswith('.gz'):
+        return gzip.open(file_path, 'rt', encoding='utf-8')
+    return open(file_path, 'r', encoding='utf-8')
+
+def iter_keywords(file_path):
+    """
+    逐行读取关键词 (跳过空行和以#开头的注释行)
+    
+    Args:
+        file_path: 文件路径 (见open_keyword_file)
+    
+    Yields:
+        str: 关键词
+    """
+    f = open_keyword_file(file_path)
+    try:
+        for line in f:
+            keyword = line.strip()
+            if keyword and not keyword.startswith('#'):
+                yield keyword
+    finally:
+        if file_path == STDIN_NAME:
+            # 不关闭标准输入本身
+            f.detach()
+        else:
+            f.close()
+
+def iter_chunks(iterable, size):
+    """
+    把可迭代对象按固定大小分组 (最后一组可能不足size个)
+    
+    Args:
+        iterable: 可迭代对象
+        size: 每组的元素数量
+    
+    Yields:
+        list: 元素列表
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,254 @@
+"""
+关键词意图分类模块
+把信息型/商业型/交易型的特征词编译为一个Aho-Corasick自动机，每个关键词只扫描一遍
+
+拉丁字母等以空格分词的特征词按整词匹配 (shop不会匹配workshop)，允许常见的英文词形变化
+(复数、比较级/最高级、进行时/过去式，如cheapest、ordering、shopping)，UNINFLECTED_INDICATORS中的特征词除外
+(topping不是top)；字母和数字之间视为单词边界 (如top10)；
+中日韩文字的特征词按子串匹配。特征词可以在config.py的KEYWORD_INTENT_INDICATORS中配置。
+"""
+
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# 关键词类型: 信息型 (I)、商业型 (C)、交易型 (T)
+INFORMATIONAL = 'I'
+COMMERCIAL = 'C'
+TRANSACTIONAL = 'T'
+
+# 同时匹配多种类型时的优先级 (靠前的优先)
+TYPE_PRIORITY = (TRANSACTIONAL, COMMERCIAL, INFORMATIONAL)
+
+# 没有匹配到特征词时的类型
+DEFAULT_TYPE = INFORMATIONAL
+
+# 默认的特征词
+DEFAULT_INDICATORS = {
+    INFORMATIONAL: (
+        'what', 'how', 'why', 'when', 'where', 'who', 'which',
+        '是什么', '怎么', '为什么', '如何', '教程', '指南', 'guide', 'tutorial'
+    ),
+    COMMERCIAL: (
+        'best', 'top', 'review', 'compare', 'vs', 'versus',
+        '最好', '推荐', '评测', '对比', '排名', 'ranking'
+    ),
+    TRANSACTIONAL: (
+        'buy', 'price', 'cheap', 'discount', 'deal', 'coupon', 'purchase', 'shop', 'order',
+        '购买', '价格', '优惠', '折扣', '订购', '下单', '商店'
+    ),
+}
+
+# 整词匹配时允许的英文词尾 (复数、比较级/最高级、进行时/过去式、施动者)
+INFLECTION_SUFFIXES = ('s', 'es', 'ed', 'er', 'ers', 'est', 'ing', 'ings')
+# 末尾辅音双写后允许的词尾 (如shop -> shopping, big -> biggest)
+DOUBLED_CONSONANT_SUFFIXES = ('ed', 'er', 'ers', 'est', 'ing', 'ings')
+# 只按整词匹配、不允许词形变化的特征词 (加上词尾后是意思不同的词，如topping、bests)
+UNINFLECTED_INDICATORS = frozenset({'best', 'top', 'vs', 'versus'})
+
+# 从该码位开始的文字 (中日韩文字、假名、谚文等) 不以空格分词，按子串匹配
+CJK_START = 0x2E80
+
+def is_cjk(char):
+    """判断字符是否属于不以空格分词的文字"""
+    return ord(char) >= CJK_START
+
+def is_word_char(char):
+    """判断字符是否为需要整词匹配的单词字符 (拉丁字母、数字等)"""
+    return char.isalnum() and not is_cjk(char)
+
+def joins_word(left, right):
+    """判断相邻的两个字符是否属于同一个单词 (字母和数字之间视为单词边界，如top10)"""
+    return is_word_char(left) and is_word_char(right) and left.isdigit() == right.isdigit()
+
+def suffix_ends_word(text, start, suffixes):
+    """判断从位置start开始是否为某个词尾且词尾之后单词结束"""
+    for suffix in suffixes:
+        stop = start + len(suffix)
+        if text.startswith(suffix, start) and (stop == len(text) or not joins_word(text[stop - 1], text[stop])):
+            return True
+    return False
+
+class IntentClassifier:
+    """
+    关键词意图分类器
+    
+    所有类型的特征词编译为一个Aho-Corasick自动机，分类时每个关键词从头到尾扫描一遍，
+    耗时与关键词长度成正比，与特征词数量无关。同时匹配多种类型时按TYPE_PRIORITY取优先的类型。
+    分类器创建后只读，可以在多个线程中共享。
+    """
+    
+    def __init__(self, indicators=None):
+        """
+        初始化分类器
+        
+        Args:
+            indicators: 类型 -> 特征词列表 (默认为DEFAULT_INDICATORS)
+        """
+        indicators = DEFAULT_INDICATORS if indicators is None else indicators
+        # 每个节点: 子节点字典、失败链接、在该节点结束的特征词 (长度, 优先级, 是否检查词首, 是否检查词尾, 是否允许词形变化)
+        self._children = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+        self.pattern_count = 0
+        
+        for intent_type, words in indicators.items():
+            if intent_type not in TYPE_PRIORITY:
+                raise ValueError(f"无效的关键词类型: {intent_type}")
+            rank = TYPE_PRIORITY.index(intent_type)
+            for word in words:
+                word = word.lower().strip()
+                if word:
+                    self._add(word, rank)
+        self._build_links()
+    
+    def _add(self, word, rank):
+        """把特征词加入字典树"""
+        node = 0
+        for char in word:
+            child = self._children[node].get(char)
+            if child is None:
+                child = len(self._children)
+                self._children[node][char] = child
+                self._children.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = child
+        self._outputs[node].append((len(word), rank, is_word_char(word[0]), is_word_char(word[-1]),
+                                    word not in UNINFLECTED_INDICATORS))
+        self.pattern_count += 1
+    
+    def _build_links(self):
+        """按广度优先顺序计算失败链接，并合并失败链接上的输出"""
+        queue = deque(self._children[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._children[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._children[fail]:
+                    fail = self._fail[fail]
+                target = self._children[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+                queue.append(child)
+    
+    @staticmethod
+    def _word_end(text, end, inflected=True):
+        """判断位置end是否为整词的结尾 (inflected为True时允许英文词形变化的词尾)"""
+        if end == len(text) or not joins_word(text[end - 1], text[end]):
+            return True
+        if not inflected:
+            return False
+        if suffix_ends_word(text, end, INFLECTION_SUFFIXES):
+            return True
+        # 末尾辅音双写
+        return (text[end] == text[end - 1] and text[end] not in 'aeiou'
+                and suffix_ends_word(text, end + 1, DOUBLED_CONSONANT_SUFFIXES))
+    
+    def classify(self, keyword):
+        """
+        分类单个关键词
+        
+        Args:
+            keyword: 关键词
+        
+        Returns:
+            str: 关键词类型 (I/C/T)
+        """
+        text = keyword.lower()
+        children = self._children
+        fail = self._fail
+        outputs = self._outputs
+        best = len(TYPE_PRIORITY)
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in children[node]:
+                node = fail[node]
+            node = children[node].get(char, 0)
+            for length, rank, check_start, check_end, inflected in outputs[node]:
+                if rank >= best:
+                    continue
+                start = position + 1 - length
+                if check_start and start > 0 and joins_word(text[start - 1], text[start]):
+                    continue
+                if check_end and not self._word_end(text, position + 1, inflected):
+                    continue
+                best = rank
+                if best == 0:
+                    return TYPE_PRIORITY[0]
+        return TYPE_PRIORITY[best] if best < len(TYPE_PRIORITY) else DEFAULT_TYPE
+    
+    def classify_batch(self, keywords):
+        """
+        分类多个关键词
+        
+        Args:
+            keywords: 关键词列表
+        
+        Returns:
+            list: 关键词类型列表 (与输入顺序相同)
+        """
+        classify = self.classify
+        return [classify(keyword) for keyword in keywords]
+
+def load_indicators():
+    """
+    读取特征词配置
+    
+    config.py中的KEYWORD_INTENT_INDICATORS (类型 -> 特征词列表) 替换对应类型的默认特征词，
+    未配置的类型使用DEFAULT_INDICATORS。
+    
+    Returns:
+        dict: 类型 -> 特征词列表
+    """
+    indicators = dict(DEFAULT_INDICATORS)
+    try:
+        import config
+    except ImportError:
+        return indicators
+    indicators.update(getattr(config, 'KEYWORD_INTENT_INDICATORS', None) or {})
+    return indicators
+
+_default_classifier = None
+_default_lock = threading.Lock()
+
+def get_default_classifier():
+    """
+    获取默认分类器 (第一次调用时根据配置编译)
+    
+    Returns:
+        IntentClassifier
+    """
+    global _default_classifier
+    if _default_classifier is None:
+        with _default_lock:
+            if _default_classifier is None:
+                _default_classifier = IntentClassifier(load_indicators())
+                logger.debug("关键词意图分类器已编译: %s 个特征词", _default_classifier.pattern_count)
+    return _default_classifier
+
+def classify_keyword(keyword):
+    """
+    使用默认分类器分类单个关键词
+    
+    Args:
+        keyword: 关键词
+    
+    Returns:
+        str: 关键词类型 (I/C/T)
+    """
+    return get_default_classifier().classify(keyword)
+
+def classify_batch(keywords):
+    """
+    使用默认分类器分类多个关键词
+    
+    Args:
+        keywords: 关键词列表
+    
+    Returns:
+        list: 关键词类型列表 (与输入顺序相同)
+    """
+    return get_default_classifier().classify_batch(keywords)
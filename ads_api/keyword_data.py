@@ -4,253 +4,657 @@
 """
 
 import logging
+import threading
 import traceback
 import math
 import re
+from concurrent.futures import ThreadPoolExecutor
 from .client import GoogleAdsClient
+from .idea_cache import DEFAULT_NETWORK, default_idea_cache
+from .normalize import normalize_keyword
+from .retry import call_with_retry, should_fail_over
+from .log_utils import sample_debug, log_fields
 from google.ads.googleads.errors import GoogleAdsException
-from config import GOOGLE_ADS
+from google.protobuf.message import Message as ProtobufMessage
+from .records import COMPETITION_LEVELS
+from .scoring import score_keyword
+from .intent import classify_keyword
 
-# 配置日志
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def get_keyword_data(client, customer_id, keyword, language_id="1000", location_id="2840"):
+# GenerateKeywordIdeasRequest.keyword_seed 每个请求最多允许20个种子关键词
+MAX_SEED_KEYWORDS = 20
+
+# 并发发送不同地理位置请求的共享线程池大小
+FANOUT_MAX_WORKERS = 32
+
+_fanout_executor = None
+_fanout_lock = threading.Lock()
+
+def get_keyword_data(client, customer_id, keyword, language_id="1000", location_id="2840", idea_cache=default_idea_cache):
     """
     获取关键词数据
     
+    如果之前的响应中已经出现过该关键词 (特定国家和全球数据都有)，
+    直接使用关键词提示缓存中的数据，不发送请求。
+    
     Args:
         client: GoogleAdsClient实例
         customer_id: 客户ID
         keyword: 要查询的关键词
         language_id: 语言ID (默认为1000，英语)
         location_id: 位置ID (默认为2840，美国)
+        idea_cache: 关键词提示缓存 (为None时不使用缓存)
         
     Returns:
         dict: 包含关键词数据的字典
     """
     try:
-        logger.info(f"开始获取关键词数据: {keyword}, 客户ID: {customer_id}")
+        logger.info("开始获取关键词数据: %s, 客户ID: %s", keyword, customer_id)
         
-        # 获取关键词规划服务
+        # 先查询关键词提示缓存
+        if idea_cache is not None:
+            cached_data = get_cached_keyword_data(idea_cache, keyword, language_id, location_id)
+            if cached_data:
+                logger.info("从关键词提示缓存获取数据: %s", keyword)
+                return cached_data
+        
+        # 获取关键词规划服务 (服务、枚举和资源名称都缓存在客户端中)
         logger.debug("获取关键词规划服务")
         keyword_plan_idea_service = client.get_service("KeywordPlanIdeaService")
-        logger.debug(f"成功获取关键词规划服务: {keyword_plan_idea_service.__class__.__name__}")
-        
-        # 获取枚举类型
-        logger.debug("获取枚举类型")
-        keyword_plan_network = client.get_client().enums.KeywordPlanNetworkEnum.GOOGLE_SEARCH_AND_PARTNERS
-        logger.debug(f"成功获取枚举类型: {keyword_plan_network}")
+        logger.debug("成功获取关键词规划服务: %s", type(keyword_plan_idea_service).__name__)
         
-        # 创建资源名称
-        logger.debug("创建资源名称")
-        google_ads_service = client.get_service("GoogleAdsService")
-        language_resource_name = google_ads_service.language_constant_path(language_id)
-        logger.debug(f"语言资源名称: {language_resource_name}")
+        # 创建元数据，添加管理者账户ID作为login-customer-id
+        metadata = build_request_metadata(client)
         
-        geo_target_constant_service = client.get_service("GeoTargetConstantService")
-        location_resource_name = geo_target_constant_service.geo_target_constant_path(location_id)
-        logger.debug(f"位置资源名称: {location_resource_name}")
+        # 创建全球请求 - 不指定地理位置，并在后台线程中先发送，与美国地区请求并发执行
+        logger.debug("创建全球请求")
+        # 不设置geo_target_constants，以获取全球数据
+        global_request = build_keyword_ideas_request(client, customer_id, language_id)
+        global_request.keyword_seed.keywords.append(keyword)
+        logger.info("发送全球关键词规划请求")
+        global_future = get_fanout_executor().submit(
+            fetch_keyword_ideas, keyword_plan_idea_service, global_request, metadata, client
+        )
         
         # 创建请求 - 特定国家（美国）
         logger.debug("创建美国地区请求")
-        us_request = client.get_type("GenerateKeywordIdeasRequest")
-        us_request.customer_id = customer_id
-        us_request.language = language_resource_name
-        us_request.geo_target_constants = [location_resource_name]
-        us_request.include_adult_keywords = False
-        us_request.keyword_plan_network = keyword_plan_network
+        us_request = build_keyword_ideas_request(client, customer_id, language_id, location_id)
         
         # 设置关键词种子
-        logger.debug(f"设置关键词种子: {keyword}")
+        logger.debug("设置关键词种子: %s", keyword)
         us_request.keyword_seed.keywords.append(keyword)
-        logger.debug(f"成功设置关键词种子")
         
         # 发送美国地区请求
         logger.info("发送美国地区关键词规划请求")
         try:
             logger.debug("调用generate_keyword_ideas方法 (美国)")
-            
-            # 获取管理者账户ID
-            manager_id = GOOGLE_ADS.get('manager_customer_id')
-            
-            # 创建元数据，添加管理者账户ID作为login-customer-id
-            metadata = [
-                ("login-customer-id", manager_id)
-            ]
-            
-            logger.debug(f"使用管理者账户ID: {manager_id} 作为login-customer-id")
-            logger.debug(f"请求的客户账户ID: {customer_id}")
+            logger.debug("请求的客户账户ID: %s", customer_id)
             
             # 使用元数据发送请求
-            us_response = keyword_plan_idea_service.generate_keyword_ideas(
-                request=us_request,
-                metadata=metadata
-            )
+            us_response = fetch_keyword_ideas(keyword_plan_idea_service, us_request, metadata, client)
             
             logger.info("成功获取美国地区关键词规划数据")
         except GoogleAdsException as ex:
-            logger.error(f"Google Ads API错误 (美国请求): {ex}")
+            global_future.cancel()
+            logger.error("Google Ads API错误 (美国请求): %s", ex)
             for error in ex.failure.errors:
-                logger.error(f"\t{error.error_code}: {error.message}")
+                logger.error("\t%s: %s", error.error_code, error.message)
             raise
         except Exception as e:
-            logger.error(f"调用generate_keyword_ideas方法失败 (美国请求): {e}")
+            global_future.cancel()
+            logger.error("调用generate_keyword_ideas方法失败 (美国请求): %s", e)
             logger.error(traceback.format_exc())
             raise
         
-        # 创建全球请求 - 不指定地理位置
-        logger.debug("创建全球请求")
-        global_request = client.get_type("GenerateKeywordIdeasRequest")
-        global_request.customer_id = customer_id
-        global_request.language = language_resource_name
-        # 不设置geo_target_constants，以获取全球数据
-        global_request.include_adult_keywords = False
-        global_request.keyword_plan_network = keyword_plan_network
-        global_request.keyword_seed.keywords.append(keyword)
-        
-        # 发送全球请求
-        logger.info("发送全球关键词规划请求")
+        # 等待全球请求完成
         try:
-            global_response = keyword_plan_idea_service.generate_keyword_ideas(
-                request=global_request,
-                metadata=metadata
-            )
+            global_response = global_future.result()
             logger.info("成功获取全球关键词规划数据")
         except Exception as e:
-            logger.error(f"获取全球数据失败: {e}")
+            # 账户池中的账户配额耗尽时由账户池换用其他账户重新查询
+            if should_fail_over(e, getattr(client, 'breaker', None)):
+                raise
+            logger.error("获取全球数据失败: %s", e)
             logger.warning("将使用美国数据作为全球数据的替代")
             global_response = None
         
         # 处理结果
         keyword_data = {}
-        logger.debug(f"处理美国响应结果")
+        logger.debug("处理美国响应结果")
         
         # 处理美国数据
-        us_keyword_data = process_response(us_response, keyword)
+        us_keyword_data = process_response(
+            us_response, keyword,
+            idea_cache=idea_cache, language_id=language_id, location_id=location_id
+        )
         
         if us_keyword_data:
-            keyword_data = us_keyword_data
-            keyword_data['volume_us'] = keyword_data.pop('volume', 0)
-            
             # 处理全球数据
+            global_keyword_data = None
             if global_response:
-                logger.debug(f"处理全球响应结果")
-                global_keyword_data = process_response(global_response, keyword)
-                if global_keyword_data:
-                    keyword_data['volume_global'] = global_keyword_data.get('volume', 0)
-                else:
+                logger.debug("处理全球响应结果")
+                global_keyword_data = process_response(
+                    global_response, keyword,
+                    idea_cache=idea_cache, language_id=language_id, location_id=None
+                )
+                if not global_keyword_data:
                     logger.warning("未找到全球数据，使用美国数据作为替代")
-                    keyword_data['volume_global'] = keyword_data['volume_us']
             else:
                 logger.warning("全球请求失败，使用美国数据作为替代")
-                keyword_data['volume_global'] = keyword_data['volume_us']
             
-            # 计算关键词难度 (KD)
-            if 'competition_index' in keyword_data:
-                logger.debug("计算关键词难度")
-                keyword_data['kd'] = calculate_keyword_difficulty(
-                    keyword_data['competition_index'],
-                    keyword_data['volume_us'],
-                    keyword_data.get('cpc', 0)
-                )
+            keyword_data = merge_keyword_data(us_keyword_data, global_keyword_data)
         else:
-            logger.warning(f"未找到关键词 '{keyword}' 的数据")
+            logger.warning("未找到关键词 '%s' 的数据", keyword)
         
-        logger.info(f"成功获取关键词数据: {keyword_data}")
+        logger.info("成功获取关键词数据: %s", keyword_data)
         return keyword_data
         
     except GoogleAdsException as ex:
-        logger.error(f"Google Ads API错误: {ex}")
+        logger.error("Google Ads API错误: %s", ex)
+        for error in ex.failure.errors:
+            logger.error("\t%s: %s", error.error_code, error.message)
+        raise
+    except Exception as e:
+        logger.error("获取关键词数据时出错: %s", e)
+        logger.error(traceback.format_exc())
+        raise
+
+def get_keyword_data_multi_location(client, customer_id, keyword, location_ids, language_id="1000", idea_cache=default_idea_cache):
+    """
+    获取关键词在多个地理位置的数据
+    
+    所有地理位置请求和全球请求并发发送，单个关键词的耗时取决于最慢的一个请求。
+    
+    Args:
+        client: GoogleAdsClient实例
+        customer_id: 客户ID
+        keyword: 要查询的关键词
+        location_ids: 位置ID列表，第一个位置作为主位置 (对应volume_us等字段)
+        language_id: 语言ID (默认为1000，英语)
+        idea_cache: 关键词提示缓存 (为None时不使用缓存)
+        
+    Returns:
+        dict: 包含关键词数据的字典，volumes字段为 位置ID -> 搜索量 (未找到数据时为None)
+    """
+    location_ids = [str(location_id) for location_id in location_ids]
+    if not location_ids:
+        raise ValueError("至少需要一个位置ID")
+    
+    try:
+        logger.info("开始获取多地区关键词数据: %s, 位置: %s", keyword, ','.join(location_ids))
+        keyword_plan_idea_service = client.get_service("KeywordPlanIdeaService")
+        metadata = build_request_metadata(client)
+        executor = get_fanout_executor()
+        
+        # 所有地理位置 (None表示全球) 的请求同时发出
+        futures = {}
+        for location_id in location_ids + [None]:
+            request = build_keyword_ideas_request(client, customer_id, language_id, location_id)
+            request.keyword_seed.keywords.append(keyword)
+            futures[location_id] = executor.submit(
+                fetch_keyword_ideas, keyword_plan_idea_service, request, metadata, client
+            )
+        
+        location_data = {}
+        errors = []
+        for location_id, future in futures.items():
+            try:
+                response = future.result()
+            except Exception as e:
+                if should_fail_over(e, getattr(client, 'breaker', None)):
+                    raise
+                logger.error("获取位置 %s 的数据失败: %s", location_id or '全球', e)
+                errors.append(e)
+                location_data[location_id] = None
+                continue
+            location_data[location_id] = process_response(
+                response, keyword,
+                idea_cache=idea_cache, language_id=language_id, location_id=location_id
+            )
+        
+        # 所有地理位置请求都失败时抛出第一个错误
+        if all(location_data[location_id] is None for location_id in location_ids) and errors:
+            raise errors[0]
+        
+        volumes = {}
+        for location_id in location_ids:
+            data = location_data[location_id]
+            volumes[location_id] = data.get('volume', 0) if data else None
+        
+        primary_data = next((location_data[location_id] for location_id in location_ids if location_data[location_id]), None)
+        if not primary_data:
+            logger.warning("未找到关键词 '%s' 的数据", keyword)
+            return {}
+        
+        keyword_data = merge_keyword_data(dict(primary_data), location_data.get(None))
+        keyword_data['volumes'] = volumes
+        logger.info("成功获取多地区关键词数据: %s", keyword_data)
+        return keyword_data
+        
+    except GoogleAdsException as ex:
+        logger.error("Google Ads API错误: %s", ex)
+        for error in ex.failure.errors:
+            logger.error("\t%s: %s", error.error_code, error.message)
+        raise
+    except Exception as e:
+        logger.error("获取多地区关键词数据时出错: %s", e)
+        logger.error(traceback.format_exc())
+        raise
+
+def parse_location_ids(location_ids):
+    """
+    解析位置ID列表
+    
+    Args:
+        location_ids: 逗号分隔的位置ID字符串 (如"2840,2826")，或位置ID列表
+        
+    Returns:
+        list: 位置ID字符串列表
+    """
+    if isinstance(location_ids, (list, tuple)):
+        return [str(location_id).strip() for location_id in location_ids if str(location_id).strip()]
+    return [location_id.strip() for location_id in str(location_ids).split(',') if location_id.strip()]
+
+def get_fanout_executor():
+    """
+    获取用于并发发送地理位置请求的共享线程池
+    
+    Returns:
+        ThreadPoolExecutor
+    """
+    global _fanout_executor
+    if _fanout_executor is None:
+        with _fanout_lock:
+            if _fanout_executor is None:
+                _fanout_executor = ThreadPoolExecutor(
+                    max_workers=FANOUT_MAX_WORKERS,
+                    thread_name_prefix="keyword-fanout"
+                )
+    return _fanout_executor
+
+def fetch_keyword_ideas(keyword_plan_idea_service, request, metadata, client=None):
+    """
+    发送GenerateKeywordIdeas请求并读取所有分页
+    
+    在线程池中执行时，分页也在该线程中读取完毕，避免在调用方线程中再次等待网络。
+    可重试的错误 (配额耗尽、服务暂时不可用等) 按客户端的重试策略重试 (未设置时使用默认策略)，
+    整个分页读取作为一次尝试。客户端设置了限速器时每次尝试获取一个令牌。
+    
+    Args:
+        keyword_plan_idea_service: KeywordPlanIdeaService客户端
+        request: GenerateKeywordIdeasRequest
+        metadata: 请求元数据
+        client: 发送请求的GoogleAdsClient (用于获取其重试策略、熔断器和限速器)
+        
+    Returns:
+        list: GenerateKeywordIdeaResult列表
+    """
+    return call_with_retry(
+        lambda: list(keyword_plan_idea_service.generate_keyword_ideas(request=request, metadata=metadata)),
+        policy=getattr(client, 'retry_policy', None),
+        breaker=getattr(client, 'breaker', None),
+        description="generate_keyword_ideas请求",
+        limiter=getattr(client, 'limiter', None)
+    )
+
+def get_keywords_data_batch(client, customer_id, keywords, language_id="1000", location_id="2840", batch_size=MAX_SEED_KEYWORDS, idea_cache=default_idea_cache):
+    """
+    批量获取关键词数据
+    
+    把多个关键词作为种子打包进同一个GenerateKeywordIdeasRequest，
+    再按规范化后的文本把返回的关键词提示拆分回各个种子关键词。
+    与get_keyword_data不同，没有精确匹配的关键词不会退回到第一个结果。
+    
+    Args:
+        client: GoogleAdsClient实例
+        customer_id: 客户ID
+        keywords: 要查询的关键词列表
+        language_id: 语言ID (默认为1000，英语)
+        location_id: 位置ID (默认为2840，美国)
+        batch_size: 每个请求包含的种子关键词数量 (最大为MAX_SEED_KEYWORDS)
+        idea_cache: 关键词提示缓存 (为None时不使用缓存)
+        
+    Returns:
+        dict: 关键词 -> 关键词数据字典 (未找到数据的关键词对应空字典)
+    """
+    batch_size = max(1, min(batch_size, MAX_SEED_KEYWORDS))
+    results = {}
+    
+    try:
+        keyword_plan_idea_service = client.get_service("KeywordPlanIdeaService")
+        metadata = build_request_metadata(client)
+        
+        # 按规范化文本去重，同一批次中相同的种子只发送一次；缓存命中的关键词不再发送
+        seeds = {}
+        for keyword in keywords:
+            key = normalize_keyword(keyword)
+            if key in seeds or key in results:
+                continue
+            if idea_cache is not None:
+                cached_data = get_cached_keyword_data(idea_cache, keyword, language_id, location_id)
+                if cached_data:
+                    results[key] = cached_data
+                    continue
+            seeds[key] = keyword
+        seed_keys = list(seeds)
+        if results:
+            logger.info("从关键词提示缓存获取 %s 个关键词的数据", len(results))
+        
+        for start in range(0, len(seed_keys), batch_size):
+            chunk = [seeds[key] for key in seed_keys[start:start + batch_size]]
+            logger.info("发送批量关键词规划请求: %s 个种子关键词", len(chunk))
+            
+            us_request = build_keyword_ideas_request(client, customer_id, language_id, location_id)
+            us_request.keyword_seed.keywords.extend(chunk)
+            us_response = fetch_keyword_ideas(keyword_plan_idea_service, us_request, metadata, client)
+            us_ideas = index_ideas(us_response)
+            if idea_cache is not None:
+                harvest_ideas(idea_cache, us_ideas.values(), language_id, location_id)
+            
+            global_request = build_keyword_ideas_request(client, customer_id, language_id)
+            global_request.keyword_seed.keywords.extend(chunk)
+            try:
+                global_response = fetch_keyword_ideas(keyword_plan_idea_service, global_request, metadata, client)
+                global_ideas = index_ideas(global_response)
+                if idea_cache is not None:
+                    harvest_ideas(idea_cache, global_ideas.values(), language_id, None)
+            except Exception as e:
+                if should_fail_over(e, getattr(client, 'breaker', None)):
+                    raise
+                logger.error("获取全球数据失败: %s", e)
+                logger.warning("将使用美国数据作为全球数据的替代")
+                global_ideas = {}
+            
+            for keyword in chunk:
+                key = normalize_keyword(keyword)
+                us_result = us_ideas.get(key)
+                if us_result is None:
+                    logger.warning("未找到关键词 '%s' 的数据", keyword)
+                    results[key] = {}
+                    continue
+                global_result = global_ideas.get(key)
+                results[key] = merge_keyword_data(
+                    extract_idea_data(us_result),
+                    extract_idea_data(global_result) if global_result is not None else None
+                )
+        
+        return {keyword: dict(results.get(normalize_keyword(keyword), {})) for keyword in keywords}
+        
+    except GoogleAdsException as ex:
+        logger.error("Google Ads API错误: %s", ex)
         for error in ex.failure.errors:
-            logger.error(f"\t{error.error_code}: {error.message}")
+            logger.error("\t%s: %s", error.error_code, error.message)
         raise
     except Exception as e:
-        logger.error(f"获取关键词数据时出错: {e}")
+        logger.error("批量获取关键词数据时出错: %s", e)
         logger.error(traceback.format_exc())
         raise
 
-def process_response(response, target_keyword):
+def build_keyword_ideas_request(client, customer_id, language_id, location_id=None):
+    """
+    创建不含种子关键词的GenerateKeywordIdeasRequest
+    
+    Args:
+        client: GoogleAdsClient实例
+        customer_id: 客户ID
+        language_id: 语言ID
+        location_id: 位置ID (为None时不指定地理位置，获取全球数据)
+        
+    Returns:
+        GenerateKeywordIdeasRequest (从客户端缓存的请求模板复制)
+    """
+    return client.new_keyword_ideas_request(customer_id, language_id, location_id, network=DEFAULT_NETWORK)
+
+def build_request_metadata(client=None):
+    """
+    创建请求元数据，使用管理者账户ID作为login-customer-id
+    
+    Args:
+        client: 发送请求的客户端 (使用其配置中的manager_customer_id，没有时使用login_customer_id)，
+                为None时使用config.GOOGLE_ADS
+    
+    Returns:
+        list: gRPC元数据
+    """
+    ads_config = getattr(client, 'config', None)
+    if not ads_config:
+        # 只在没有客户端配置时才读取config.py，导入本模块不依赖config.py
+        from config import GOOGLE_ADS
+        ads_config = GOOGLE_ADS
+    manager_id = ads_config.get('manager_customer_id') or ads_config.get('login_customer_id')
+    logger.debug("使用管理者账户ID: %s 作为login-customer-id", manager_id)
+    return [
+        ("login-customer-id", manager_id)
+    ]
+
+def merge_keyword_data(us_keyword_data, global_keyword_data):
+    """
+    合并特定国家和全球的关键词数据，并计算关键词难度
+    
+    Args:
+        us_keyword_data: 特定国家的关键词数据 (包含volume字段)
+        global_keyword_data: 全球关键词数据 (为空时使用特定国家数据替代)
+        
+    Returns:
+        dict: 包含volume_us、volume_global和kd的关键词数据
+    """
+    keyword_data = us_keyword_data
+    keyword_data['volume_us'] = keyword_data.pop('volume', 0)
+    
+    if global_keyword_data:
+        keyword_data['volume_global'] = global_keyword_data.get('volume', 0)
+    else:
+        keyword_data['volume_global'] = keyword_data['volume_us']
+    
+    # 计算关键词难度 (KD)
+    if 'competition_index' in keyword_data:
+        logger.debug("计算关键词难度")
+        keyword_data['kd'] = calculate_keyword_difficulty(
+            keyword_data['competition_index'],
+            keyword_data['volume_us'],
+            keyword_data.get('cpc', 0)
+        )
+    return keyword_data
+
+def index_ideas(response):
+    """
+    按规范化文本索引API响应中的关键词提示
+    
+    Args:
+        response: API响应
+        
+    Returns:
+        dict: 规范化关键词 -> GenerateKeywordIdeaResult (原生protobuf，同一文本保留第一个结果)
+    """
+    ideas = {}
+    for result in response:
+        result = raw_message(result)
+        ideas.setdefault(normalize_keyword(result.text), result)
+    return ideas
+
+def harvest_ideas(idea_cache, results, language_id, location_id):
+    """
+    把关键词提示结果全部保存到关键词提示缓存
+    
+    Args:
+        idea_cache: 关键词提示缓存
+        results: GenerateKeywordIdeaResult列表
+        language_id: 语言ID
+        location_id: 位置ID (None表示全球)
+    """
+    for result in results:
+        result = raw_message(result)
+        idea_cache.put(result.text, language_id, location_id, extract_idea_data(result))
+
+def get_cached_keyword_data(idea_cache, keyword, language_id, location_id):
+    """
+    从关键词提示缓存中组装关键词数据
+    
+    Args:
+        idea_cache: 关键词提示缓存
+        keyword: 关键词
+        language_id: 语言ID
+        location_id: 位置ID
+        
+    Returns:
+        dict: 关键词数据，特定国家或全球数据缺失时返回None
+    """
+    us_keyword_data = idea_cache.get(keyword, language_id, location_id, DEFAULT_NETWORK)
+    if not us_keyword_data:
+        return None
+    global_keyword_data = idea_cache.get(keyword, language_id, None, DEFAULT_NETWORK)
+    if not global_keyword_data:
+        return None
+    return merge_keyword_data(us_keyword_data, global_keyword_data)
+
+def process_response(response, target_keyword, idea_cache=None, language_id=None, location_id=None):
     """
     处理API响应，提取关键词数据
     
+    提供idea_cache时，响应中的所有关键词提示都会保存到缓存中。
+    
     Args:
         response: API响应
         target_keyword: 目标关键词
+        idea_cache: 关键词提示缓存 (可选)
+        language_id: 语言ID (用于缓存键)
+        location_id: 位置ID (用于缓存键，None表示全球)
         
     Returns:
         dict: 包含关键词数据的字典
     """
     keyword_data = {}
+    target_key = normalize_keyword(target_keyword)
+    # 每个响应只判断一次日志级别，未启用调试日志时循环中不做任何日志相关的处理
+    debug = logger.isEnabledFor(logging.DEBUG)
     
     for result in response:
-        logger.debug(f"处理结果: {result.text}")
-        
-        # 添加详细日志，输出API返回的原始数据
-        logger.debug(f"API返回的原始数据:")
-        logger.debug(f"  - 关键词: {result.text}")
-        logger.debug(f"  - 搜索量: {result.keyword_idea_metrics.avg_monthly_searches}")
-        
-        # 记录CPC相关的详细信息
-        logger.debug(f"  - CPC相关数据:")
-        logger.debug(f"    - average_cpc_micros: {result.keyword_idea_metrics.average_cpc_micros}")
-        logger.debug(f"    - 转换后的CPC(美元): {result.keyword_idea_metrics.average_cpc_micros / 1000000 if result.keyword_idea_metrics.average_cpc_micros else 0}")
-        
-        # 记录竞争度相关的详细信息
-        logger.debug(f"  - 竞争度相关数据:")
-        logger.debug(f"    - competition: {result.keyword_idea_metrics.competition.name}")
-        logger.debug(f"    - competition_index: {result.keyword_idea_metrics.competition_index}")
+        # proto-plus结果先取出内部的原生protobuf消息，之后的字段读取不再经过包装层
+        result = raw_message(result)
+        if debug and sample_debug():
+            log_idea(result)
+        
+        # 保存所有关键词提示，供后续查询使用
+        if idea_cache is not None:
+            idea_data = extract_idea_data(result)
+            idea_cache.put(result.text, language_id, location_id, idea_data)
+        else:
+            idea_data = None
         
-        if result.text.lower() == target_keyword.lower():
+        if not keyword_data and normalize_keyword(result.text) == target_key:
             # 提取数据
-            logger.info(f"找到精确匹配的关键词: {result.text}")
-            
-            # 处理CPC数据
-            cpc_micros = result.keyword_idea_metrics.average_cpc_micros
-            if cpc_micros and cpc_micros > 0:
-                cpc = cpc_micros / 1000000  # 转换为美元
-            else:
-                cpc = None  # 使用None表示CPC数据不可用
-                logger.debug(f"CPC数据不可用 (average_cpc_micros = {cpc_micros})")
-            
-            keyword_data = {
-                'keyword': result.text,
-                'volume': result.keyword_idea_metrics.avg_monthly_searches,
-                'competition': result.keyword_idea_metrics.competition.name,
-                'competition_index': result.keyword_idea_metrics.competition_index,
-                'cpc': cpc,
-                'type': analyze_keyword_type(result.text)
-            }
-            break
+            logger.info("找到精确匹配的关键词: %s", result.text)
+            keyword_data = dict(idea_data) if idea_data else extract_idea_data(result)
+            if idea_cache is None:
+                break
     
     # 如果没有找到精确匹配的关键词，使用第一个结果
     if not keyword_data and response:
         try:
             result = list(response)[0]
-            logger.info(f"未找到精确匹配，使用第一个结果: {result.text}")
-            
-            # 处理CPC数据
-            cpc_micros = result.keyword_idea_metrics.average_cpc_micros
-            if cpc_micros and cpc_micros > 0:
-                cpc = cpc_micros / 1000000  # 转换为美元
-            else:
-                cpc = None  # 使用None表示CPC数据不可用
-                logger.debug(f"CPC数据不可用 (average_cpc_micros = {cpc_micros})")
-            
-            keyword_data = {
-                'keyword': result.text,
-                'volume': result.keyword_idea_metrics.avg_monthly_searches,
-                'competition': result.keyword_idea_metrics.competition.name,
-                'competition_index': result.keyword_idea_metrics.competition_index,
-                'cpc': cpc,
-                'type': analyze_keyword_type(result.text)
-            }
+            logger.info("未找到精确匹配，使用第一个结果: %s", result.text)
+            keyword_data = extract_idea_data(result)
         except Exception as e:
-            logger.error(f"处理第一个结果时出错: {e}")
+            logger.error("处理第一个结果时出错: %s", e)
     
     return keyword_data
 
-def calculate_keyword_difficulty(competition_index, search_volume, cpc):
+def log_idea(result):
+    """
+    记录API返回的关键词提示原始数据 (调试日志)
+    
+    Args:
+        result: GenerateKeywordIdeaResult
+    """
+    metrics = result.keyword_idea_metrics
+    cpc_micros = metrics.average_cpc_micros
+    log_fields(
+        logger, logging.DEBUG, "API返回的关键词提示",
+        keyword=result.text,
+        volume=metrics.avg_monthly_searches,
+        cpc_micros=cpc_micros,
+        cpc=cpc_micros / 1000000 if cpc_micros else 0,
+        competition=competition_name(metrics.competition),
+        competition_index=metrics.competition_index
+    )
+
+def extract_idea_data(result):
+    """
+    从单个关键词提示结果中提取关键词数据
+    
+    proto-plus结果 (use_proto_plus=True) 先转换为原生protobuf消息 (不复制数据)，
+    然后一次读取所需的字段；use_proto_plus=False时直接读取。
+    
+    Args:
+        result: GenerateKeywordIdeaResult (proto-plus或原生protobuf)
+        
+    Returns:
+        dict: 包含关键词数据的字典
+    """
+    result = raw_message(result)
+    return extract_metrics_data(result.text, result.keyword_idea_metrics)
+
+def raw_message(message):
+    """
+    获取消息的原生protobuf对象
+    
+    Args:
+        message: proto-plus或原生protobuf消息
+        
+    Returns:
+        原生protobuf消息 (proto-plus消息返回其内部的消息，不复制)
+    """
+    if isinstance(message, ProtobufMessage):
+        return message
+    return type(message).pb(message)
+
+def competition_name(competition):
+    """
+    获取竞争度枚举值的名称
+    
+    Args:
+        competition: proto-plus枚举值或原生protobuf的整数值
+        
+    Returns:
+        str: 竞争度名称 (如LOW)
+    """
+    name = getattr(competition, 'name', None)
+    if name is not None:
+        return name
+    if 0 <= competition < len(COMPETITION_LEVELS):
+        return COMPETITION_LEVELS[competition]
+    return 'UNKNOWN'
+
+def extract_metrics_data(text, metrics):
+    """
+    从关键词指标中提取关键词数据
+    
+    Args:
+        text: 关键词文本
+        metrics: KeywordPlanHistoricalMetrics (proto-plus或原生protobuf)
+        
+    Returns:
+        dict: 包含关键词数据的字典
+    """
+    # 处理CPC数据
+    cpc_micros = metrics.average_cpc_micros
+    if cpc_micros and cpc_micros > 0:
+        cpc = cpc_micros / 1000000  # 转换为美元
+    else:
+        cpc = None  # 使用None表示CPC数据不可用
+        logger.debug("CPC数据不可用 (average_cpc_micros = %s)", cpc_micros)
+    
+    return {
+        'keyword': text,
+        'volume': metrics.avg_monthly_searches,
+        'competition': competition_name(metrics.competition),
+        'competition_index': metrics.competition_index,
+        'cpc': cpc,
+        'type': analyze_keyword_type(text)
+    }
+
+def calculate_keyword_difficulty(competition_index, search_volume, cpc, model=None):
     """
     计算关键词难度 (KD)
     
@@ -258,34 +662,30 @@ def calculate_keyword_difficulty(competition_index, search_volume, cpc):
         competition_index: 竞争指数 (0-100)
         search_volume: 搜索量
         cpc: 每次点击成本
+        model: 评分模型或模型版本 (默认为scoring.DEFAULT_MODEL_VERSION)
         
     Returns:
         float: 关键词难度 (0-100)
     """
     try:
-        logger.debug(f"计算KD: 竞争指数={competition_index}, 搜索量={search_volume}, CPC={cpc}")
-        
-        # 简单算法：竞争指数 * 0.7 + 搜索量因子 * 0.2 + CPC因子 * 0.1
+        logger.debug("计算KD: 竞争指数=%s, 搜索量=%s, CPC=%s", competition_index, search_volume, cpc)
         
-        # 搜索量因子 (0-100)
-        volume_factor = min(100, search_volume / 100) if search_volume else 0
+        # 评分公式见scoring模块 (v1: 竞争指数 * 0.7 + 搜索量因子 * 0.2 + CPC因子 * 0.1)
+        kd = score_keyword(competition_index, search_volume, cpc, model)
         
-        # CPC因子 (0-100)
-        cpc_factor = min(100, cpc * 20) if cpc else 0
-        
-        # 计算KD
-        kd = (competition_index * 0.7) + (volume_factor * 0.2) + (cpc_factor * 0.1)
-        
-        logger.debug(f"计算的KD值: {kd}")
-        return round(kd, 1)
+        logger.debug("计算的KD值: %s", kd)
+        return kd
     except Exception as e:
-        logger.error(f"计算关键词难度时出错: {e}")
+        logger.error("计算关键词难度时出错: %s", e)
         return 0
 
 def analyze_keyword_type(keyword):
     """
     分析关键词类型 (信息型/商业型/交易型)
     
+    特征词匹配由intent模块的Aho-Corasick分类器完成，同时匹配多种类型时
+    按交易型 > 商业型 > 信息型的优先级判断。
+    
     Args:
         keyword: 关键词
         
@@ -293,48 +693,9 @@ def analyze_keyword_type(keyword):
         str: 关键词类型 (I/C/T)
     """
     try:
-        logger.debug(f"分析关键词类型: {keyword}")
-        
-        # 信息型关键词特征
-        informational_indicators = [
-            'what', 'how', 'why', 'when', 'where', 'who', 'which', 
-            '是什么', '怎么', '为什么', '如何', '教程', '指南', 'guide', 'tutorial'
-        ]
-        
-        # 商业型关键词特征
-        commercial_indicators = [
-            'best', 'top', 'review', 'compare', 'vs', 'versus', 
-            '最好', '推荐', '评测', '对比', '排名', 'ranking'
-        ]
-        
-        # 交易型关键词特征
-        transactional_indicators = [
-            'buy', 'price', 'cheap', 'discount', 'deal', 'coupon', 'purchase', 'shop', 'order',
-            '购买', '价格', '优惠', '折扣', '订购', '下单', '商店'
-        ]
-        
-        # 转换为小写进行比较
-        keyword_lower = keyword.lower()
-        
-        # 检查关键词类型
-        for indicator in transactional_indicators:
-            if indicator in keyword_lower:
-                logger.debug(f"关键词 '{keyword}' 被识别为交易型 (T)")
-                return 'T'  # 交易型
-                
-        for indicator in commercial_indicators:
-            if indicator in keyword_lower:
-                logger.debug(f"关键词 '{keyword}' 被识别为商业型 (C)")
-                return 'C'  # 商业型
-                
-        for indicator in informational_indicators:
-            if indicator in keyword_lower:
-                logger.debug(f"关键词 '{keyword}' 被识别为信息型 (I)")
-                return 'I'  # 信息型
-        
-        # 默认为信息型
-        logger.debug(f"关键词 '{keyword}' 默认识别为信息型 (I)")
-        return 'I'
+        keyword_type = classify_keyword(keyword)
+        logger.debug("关键词 '%s' 被识别为 %s", keyword, keyword_type)
+        return keyword_type
     except Exception as e:
-        logger.error(f"分析关键词类型时出错: {e}")
+        logger.error("分析关键词类型时出错: %s", e)
         return 'I'  # 默认为信息型
@@ -0,0 +1,172 @@
+"""
+关键词历史指标模块
+基于GenerateKeywordHistoricalMetrics批量获取已知关键词的精确指标
+"""
+
+import logging
+import traceback
+from google.ads.googleads.errors import GoogleAdsException
+from .idea_cache import DEFAULT_NETWORK
+from .retry import call_with_retry, should_fail_over
+from .keyword_data import (
+    build_request_metadata,
+    extract_metrics_data,
+    merge_keyword_data,
+    normalize_keyword,
+    raw_message,
+)
+
+logger = logging.getLogger(__name__)
+
+# GenerateKeywordHistoricalMetricsRequest 每个请求最多允许10000个关键词
+MAX_HISTORICAL_METRICS_KEYWORDS = 10000
+
+def get_keywords_metrics(client, customer_id, keywords, language_id="1000", location_id="2840", batch_size=MAX_HISTORICAL_METRICS_KEYWORDS):
+    """
+    批量获取关键词的精确指标
+    
+    每批关键词发送一个特定国家请求和一个全球请求。结果只按关键词文本
+    (及API返回的close_variants) 精确匹配，匹配不到的关键词返回空字典，
+    不会退回到其他关键词的数据。
+    
+    Args:
+        client: GoogleAdsClient实例
+        customer_id: 客户ID
+        keywords: 要查询的关键词列表
+        language_id: 语言ID (默认为1000，英语)
+        location_id: 位置ID (默认为2840，美国)
+        batch_size: 每个请求包含的关键词数量 (最大为MAX_HISTORICAL_METRICS_KEYWORDS)
+    
+    Returns:
+        dict: 关键词 -> 关键词数据字典 (volume_us, volume_global, kd, cpc, type等)
+    """
+    batch_size = max(1, min(batch_size, MAX_HISTORICAL_METRICS_KEYWORDS))
+    results = {}
+    
+    try:
+        keyword_plan_idea_service = client.get_service("KeywordPlanIdeaService")
+        keyword_plan_network = client.get_enum("KeywordPlanNetworkEnum", DEFAULT_NETWORK)
+        language_resource_name = client.language_constant_path(language_id)
+        location_resource_name = client.geo_target_constant_path(location_id)
+        metadata = build_request_metadata(client)
+        
+        # 按规范化文本去重
+        unique = {}
+        for keyword in keywords:
+            unique.setdefault(normalize_keyword(keyword), keyword)
+        keys = list(unique)
+        
+        for start in range(0, len(keys), batch_size):
+            chunk = [unique[key] for key in keys[start:start + batch_size]]
+            logger.info("发送关键词历史指标请求: %s 个关键词", len(chunk))
+            
+            us_request = build_historical_metrics_request(
+                client, customer_id, chunk, language_resource_name, keyword_plan_network,
+                location_resource_name=location_resource_name
+            )
+            us_response = call_with_retry(
+                lambda: keyword_plan_idea_service.generate_keyword_historical_metrics(
+                    request=us_request,
+                    metadata=metadata
+                ),
+                policy=client.retry_policy,
+                breaker=client.breaker,
+                description="generate_keyword_historical_metrics请求",
+                limiter=client.limiter
+            )
+            us_metrics = index_metrics(us_response)
+            
+            global_request = build_historical_metrics_request(
+                client, customer_id, chunk, language_resource_name, keyword_plan_network
+            )
+            try:
+                global_response = call_with_retry(
+                    lambda: keyword_plan_idea_service.generate_keyword_historical_metrics(
+                        request=global_request,
+                        metadata=metadata
+                    ),
+                    policy=client.retry_policy,
+                    breaker=client.breaker,
+                    description="generate_keyword_historical_metrics请求",
+                    limiter=client.limiter
+                )
+                global_metrics = index_metrics(global_response)
+            except Exception as e:
+                # 账户池中的账户配额耗尽时由账户池换用其他账户重新查询
+                if should_fail_over(e, client.breaker):
+                    raise
+                logger.error("获取全球历史指标失败: %s", e)
+                logger.warning("将使用特定国家数据作为全球数据的替代")
+                global_metrics = {}
+            
+            for keyword in chunk:
+                key = normalize_keyword(keyword)
+                us_result = us_metrics.get(key)
+                if us_result is None:
+                    logger.warning("未找到关键词 '%s' 的历史指标", keyword)
+                    results[key] = {}
+                    continue
+                global_result = global_metrics.get(key)
+                results[key] = merge_keyword_data(
+                    extract_metrics_data(us_result.text, us_result.keyword_metrics),
+                    extract_metrics_data(global_result.text, global_result.keyword_metrics)
+                    if global_result is not None else None
+                )
+        
+        return {keyword: dict(results.get(normalize_keyword(keyword), {})) for keyword in keywords}
+    
+    except GoogleAdsException as ex:
+        logger.error("Google Ads API错误: %s", ex)
+        for error in ex.failure.errors:
+            logger.error("\t%s: %s", error.error_code, error.message)
+        raise
+    except Exception as e:
+        logger.error("获取关键词历史指标时出错: %s", e)
+        logger.error(traceback.format_exc())
+        raise
+
+def build_historical_metrics_request(client, customer_id, keywords, language_resource_name, keyword_plan_network, location_resource_name=None):
+    """
+    创建GenerateKeywordHistoricalMetricsRequest
+    
+    Args:
+        client: GoogleAdsClient实例
+        customer_id: 客户ID
+        keywords: 关键词列表
+        language_resource_name: 语言资源名称
+        keyword_plan_network: 关键词规划网络枚举值
+        location_resource_name: 位置资源名称 (为None时不指定地理位置，获取全球数据)
+    
+    Returns:
+        GenerateKeywordHistoricalMetricsRequest
+    """
+    request = client.get_type("GenerateKeywordHistoricalMetricsRequest")
+    request.customer_id = customer_id
+    request.keywords.extend(keywords)
+    request.language = language_resource_name
+    if location_resource_name:
+        request.geo_target_constants.append(location_resource_name)
+    request.include_adult_keywords = False
+    request.keyword_plan_network = keyword_plan_network
+    return request
+
+def index_metrics(response):
+    """
+    按规范化文本索引历史指标结果
+    
+    API会把同义变体合并到一行并在close_variants中列出，
+    因此变体文本也指向同一个结果。
+    
+    Args:
+        response: GenerateKeywordHistoricalMetricsResponse
+    
+    Returns:
+        dict: 规范化关键词 -> GenerateKeywordHistoricalMetricsResult (原生protobuf)
+    """
+    metrics = {}
+    # 整个响应只转换一次，之后直接读取原生protobuf字段
+    for result in raw_message(response).results:
+        metrics.setdefault(normalize_keyword(result.text), result)
+        for variant in result.close_variants:
+            metrics.setdefault(normalize_keyword(variant), result)
+    return metrics
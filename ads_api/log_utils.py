@@ -0,0 +1,113 @@
+"""
+日志工具模块
+提供日志配置、JSON格式输出和调试日志采样
+
+ads_api包本身不配置日志 (只在包的logger上添加NullHandler)，
+由命令行工具或调用方通过configure_logging或logging.basicConfig配置。
+"""
+
+import sys
+import json
+import random
+import logging
+
+# 日志的默认文本格式
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# 调试日志的采样率 (0-1)，热路径上的调试日志按此比例记录
+_debug_sample_rate = 1.0
+
+def sample_debug():
+    """
+    按采样率决定是否记录一条热路径上的调试日志
+    
+    调用前应先用logger.isEnabledFor(logging.DEBUG)判断调试日志是否启用。
+    
+    Returns:
+        bool: 是否记录
+    """
+    return _debug_sample_rate >= 1.0 or random.random() < _debug_sample_rate
+
+class _FieldsText:
+    """字段的文本表示 (只在日志真正输出时才格式化)"""
+    
+    __slots__ = ('fields',)
+    
+    def __init__(self, fields):
+        self.fields = fields
+    
+    def __str__(self):
+        return " ".join(f"{key}={value}" for key, value in self.fields.items())
+
+def log_fields(logger, level, message, **fields):
+    """
+    记录带结构化字段的日志
+    
+    文本格式下字段以 key=value 的形式追加到消息后；JSON格式下字段单独输出。
+    已经通过sample_debug采样的日志不会被采样过滤器再次过滤。
+    
+    Args:
+        logger: logging.Logger
+        level: 日志级别
+        message: 日志消息
+        **fields: 结构化字段
+    """
+    logger.log(level, "%s %s", message, _FieldsText(fields), extra={'fields': fields, 'sampled': True})
+
+class JsonFormatter(logging.Formatter):
+    """把日志记录格式化为单行JSON"""
+    
+    def format(self, record):
+        fields = getattr(record, 'fields', None)
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            # log_fields记录的第一个参数是不含字段的消息
+            'message': record.args[0] if fields is not None else record.getMessage(),
+        }
+        if fields is not None:
+            entry.update({key: value if isinstance(value, (int, float, bool, type(None))) else str(value)
+                          for key, value in fields.items()})
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+class DebugSampleFilter(logging.Filter):
+    """按比例采样调试日志，INFO及以上级别的日志全部保留"""
+    
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+    
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or getattr(record, 'sampled', False):
+            return True
+        return random.random() < self.rate
+
+def configure_logging(level=logging.INFO, json_format=False, debug_sample_rate=1.0, stream=None):
+    """
+    配置根logger (替换已有的处理器)
+    
+    Args:
+        level: 日志级别
+        json_format: 是否输出JSON格式的日志
+        debug_sample_rate: 调试日志的采样率 (0-1)
+        stream: 输出流 (默认为标准输出)
+    """
+    global _debug_sample_rate
+    _debug_sample_rate = max(0.0, min(1.0, debug_sample_rate))
+    
+    handler = logging.StreamHandler(stream or sys.stdout)
+    if json_format:
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    if _debug_sample_rate < 1.0:
+        handler.addFilter(DebugSampleFilter(_debug_sample_rate))
+    
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
@@ -0,0 +1,52 @@
+"""
+关键词规范化模块
+提供关键词文本的规范化处理，用于匹配、缓存和去重
+"""
+
+import string
+import unicodedata
+from functools import lru_cache
+
+# 规范化结果的缓存条目数
+NORMALIZE_CACHE_SIZE = 65536
+
+# 直接删除的撇号 (men's -> mens)
+APOSTROPHES = "'’ʼ"
+
+# 保留的标点和符号 (c++、c#、at&t 等关键词中有实际含义)
+KEPT_PUNCTUATION = "#&+"
+
+# ASCII文本的快速转换表
+ASCII_TRANSLATION = str.maketrans({
+    char: None if char in APOSTROPHES else ' '
+    for char in string.punctuation
+    if char not in KEPT_PUNCTUATION and unicodedata.category(char).startswith('P')
+})
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_keyword(keyword):
+    """
+    规范化关键词文本，用于匹配API返回的关键词提示和合并重复的关键词
+    
+    依次进行NFKC规范化 (全角字符转换为半角)、大小写折叠、删除撇号、
+    把其他标点替换为空格 (#、&、+ 除外)，最后合并连续的空白。
+    
+    Args:
+        keyword: 关键词
+    
+    Returns:
+        str: 规范化后的关键词
+    """
+    if keyword.isascii():
+        return " ".join(keyword.lower().translate(ASCII_TRANSLATION).split())
+    
+    text = unicodedata.normalize('NFKC', keyword).casefold()
+    chars = []
+    for char in text:
+        if char in APOSTROPHES:
+            continue
+        if char not in KEPT_PUNCTUATION and unicodedata.category(char).startswith('P'):
+            chars.append(' ')
+        else:
+            chars.append(char)
+    return " ".join("".join(chars).split())
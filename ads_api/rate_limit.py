@@ -0,0 +1,104 @@
+"""
+请求速率限制模块
+提供线程安全的令牌桶限速器
+"""
+
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+def parse_rate(rate):
+    """
+    解析速率字符串
+    
+    Args:
+        rate: 速率字符串，如 "5/s"、"300/m" 或 "2.5" (默认为每秒)
+    
+    Returns:
+        float: 每秒请求数
+    
+    Raises:
+        ValueError: 如果速率格式无效
+    """
+    text = str(rate).strip().lower()
+    per_unit = {'s': 1.0, 'sec': 1.0, 'm': 60.0, 'min': 60.0, 'h': 3600.0}
+    if '/' in text:
+        amount, unit = text.split('/', 1)
+        if unit not in per_unit:
+            raise ValueError(f"无效的速率单位: {rate}")
+        value = float(amount) / per_unit[unit]
+    else:
+        value = float(text)
+    if value <= 0:
+        raise ValueError(f"速率必须大于0: {rate}")
+    return value
+
+class TokenBucket:
+    """
+    令牌桶限速器
+    
+    令牌以固定速率补充，桶中最多保存capacity个令牌。
+    多个线程共享同一个令牌桶时，总请求速率不会超过rate。
+    """
+    
+    def __init__(self, rate, capacity=None):
+        """
+        初始化令牌桶
+        
+        Args:
+            rate: 每秒补充的令牌数
+            capacity: 桶容量 (允许的突发请求数，默认为1)
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else 1)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now):
+        """按经过的时间补充令牌"""
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+    
+    def acquire(self, tokens=1, timeout=None):
+        """
+        获取令牌，令牌不足时阻塞等待
+        
+        Args:
+            tokens: 需要的令牌数
+            timeout: 最长等待秒数，为None时一直等待
+        
+        Returns:
+            bool: 是否成功获取令牌
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+    
+    def set_rate(self, rate):
+        """
+        调整补充速率
+        
+        Args:
+            rate: 新的每秒补充令牌数
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
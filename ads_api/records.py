@@ -0,0 +1,262 @@
+"""
+关键词记录模块
+提供紧凑的单个关键词记录 (KeywordRecord) 和列式存储的关键词批次 (KeywordBatch)，
+用于在内存中大量保存关键词数据，可以与原来的字典格式相互转换
+"""
+
+import sys
+from array import array
+
+# 竞争度名称 (与KeywordPlanCompetitionLevel枚举的取值一致)，记录中保存其下标
+COMPETITION_LEVELS = ('UNSPECIFIED', 'UNKNOWN', 'LOW', 'MEDIUM', 'HIGH')
+COMPETITION_CODES = {name: code for code, name in enumerate(COMPETITION_LEVELS)}
+
+# 关键词类型 (信息型/商业型/交易型)，记录中保存其下标
+KEYWORD_TYPES = ('I', 'C', 'T')
+KEYWORD_TYPE_CODES = {name: code for code, name in enumerate(KEYWORD_TYPES)}
+
+# 列式存储中表示缺失值的数值
+MISSING = -1
+
+def competition_code(name):
+    """
+    获取竞争度名称对应的代码
+    
+    Args:
+        name: 竞争度名称 (如LOW)，为None时视为UNKNOWN
+    
+    Returns:
+        int: 竞争度代码
+    """
+    return COMPETITION_CODES.get(name or 'UNKNOWN', COMPETITION_CODES['UNKNOWN'])
+
+def keyword_type_code(name):
+    """
+    获取关键词类型对应的代码
+    
+    Args:
+        name: 关键词类型 (I/C/T)，无法识别时视为信息型
+    
+    Returns:
+        int: 关键词类型代码
+    """
+    return KEYWORD_TYPE_CODES.get(name, 0)
+
+def cpc_to_micros(cpc):
+    """把CPC (美元) 转换为微单位整数，None保持不变"""
+    return None if cpc is None else int(round(cpc * 1000000))
+
+def micros_to_cpc(cpc_micros):
+    """把微单位CPC转换为美元，0或None表示CPC数据不可用"""
+    return cpc_micros / 1000000 if cpc_micros else None
+
+class KeywordRecord:
+    """
+    单个关键词提示的数据
+    
+    使用__slots__保存字段，竞争度和关键词类型保存为小整数代码，CPC保存为微单位整数。
+    不含关键词文本时，占用内存不到同样内容的字典的一半。
+    """
+    
+    __slots__ = ('keyword', 'volume', 'cpc_micros', 'competition_code', 'competition_index', 'type_code')
+    
+    def __init__(self, keyword, volume=None, cpc_micros=None, competition_code=1, competition_index=None, type_code=0):
+        """
+        初始化关键词记录
+        
+        Args:
+            keyword: 关键词文本
+            volume: 月均搜索量
+            cpc_micros: 平均CPC (微单位)
+            competition_code: 竞争度代码 (见COMPETITION_LEVELS)
+            competition_index: 竞争指数 (0-100)
+            type_code: 关键词类型代码 (见KEYWORD_TYPES)
+        """
+        self.keyword = keyword
+        self.volume = volume
+        self.cpc_micros = cpc_micros
+        self.competition_code = competition_code
+        self.competition_index = competition_index
+        self.type_code = type_code
+    
+    @property
+    def competition(self):
+        """竞争度名称"""
+        return COMPETITION_LEVELS[self.competition_code]
+    
+    @property
+    def type(self):
+        """关键词类型 (I/C/T)"""
+        return KEYWORD_TYPES[self.type_code]
+    
+    @property
+    def cpc(self):
+        """平均CPC (美元)，数据不可用时为None"""
+        return micros_to_cpc(self.cpc_micros)
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        从关键词数据字典创建记录
+        
+        Args:
+            data: 关键词数据字典 (keyword/volume/competition/competition_index/cpc/type)，
+                  合并后的数据没有volume字段时使用volume_us
+        
+        Returns:
+            KeywordRecord
+        """
+        return cls(
+            sys.intern(data.get('keyword') or ''),
+            data['volume'] if 'volume' in data else data.get('volume_us'),
+            cpc_to_micros(data.get('cpc')),
+            competition_code(data.get('competition')),
+            data.get('competition_index'),
+            keyword_type_code(data.get('type'))
+        )
+    
+    def to_dict(self):
+        """
+        转换为关键词数据字典 (与extract_idea_data返回的格式相同)
+        
+        Returns:
+            dict: 关键词数据
+        """
+        return {
+            'keyword': self.keyword,
+            'volume': self.volume,
+            'competition': self.competition,
+            'competition_index': self.competition_index,
+            'cpc': self.cpc,
+            'type': self.type
+        }
+    
+    def __eq__(self, other):
+        if not isinstance(other, KeywordRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    def __repr__(self):
+        return (f"KeywordRecord(keyword={self.keyword!r}, volume={self.volume}, cpc_micros={self.cpc_micros}, "
+                f"competition={self.competition}, competition_index={self.competition_index}, type={self.type})")
+
+class KeywordBatch:
+    """
+    列式存储的关键词批次
+    
+    搜索量、CPC、竞争指数和关键词难度保存在array数组中，竞争度和关键词类型保存在bytearray中，
+    每个关键词只占用约40个字节 (不含关键词文本本身)；数值列可以直接用于批量计算
+    (如numpy.frombuffer)。缺失的数值保存为MISSING (-1)。
+    """
+    
+    def __init__(self):
+        self.keywords = []
+        self.volumes = array('q')
+        self.cpc_micros = array('q')
+        self.competition_indexes = array('h')
+        self.kds = array('d')
+        self.competition_codes = bytearray()
+        self.type_codes = bytearray()
+    
+    def append(self, record, kd=None):
+        """
+        追加一个关键词
+        
+        Args:
+            record: KeywordRecord或关键词数据字典
+            kd: 关键词难度 (为None时使用字典中的kd字段)
+        """
+        if isinstance(record, dict):
+            if kd is None:
+                kd = record.get('kd')
+            record = KeywordRecord.from_dict(record)
+        self.keywords.append(record.keyword)
+        self.volumes.append(MISSING if record.volume is None else record.volume)
+        self.cpc_micros.append(MISSING if record.cpc_micros is None else record.cpc_micros)
+        self.competition_indexes.append(MISSING if record.competition_index is None else record.competition_index)
+        self.kds.append(MISSING if kd is None else kd)
+        self.competition_codes.append(record.competition_code)
+        self.type_codes.append(record.type_code)
+    
+    def extend(self, records):
+        """
+        追加多个关键词
+        
+        Args:
+            records: KeywordRecord或关键词数据字典的序列
+        """
+        for record in records:
+            self.append(record)
+    
+    @classmethod
+    def from_dicts(cls, dicts):
+        """
+        从关键词数据字典列表创建批次
+        
+        Args:
+            dicts: 关键词数据字典列表
+        
+        Returns:
+            KeywordBatch
+        """
+        batch = cls()
+        batch.extend(dicts)
+        return batch
+    
+    def record(self, index):
+        """
+        获取第index个关键词的记录
+        
+        Args:
+            index: 下标
+        
+        Returns:
+            KeywordRecord
+        """
+        def value(column):
+            return None if column[index] == MISSING else column[index]
+        
+        return KeywordRecord(
+            self.keywords[index],
+            value(self.volumes),
+            value(self.cpc_micros),
+            self.competition_codes[index],
+            value(self.competition_indexes),
+            self.type_codes[index]
+        )
+    
+    def kd(self, index):
+        """第index个关键词的关键词难度，未计算时为None"""
+        return None if self.kds[index] == MISSING else self.kds[index]
+    
+    def to_dict(self, index):
+        """
+        把第index个关键词转换为关键词数据字典 (包含kd字段时追加kd)
+        
+        Args:
+            index: 下标
+        
+        Returns:
+            dict: 关键词数据
+        """
+        data = self.record(index).to_dict()
+        kd = self.kd(index)
+        if kd is not None:
+            data['kd'] = kd
+        return data
+    
+    def to_dicts(self):
+        """
+        转换为关键词数据字典列表
+        
+        Returns:
+            list: 关键词数据字典列表
+        """
+        return [self.to_dict(index) for index in range(len(self))]
+    
+    def __len__(self):
+        return len(self.keywords)
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.record(index)
@@ -0,0 +1,137 @@
+"""
+报表查询模块
+GAQL流式查询结果的字段投影，以及把查询结果直接写入行写入器
+"""
+
+import re
+import enum
+import logging
+from operator import attrgetter
+
+logger = logging.getLogger(__name__)
+
+# GAQL查询的SELECT子句
+SELECT_PATTERN = re.compile(r'^\s*SELECT\s+(.+?)\s+FROM\s', re.IGNORECASE | re.DOTALL)
+
+def parse_select_fields(query):
+    """
+    解析GAQL查询中SELECT的字段
+    
+    Args:
+        query: GAQL查询字符串
+    
+    Returns:
+        list: 字段列表 (如 ['campaign.id', 'metrics.clicks'])
+    
+    Raises:
+        ValueError: 如果无法解析SELECT子句
+    """
+    match = SELECT_PATTERN.match(query)
+    if not match:
+        raise ValueError("无法解析GAQL查询的SELECT字段")
+    fields = [field.strip() for field in match.group(1).split(',') if field.strip()]
+    if not fields:
+        raise ValueError("GAQL查询没有SELECT字段")
+    return fields
+
+def plain_value(value):
+    """
+    把字段值转换为普通的Python值
+    
+    proto-plus枚举转换为名称，重复字段转换为列表，其他值原样返回
+    (原生protobuf模式下枚举字段本身就是整数)。
+    """
+    if isinstance(value, enum.Enum):
+        return value.name
+    if value is None or isinstance(value, (str, bytes, int, float)):
+        return value
+    if hasattr(value, '__len__') and hasattr(value, '__iter__') and not hasattr(value, 'ListFields'):
+        return [plain_value(item) for item in value]
+    return value
+
+def message_field_names(message):
+    """
+    获取消息的字段名称 (同时支持proto-plus和原生protobuf)
+    
+    Returns:
+        字段名称的集合 (不是消息时为空)
+    """
+    meta = getattr(type(message), 'meta', None)
+    if meta is not None and hasattr(meta, 'fields'):
+        return meta.fields
+    descriptor = getattr(message, 'DESCRIPTOR', None)
+    return descriptor.fields_by_name if descriptor is not None else {}
+
+def resolve_field_path(message, path):
+    """
+    把GAQL字段路径转换为消息的属性路径
+    
+    google-ads库中与Python内置名称或关键字冲突的字段带有下划线后缀 (如ad_group_criterion.type
+    对应属性type_)，按消息的字段名称逐段确定属性名。
+    
+    Args:
+        message: GoogleAdsRow (proto-plus或原生protobuf)
+        path: GAQL字段路径 (如 'ad_group_criterion.type')
+    
+    Returns:
+        str: 属性路径 (如 'ad_group_criterion.type_')
+    """
+    names = []
+    for segment in path.split('.'):
+        fields = message_field_names(message) if message is not None else {}
+        if segment not in fields and segment + '_' in fields:
+            segment += '_'
+        names.append(segment)
+        message = getattr(message, segment, None) if fields else None
+    return '.'.join(names)
+
+def row_projector(fields, row_factory=None):
+    """
+    创建把GoogleAdsRow投影为紧凑的行的函数
+    
+    字段路径与GAQL的SELECT字段相同，在第一行时按消息的字段名称解析为属性路径，之后直接使用。
+    
+    Args:
+        fields: 字段列表
+        row_factory: 以字段值为位置参数调用的构造函数 (如namedtuple类)，为None时返回元组
+    
+    Returns:
+        function: 接收GoogleAdsRow，返回元组或row_factory的返回值
+    """
+    getter = None
+    single = len(fields) == 1
+    
+    def project(row):
+        nonlocal getter
+        if getter is None:
+            getter = attrgetter(*(resolve_field_path(row, field) for field in fields))
+        values = getter(row)
+        if single:
+            values = (values,)
+        values = tuple(plain_value(value) for value in values)
+        return row_factory(*values) if row_factory is not None else values
+    
+    return project
+
+def export_query(client, customer_id, query, writer, fields=None):
+    """
+    流式执行GAQL查询并把每一行直接写入行写入器 (见writers.create_row_writer)
+    
+    Args:
+        client: GoogleAdsClient实例
+        customer_id: 客户ID
+        query: GAQL查询字符串
+        writer: 行写入器 (列与fields一致)
+        fields: 投影的字段列表 (默认为查询中SELECT的字段)
+    
+    Returns:
+        int: 写入的行数
+    """
+    fields = fields or parse_select_fields(query)
+    count = 0
+    for row in client.execute_query_stream(customer_id, query, fields=fields):
+        writer.write(row)
+        count += 1
+        if count % 100000 == 0:
+            logger.info(f"已写入 {count} 行")
+    return count
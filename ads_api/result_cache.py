@@ -0,0 +1,288 @@
+"""
+关键词结果缓存模块
+基于SQLite的持久化缓存，保存get_keyword_data的结果
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from .idea_cache import DEFAULT_NETWORK, default_idea_cache
+from .normalize import normalize_keyword
+
+logger = logging.getLogger(__name__)
+
+# 默认缓存文件路径
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "ads_api", "keyword_cache.sqlite3")
+# 默认有效期 (秒)：搜索量数据按月更新，默认缓存7天
+DEFAULT_CACHE_TTL = 7 * 24 * 3600
+# 默认最多缓存的条目数
+DEFAULT_CACHE_MAX_ENTRIES = 500000
+# 每写入多少条检查一次容量上限
+EVICTION_INTERVAL = 100
+
+class ResultCache:
+    """
+    SQLite持久化关键词结果缓存
+    
+    以 (规范化关键词, 语言ID, 位置ID, 网络) 为键保存关键词数据。
+    条目超过ttl后失效；超过max_entries时按最近访问时间淘汰 (LRU)。
+    数据库使用WAL模式，可以被多个进程同时读写；每个线程使用独立的连接。
+    """
+    
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_CACHE_TTL, max_entries=DEFAULT_CACHE_MAX_ENTRIES):
+        """
+        初始化结果缓存
+        
+        Args:
+            path: SQLite数据库文件路径
+            ttl: 条目有效期 (秒)
+            max_entries: 最多保存的条目数
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._initialize_schema()
+    
+    def _connect(self):
+        """获取当前线程的数据库连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+    
+    def _initialize_schema(self):
+        """创建缓存表"""
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS keyword_cache (
+                keyword TEXT NOT NULL,
+                language_id TEXT NOT NULL,
+                location_id TEXT NOT NULL,
+                network TEXT NOT NULL,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (keyword, language_id, location_id, network)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_keyword_cache_accessed ON keyword_cache (accessed_at)")
+    
+    @staticmethod
+    def make_key(keyword, language_id, location_id, network=DEFAULT_NETWORK):
+        """
+        创建缓存键
+        
+        Args:
+            keyword: 关键词
+            language_id: 语言ID
+            location_id: 位置ID
+            network: 关键词规划网络名称
+        
+        Returns:
+            tuple: 缓存键
+        """
+        return (normalize_keyword(keyword), str(language_id), str(location_id), network)
+    
+    def get(self, keyword, language_id, location_id, network=DEFAULT_NETWORK):
+        """
+        查询缓存的关键词数据
+        
+        Args:
+            keyword: 关键词
+            language_id: 语言ID
+            location_id: 位置ID
+            network: 关键词规划网络名称
+        
+        Returns:
+            dict: 关键词数据，未命中或已过期时返回None
+        """
+        key = self.make_key(keyword, language_id, location_id, network)
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT data, created_at FROM keyword_cache "
+            "WHERE keyword = ? AND language_id = ? AND location_id = ? AND network = ?",
+            key
+        ).fetchone()
+        if row is None:
+            return None
+        
+        data, created_at = row
+        if now - created_at > self.ttl:
+            conn.execute(
+                "DELETE FROM keyword_cache "
+                "WHERE keyword = ? AND language_id = ? AND location_id = ? AND network = ?",
+                key
+            )
+            return None
+        
+        conn.execute(
+            "UPDATE keyword_cache SET accessed_at = ? "
+            "WHERE keyword = ? AND language_id = ? AND location_id = ? AND network = ?",
+            (now,) + key
+        )
+        return json.loads(data)
+    
+    def set(self, keyword, language_id, location_id, data, network=DEFAULT_NETWORK):
+        """
+        保存关键词数据
+        
+        Args:
+            keyword: 关键词
+            language_id: 语言ID
+            location_id: 位置ID
+            data: 关键词数据字典
+            network: 关键词规划网络名称
+        """
+        key = self.make_key(keyword, language_id, location_id, network)
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO keyword_cache "
+            "(keyword, language_id, location_id, network, data, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            key + (json.dumps(data, ensure_ascii=False), now, now)
+        )
+        
+        self._writes += 1
+        if self._writes % EVICTION_INTERVAL == 0:
+            self.evict()
+    
+    def evict(self):
+        """删除过期条目，并按最近访问时间淘汰超出容量上限的条目"""
+        conn = self._connect()
+        conn.execute("DELETE FROM keyword_cache WHERE created_at < ?", (time.time() - self.ttl,))
+        count = conn.execute("SELECT COUNT(*) FROM keyword_cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            logger.debug("结果缓存超出容量上限，淘汰 %s 个条目", overflow)
+            conn.execute(
+                "DELETE FROM keyword_cache WHERE rowid IN "
+                "(SELECT rowid FROM keyword_cache ORDER BY accessed_at LIMIT ?)",
+                (overflow,)
+            )
+    
+    def clear(self):
+        """清空缓存"""
+        self._connect().execute("DELETE FROM keyword_cache")
+    
+    def close(self):
+        """关闭当前线程的数据库连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
+    def get_many(self, keywords, language_id, location_id, network=DEFAULT_NETWORK):
+        """
+        批量查询缓存的关键词数据
+        
+        Args:
+            keywords: 关键词列表
+            language_id: 语言ID
+            location_id: 位置ID
+            network: 关键词规划网络名称
+        
+        Returns:
+            dict: 关键词 -> 关键词数据 (只包含命中的关键词)
+        """
+        hits = {}
+        for keyword in keywords:
+            keyword_data = self.get(keyword, language_id, location_id, network)
+            if keyword_data is not None:
+                hits[keyword] = keyword_data
+        return hits
+    
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM keyword_cache").fetchone()[0]
+
+def get_keyword_data_cached(client, customer_id, keyword, language_id="1000", location_id="2840", cache=None, refresh=False):
+    """
+    带持久化缓存的get_keyword_data
+    
+    Args:
+        client: GoogleAdsClient实例
+        customer_id: 客户ID
+        keyword: 要查询的关键词
+        language_id: 语言ID (默认为1000，英语)
+        location_id: 位置ID (默认为2840，美国)；逗号分隔的多个位置ID时并发查询所有位置
+        cache: ResultCache实例 (为None时直接调用get_keyword_data)
+        refresh: 为True时忽略已缓存的数据 (包括关键词提示缓存) 并重新查询
+    
+    Returns:
+        dict: 包含关键词数据的字典
+    """
+    # 查询API时才导入keyword_data (及google-ads库)，只读取缓存的调用方不需要承担导入开销
+    from .keyword_data import get_keyword_data, get_keyword_data_multi_location, parse_location_ids
+    
+    if cache is not None and not refresh:
+        keyword_data = cache.get(keyword, language_id, location_id)
+        if keyword_data is not None:
+            logger.info("从结果缓存获取关键词数据: %s", keyword)
+            return keyword_data
+    
+    location_ids = parse_location_ids(location_id)
+    if len(location_ids) > 1:
+        keyword_data = get_keyword_data_multi_location(
+            client, customer_id, keyword, location_ids,
+            language_id=language_id,
+            idea_cache=None if refresh else default_idea_cache
+        )
+    else:
+        keyword_data = get_keyword_data(
+            client, customer_id, keyword,
+            language_id=language_id,
+            location_id=location_id,
+            idea_cache=None if refresh else default_idea_cache
+        )
+    
+    # 只缓存有数据的结果，未找到数据的关键词下次仍会重新查询
+    if cache is not None and keyword_data:
+        cache.set(keyword, language_id, location_id, keyword_data)
+    return keyword_data
+
+def get_many_cached(fetch_many, keywords, language_id, location_id, cache=None, refresh=False):
+    """
+    带持久化缓存的批量查询
+    
+    先从缓存中读取命中的关键词，只把未命中的关键词交给fetch_many查询，
+    再把查询到的数据写回缓存。
+    
+    Args:
+        fetch_many: 批量查询函数，接收关键词列表，返回 关键词 -> 关键词数据 的字典
+        keywords: 关键词列表
+        language_id: 语言ID
+        location_id: 位置ID
+        cache: ResultCache实例 (为None时直接调用fetch_many)
+        refresh: 为True时忽略已缓存的数据并重新查询
+    
+    Returns:
+        dict: 关键词 -> 关键词数据字典
+    """
+    if cache is None:
+        return fetch_many(keywords)
+    
+    results = {} if refresh else cache.get_many(keywords, language_id, location_id)
+    misses = [keyword for keyword in keywords if keyword not in results]
+    if results:
+        logger.info("从结果缓存获取 %s 个关键词的数据", len(results))
+    
+    if misses:
+        fetched = fetch_many(misses)
+        for keyword, keyword_data in fetched.items():
+            if keyword_data:
+                cache.set(keyword, language_id, location_id, keyword_data)
+        results.update(fetched)
+    return results
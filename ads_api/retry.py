@@ -0,0 +1,423 @@
+"""
+请求重试模块
+根据Google Ads API的错误码进行带抖动的指数退避重试，并在配额耗尽时触发熔断
+"""
+
+import time
+import random
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 可以重试的gRPC状态码 (grpc.StatusCode的名称，grpc在分类错误时才导入)
+RETRYABLE_STATUS_CODES = {
+    'UNAVAILABLE',
+    'DEADLINE_EXCEEDED',
+    'RESOURCE_EXHAUSTED',
+    'ABORTED',
+    'INTERNAL',
+}
+
+# 可以重试的Google Ads错误码 (error_code字段名 -> 错误值名称)
+RETRYABLE_ERROR_CODES = {
+    'quota_error': {'RESOURCE_EXHAUSTED', 'RESOURCE_TEMPORARILY_EXHAUSTED'},
+    'internal_error': {'INTERNAL_ERROR', 'TRANSIENT_ERROR', 'DEADLINE_EXCEEDED'},
+    'database_error': {'CONCURRENT_MODIFICATION'},
+}
+
+class CircuitOpenError(Exception):
+    """不等待的熔断器 (fail_fast) 处于熔断状态时抛出，按配额耗尽错误分类"""
+    
+    def __init__(self, remaining):
+        """
+        Args:
+            remaining: 熔断剩余秒数
+        """
+        super().__init__(f"配额耗尽，熔断剩余 {remaining:.1f} 秒")
+        self.remaining = remaining
+
+class ErrorInfo:
+    """错误分类结果"""
+    
+    def __init__(self, retryable=False, quota_exhausted=False, retry_delay=None):
+        """
+        Args:
+            retryable: 是否可以重试
+            quota_exhausted: 是否为配额耗尽错误
+            retry_delay: API建议的重试等待秒数 (没有时为None)
+        """
+        self.retryable = retryable
+        self.quota_exhausted = quota_exhausted
+        self.retry_delay = retry_delay
+    
+    def __repr__(self):
+        return (f"ErrorInfo(retryable={self.retryable}, quota_exhausted={self.quota_exhausted}, "
+                f"retry_delay={self.retry_delay})")
+
+def classify_error(error):
+    """
+    根据异常中的错误码判断是否可以重试
+    
+    Args:
+        error: 调用API时抛出的异常
+    
+    Returns:
+        ErrorInfo: 错误分类结果
+    """
+    if isinstance(error, CircuitOpenError):
+        return ErrorInfo(retryable=True, quota_exhausted=True, retry_delay=error.remaining)
+    
+    import grpc
+    from google.ads.googleads.errors import GoogleAdsException
+    
+    if isinstance(error, GoogleAdsException):
+        info = ErrorInfo()
+        for ads_error in error.failure.errors:
+            field, value = error_code_of(ads_error)
+            if value in RETRYABLE_ERROR_CODES.get(field, ()):
+                info.retryable = True
+                if field == 'quota_error':
+                    info.quota_exhausted = True
+            delay = retry_delay_of(ads_error)
+            if delay is not None:
+                info.retry_delay = max(info.retry_delay or 0, delay)
+        # 没有可识别的错误码时，按gRPC状态码判断
+        if not info.retryable and error.error is not None and hasattr(error.error, 'code'):
+            info.retryable = getattr(error.error.code(), 'name', None) in RETRYABLE_STATUS_CODES
+            info.quota_exhausted = error.error.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+        return info
+    
+    # 生成的服务客户端把没有GoogleAdsFailure的gRPC错误包装为google.api_core异常 (如ServiceUnavailable)，
+    # 状态码保存在grpc_status_code中
+    code = getattr(error, 'grpc_status_code', None)
+    if code is None and isinstance(error, grpc.RpcError) and hasattr(error, 'code'):
+        code = error.code()
+    if code is not None:
+        return ErrorInfo(
+            retryable=getattr(code, 'name', None) in RETRYABLE_STATUS_CODES,
+            quota_exhausted=code == grpc.StatusCode.RESOURCE_EXHAUSTED
+        )
+    
+    return ErrorInfo()
+
+def error_code_of(ads_error):
+    """
+    获取GoogleAdsError中设置的错误码
+    
+    Args:
+        ads_error: GoogleAdsError (proto-plus或原生protobuf)
+    
+    Returns:
+        tuple: (error_code字段名, 错误值名称)，无法识别时为 (None, None)
+    """
+    error_code = ads_error.error_code
+    try:
+        if hasattr(error_code, 'WhichOneof'):
+            field = error_code.WhichOneof('error_code')
+            raw_value = getattr(error_code, field) if field else None
+            name = error_code.DESCRIPTOR.fields_by_name[field].enum_type.values_by_number[raw_value].name if field else None
+        else:
+            field = type(error_code).pb(error_code).WhichOneof('error_code')
+            name = getattr(error_code, field).name if field else None
+        return field, name
+    except Exception:
+        return None, None
+
+def retry_delay_of(ads_error):
+    """
+    获取API在quota_error_details中建议的重试等待时间
+    
+    Args:
+        ads_error: GoogleAdsError
+    
+    Returns:
+        float: 等待秒数，没有建议时返回None
+    """
+    try:
+        retry_delay = ads_error.details.quota_error_details.retry_delay
+    except AttributeError:
+        return None
+    if hasattr(retry_delay, 'total_seconds'):
+        # proto-plus把Duration转换为timedelta
+        seconds = retry_delay.total_seconds()
+    else:
+        seconds = retry_delay.seconds + retry_delay.nanos / 1e9
+    return seconds if seconds > 0 else None
+
+class RetryPolicy:
+    """
+    重试策略
+    
+    每次调用 (即每个关键词的每个请求) 最多尝试max_attempts次，
+    等待时间按指数增长并加入随机抖动；API给出重试等待时间时以其为下限，但不超过max_delay。
+    API要求等待的时间超过max_delay时 (如每日配额耗尽) 不再重试。
+    """
+    
+    def __init__(self, max_attempts=5, base_delay=1.0, max_delay=60.0, jitter=0.5):
+        """
+        初始化重试策略
+        
+        Args:
+            max_attempts: 最多尝试次数 (包括第一次)
+            base_delay: 第一次重试的基础等待秒数
+            max_delay: 单次等待的最大秒数
+            jitter: 抖动比例 (0-1)，实际等待时间在 [delay*(1-jitter), delay] 之间
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+    
+    def compute_delay(self, attempt, retry_delay=None):
+        """
+        计算第attempt次失败后的等待时间
+        
+        Args:
+            attempt: 已失败的次数 (从1开始)
+            retry_delay: API建议的等待秒数
+        
+        Returns:
+            float: 等待秒数
+        """
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        delay *= 1 - self.jitter * random.random()
+        if retry_delay is not None:
+            delay = min(self.max_delay, max(delay, retry_delay))
+        return delay
+    
+    def exceeds_max_delay(self, retry_delay):
+        """
+        API建议的等待时间是否超过单次等待上限 (此时本次运行不再重试)
+        
+        Args:
+            retry_delay: API建议的等待秒数 (可以为None)
+        
+        Returns:
+            bool: retry_delay大于max_delay时为True
+        """
+        return retry_delay is not None and retry_delay > self.max_delay
+
+class CircuitBreaker:
+    """
+    配额熔断器
+    
+    出现配额耗尽错误时熔断一段时间，所有共享该熔断器的工作线程在熔断期间暂停发送请求；
+    如果关联了令牌桶限速器，同时把速率减半，之后每次成功逐步恢复到原速率。
+    fail_fast为True时熔断期间不等待，直接抛出CircuitOpenError，由调用方换用其他账户。
+    """
+    
+    def __init__(self, cooldown=30.0, max_cooldown=600.0, limiter=None, min_rate_ratio=0.1, recovery=1.1, fail_fast=False):
+        """
+        初始化熔断器
+        
+        Args:
+            cooldown: 第一次熔断的时长 (秒)，连续熔断时加倍
+            max_cooldown: 熔断时长上限 (秒)，API建议的等待时间也不超过该值
+            limiter: 关联的TokenBucket (可选)
+            min_rate_ratio: 限速器速率下限 (相对原速率的比例)
+            recovery: 每次成功后速率的恢复倍数
+            fail_fast: 熔断期间是否直接抛出CircuitOpenError而不等待
+        """
+        self.cooldown = cooldown
+        self.fail_fast = fail_fast
+        self.max_cooldown = max_cooldown
+        self.min_rate_ratio = min_rate_ratio
+        self.recovery = recovery
+        self._open_until = 0.0
+        self._consecutive_trips = 0
+        self._lock = threading.Lock()
+        self.limiter = None
+        self._base_rate = None
+        if limiter is not None:
+            self.attach_limiter(limiter)
+    
+    def attach_limiter(self, limiter):
+        """
+        关联令牌桶限速器
+        
+        Args:
+            limiter: TokenBucket
+        """
+        with self._lock:
+            self.limiter = limiter
+            self._base_rate = limiter.rate
+    
+    def remaining(self):
+        """
+        熔断剩余时间
+        
+        Returns:
+            float: 剩余秒数，未熔断时为0
+        """
+        return max(0.0, self._open_until - time.monotonic())
+    
+    def wait(self):
+        """
+        熔断期间阻塞当前线程
+        
+        Raises:
+            CircuitOpenError: 如果熔断器为fail_fast且处于熔断状态
+        """
+        remaining = self.remaining()
+        if remaining > 0 and self.fail_fast:
+            raise CircuitOpenError(remaining)
+        while remaining > 0:
+            time.sleep(remaining)
+            remaining = self.remaining()
+    
+    async def wait_async(self):
+        """
+        熔断期间挂起当前协程
+        
+        Raises:
+            CircuitOpenError: 如果熔断器为fail_fast且处于熔断状态
+        """
+        import asyncio
+        
+        remaining = self.remaining()
+        if remaining > 0 and self.fail_fast:
+            raise CircuitOpenError(remaining)
+        while remaining > 0:
+            await asyncio.sleep(remaining)
+            remaining = self.remaining()
+    
+    def record_quota_error(self, retry_delay=None):
+        """
+        记录一次配额耗尽错误并熔断
+        
+        Args:
+            retry_delay: API建议的等待秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            # 熔断期间陆续返回的错误来自熔断前发出的请求，不再加倍熔断时长
+            if now >= self._open_until:
+                self._consecutive_trips += 1
+            duration = min(self.max_cooldown, self.cooldown * (2 ** (self._consecutive_trips - 1)))
+            if retry_delay is not None:
+                duration = min(self.max_cooldown, max(duration, retry_delay))
+            self._open_until = max(self._open_until, now + duration)
+            
+            if self.limiter is not None:
+                new_rate = max(self._base_rate * self.min_rate_ratio, self.limiter.rate / 2)
+                self.limiter.set_rate(new_rate)
+        
+        logger.warning(f"配额耗尽，暂停发送请求 {duration:.1f} 秒")
+    
+    def record_success(self):
+        """记录一次成功的请求，逐步恢复速率"""
+        if self._consecutive_trips == 0 and (self.limiter is None or self.limiter.rate >= self._base_rate):
+            return
+        with self._lock:
+            self._consecutive_trips = 0
+            if self.limiter is not None and self.limiter.rate < self._base_rate:
+                self.limiter.set_rate(min(self._base_rate, self.limiter.rate * self.recovery))
+
+def should_fail_over(error, breaker):
+    """
+    错误是否应交给调用方换用其他账户，而不是退回到部分数据 (如用美国数据替代全球数据)
+    
+    Args:
+        error: 调用API时抛出的异常
+        breaker: 发送请求的客户端的CircuitBreaker (可以为None)
+    
+    Returns:
+        bool: 熔断器为fail_fast (账户池中的账户) 且为配额耗尽错误时为True
+    """
+    return breaker is not None and breaker.fail_fast and classify_error(error).quota_exhausted
+
+# 默认的重试策略和熔断器 (进程内所有请求共享)
+default_retry_policy = RetryPolicy()
+default_circuit_breaker = CircuitBreaker()
+
+def call_with_retry(func, policy=None, breaker=None, description="API请求", limiter=None):
+    """
+    调用func，遇到可重试的错误时按策略重试
+    
+    Args:
+        func: 无参数的调用函数 (每次调用发送一个RPC)
+        policy: RetryPolicy (默认使用default_retry_policy)
+        breaker: CircuitBreaker (默认使用default_circuit_breaker)
+        description: 日志中使用的请求描述
+        limiter: TokenBucket (可选)，每次尝试前获取一个令牌，重试同样计入速率
+    
+    Returns:
+        func的返回值
+    
+    Raises:
+        最后一次调用的异常 (不可重试、重试次数用尽或API要求等待的时间超过policy.max_delay时)
+    """
+    policy = policy or default_retry_policy
+    breaker = breaker or default_circuit_breaker
+    attempt = 0
+    while True:
+        breaker.wait()
+        if limiter is not None:
+            limiter.acquire()
+        attempt += 1
+        try:
+            result = func()
+        except Exception as e:
+            info = classify_error(e)
+            if info.quota_exhausted:
+                breaker.record_quota_error(info.retry_delay)
+            if not info.retryable or attempt >= policy.max_attempts or policy.exceeds_max_delay(info.retry_delay):
+                raise
+            delay = policy.compute_delay(attempt, info.retry_delay)
+            logger.warning(f"{description}失败 (第{attempt}次): {e}，{delay:.1f}秒后重试")
+            time.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
+
+async def async_call_with_retry(func, policy=None, breaker=None, description="API请求", deadline=None):
+    """
+    call_with_retry的协程版本
+    
+    Args:
+        func: 无参数、返回awaitable的函数
+        policy: RetryPolicy (默认使用default_retry_policy)
+        breaker: CircuitBreaker (默认使用default_circuit_breaker)
+        description: 日志中使用的请求描述
+        deadline: 整个调用 (包括所有重试和等待) 的截止时间 (事件循环的loop.time())，为None时不限制
+    
+    Returns:
+        func返回的awaitable的结果
+    
+    Raises:
+        asyncio.TimeoutError: 如果熔断等待超过截止时间
+        最后一次调用的异常 (不可重试、重试次数用尽、API要求等待的时间超过policy.max_delay或重试等待会超过截止时间时)
+    """
+    # 协程版本只在事件循环中调用，此时asyncio已经导入；同步调用方不需要承担导入开销
+    import asyncio
+    
+    policy = policy or default_retry_policy
+    breaker = breaker or default_circuit_breaker
+    loop = asyncio.get_running_loop()
+    attempt = 0
+    while True:
+        if deadline is not None and breaker.remaining() > 0:
+            await asyncio.wait_for(breaker.wait_async(), max(0.0, deadline - loop.time()))
+        else:
+            await breaker.wait_async()
+        attempt += 1
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            info = classify_error(e)
+            if info.quota_exhausted:
+                breaker.record_quota_error(info.retry_delay)
+            if not info.retryable or attempt >= policy.max_attempts or policy.exceeds_max_delay(info.retry_delay):
+                raise
+            delay = policy.compute_delay(attempt, info.retry_delay)
+            if deadline is not None and loop.time() + delay >= deadline:
+                # 等待后已经超过截止时间，不再重试
+                raise
+            logger.warning(f"{description}失败 (第{attempt}次): {e}，{delay:.1f}秒后重试")
+            await asyncio.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
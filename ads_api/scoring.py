@@ -0,0 +1,221 @@
+"""
+关键词难度评分模块
+提供带版本的关键词难度 (KD) 评分模型，支持单个关键词评分和按数组批量评分
+
+批量评分在安装了numpy时使用向量化计算，否则逐个计算 (结果相同)。
+"""
+
+import logging
+from .records import MISSING
+
+logger = logging.getLogger(__name__)
+
+# 默认使用的评分模型版本
+DEFAULT_MODEL_VERSION = 'v1'
+
+def _load_numpy():
+    """导入numpy，未安装时返回None"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+class LinearScoringModel:
+    """
+    线性关键词难度评分模型
+    
+    KD = 竞争指数 * competition_weight + 搜索量因子 * volume_weight + CPC因子 * cpc_weight
+    其中 搜索量因子 = min(100, 搜索量 / volume_divisor)，CPC因子 = min(100, CPC * cpc_multiplier)。
+    没有竞争指数时KD为0，没有搜索量或CPC时对应的因子为0。
+    """
+    
+    def __init__(self, version, competition_weight, volume_weight, cpc_weight, volume_divisor=100, cpc_multiplier=20):
+        """
+        初始化评分模型
+        
+        Args:
+            version: 模型版本名称
+            competition_weight: 竞争指数的权重
+            volume_weight: 搜索量因子的权重
+            cpc_weight: CPC因子的权重
+            volume_divisor: 搜索量除以该值得到搜索量因子
+            cpc_multiplier: CPC乘以该值得到CPC因子
+        """
+        self.version = version
+        self.competition_weight = competition_weight
+        self.volume_weight = volume_weight
+        self.cpc_weight = cpc_weight
+        self.volume_divisor = volume_divisor
+        self.cpc_multiplier = cpc_multiplier
+    
+    def score(self, competition_index, search_volume, cpc):
+        """
+        计算单个关键词的难度
+        
+        Args:
+            competition_index: 竞争指数 (0-100)
+            search_volume: 搜索量
+            cpc: 每次点击成本 (美元)
+        
+        Returns:
+            float: 关键词难度 (0-100，保留一位小数)
+        """
+        if competition_index is None:
+            return 0
+        volume_factor = min(100, search_volume / self.volume_divisor) if search_volume else 0
+        cpc_factor = min(100, cpc * self.cpc_multiplier) if cpc else 0
+        kd = (competition_index * self.competition_weight
+              + volume_factor * self.volume_weight
+              + cpc_factor * self.cpc_weight)
+        return round(kd, 1)
+    
+    def score_arrays(self, np, competition_indexes, volumes, cpcs):
+        """
+        使用numpy批量计算关键词难度
+        
+        Args:
+            np: numpy模块
+            competition_indexes: 竞争指数数组 (缺失值为NaN)
+            volumes: 搜索量数组 (缺失值为NaN)
+            cpcs: CPC数组 (美元，缺失值为NaN)
+        
+        Returns:
+            numpy.ndarray: 关键词难度数组
+        """
+        volume_factor = np.minimum(100.0, np.nan_to_num(volumes, nan=0.0) / self.volume_divisor)
+        cpc_factor = np.minimum(100.0, np.nan_to_num(cpcs, nan=0.0) * self.cpc_multiplier)
+        kd = (competition_indexes * self.competition_weight
+              + volume_factor * self.volume_weight
+              + cpc_factor * self.cpc_weight)
+        kd = np.nan_to_num(kd, nan=0.0)
+        rounded = np.round(kd, 1)
+        # np.round先乘以10再取整，结果与内置round (按精确的十进制值舍入) 可能在两个一位小数的中点附近不同，
+        # 这些值改用round计算，保证与逐个评分的结果完全一致
+        for index in np.flatnonzero(np.abs(kd * 10 % 1 - 0.5) < 1e-6):
+            rounded[index] = round(float(kd[index]), 1)
+        return rounded
+    
+    def __repr__(self):
+        return (f"LinearScoringModel(version={self.version!r}, weights=({self.competition_weight}, "
+                f"{self.volume_weight}, {self.cpc_weight}))")
+
+# 版本 -> 评分模型
+SCORING_MODELS = {}
+
+def register_model(model):
+    """
+    注册评分模型 (同一版本的模型会被替换)
+    
+    Args:
+        model: 评分模型，需要有version属性和score、score_arrays方法
+    """
+    SCORING_MODELS[model.version] = model
+
+def get_model(version=None):
+    """
+    获取评分模型
+    
+    Args:
+        version: 模型版本 (默认为DEFAULT_MODEL_VERSION)
+    
+    Returns:
+        评分模型
+    
+    Raises:
+        ValueError: 如果模型版本不存在
+    """
+    version = version or DEFAULT_MODEL_VERSION
+    model = SCORING_MODELS.get(version)
+    if model is None:
+        raise ValueError(f"未知的评分模型版本: {version} (可用: {', '.join(sorted(SCORING_MODELS))})")
+    return model
+
+# v1: 竞争指数 * 0.7 + 搜索量因子 * 0.2 + CPC因子 * 0.1
+register_model(LinearScoringModel('v1', 0.7, 0.2, 0.1))
+
+def score_keyword(competition_index, search_volume, cpc, model=None):
+    """
+    计算单个关键词的难度
+    
+    Args:
+        competition_index: 竞争指数 (0-100)
+        search_volume: 搜索量
+        cpc: 每次点击成本 (美元)
+        model: 评分模型或模型版本 (默认为DEFAULT_MODEL_VERSION)
+    
+    Returns:
+        float: 关键词难度 (0-100)
+    """
+    if model is None or isinstance(model, str):
+        model = get_model(model)
+    return model.score(competition_index, search_volume, cpc)
+
+def score_columns(competition_indexes, volumes, cpcs, model=None):
+    """
+    批量计算关键词难度
+    
+    Args:
+        competition_indexes: 竞争指数序列 (缺失值为None) 或numpy数组 (缺失值为NaN)
+        volumes: 搜索量序列或numpy数组
+        cpcs: CPC序列或numpy数组 (美元)
+        model: 评分模型或模型版本 (默认为DEFAULT_MODEL_VERSION)
+    
+    Returns:
+        list: 关键词难度列表 (float)
+    """
+    if model is None or isinstance(model, str):
+        model = get_model(model)
+    np = _load_numpy()
+    if np is None:
+        return [model.score(competition_index, volume, cpc)
+                for competition_index, volume, cpc in zip(competition_indexes, volumes, cpcs)]
+    
+    def column(values):
+        if isinstance(values, np.ndarray):
+            return values.astype(np.float64, copy=False)
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    
+    return model.score_arrays(np, column(competition_indexes), column(volumes), column(cpcs)).tolist()
+
+def score_batch(batch, model=None):
+    """
+    计算KeywordBatch中所有关键词的难度，结果写入batch.kds
+    
+    安装了numpy时直接在批次的数组上计算 (不创建每个关键词的对象)。
+    
+    Args:
+        batch: KeywordBatch
+        model: 评分模型或模型版本 (默认为DEFAULT_MODEL_VERSION)
+    
+    Returns:
+        KeywordBatch: 传入的批次
+    """
+    if model is None or isinstance(model, str):
+        model = get_model(model)
+    if not len(batch):
+        return batch
+    np = _load_numpy()
+    if np is None:
+        for index in range(len(batch)):
+            record = batch.record(index)
+            kd = model.score(record.competition_index, record.volume, record.cpc)
+            batch.kds[index] = kd
+        return batch
+    
+    def column(values, dtype, scale=1):
+        data = np.frombuffer(values, dtype=dtype).astype(np.float64)
+        data[data == MISSING] = np.nan
+        return data / scale
+    
+    cpcs = column(batch.cpc_micros, np.int64, 1000000)
+    # CPC为0时与单个评分一致，视为不可用
+    cpcs[cpcs == 0] = np.nan
+    kds = model.score_arrays(
+        np,
+        column(batch.competition_indexes, np.int16),
+        column(batch.volumes, np.int64),
+        cpcs
+    )
+    np.frombuffer(batch.kds, dtype=np.float64)[:] = kds
+    return batch
@@ -0,0 +1,95 @@
+"""
+请求合并模块
+同一个键的并发调用合并为一次执行，所有调用方共享同一个结果 (single-flight)
+"""
+
+import threading
+
+class _Call:
+    """正在执行的一次调用"""
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    请求合并
+    
+    第一个调用某个键的线程执行函数，执行期间其他线程对同一个键的调用等待并共享其结果
+    (函数抛出异常时所有等待的调用方都抛出同一个异常)。执行完成后不保留结果，
+    之后对同一个键的调用会重新执行。
+    """
+    
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed_count = 0
+        self.shared_count = 0
+    
+    def do(self, key, func, *args, **kwargs):
+        """
+        执行函数，同一个键的并发调用只执行一次
+        
+        Args:
+            key: 合并调用的键 (可哈希)
+            func: 要执行的函数
+            *args, **kwargs: 传给函数的参数
+        
+        Returns:
+            函数的返回值 (并发的调用方得到同一个对象)
+        
+        Raises:
+            函数抛出的异常
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executed_count += 1
+            else:
+                self.shared_count += 1
+        
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+    
+    def in_flight(self):
+        """
+        正在执行的调用数量
+        
+        Returns:
+            int: 调用数量
+        """
+        with self._lock:
+            return len(self._calls)
+    
+    def stats(self):
+        """
+        获取统计信息
+        
+        Returns:
+            dict: executed (实际执行的次数)、shared (共享结果的调用次数)、in_flight (正在执行的调用数量)
+        """
+        with self._lock:
+            return {
+                'executed': self.executed_count,
+                'shared': self.shared_count,
+                'in_flight': len(self._calls),
+            }
@@ -0,0 +1,438 @@
+"""
+结果输出模块
+提供带缓冲的CSV、JSON Lines和Parquet结果写入器
+"""
+
+import os
+import csv
+import json
+import logging
+from abc import ABC, abstractmethod
+
+logger = logging.getLogger(__name__)
+
+# 默认每缓冲多少行写入一次文件
+DEFAULT_FLUSH_ROWS = 1000
+# Parquet每个行组的默认行数 (每次flush写入一个行组)
+DEFAULT_PARQUET_FLUSH_ROWS = 50000
+
+# fsync策略
+FSYNC_NEVER = 'never'    # 只写入操作系统缓冲区
+FSYNC_CLOSE = 'close'    # 关闭文件时fsync一次
+FSYNC_FLUSH = 'flush'    # 每次flush后都fsync
+FSYNC_POLICIES = (FSYNC_NEVER, FSYNC_CLOSE, FSYNC_FLUSH)
+
+# 关键词类型映射
+TYPE_NAMES = {'I': '信息型', 'C': '商业型', 'T': '交易型'}
+
+# 竞争度映射
+COMPETITION_NAMES = {
+    'UNSPECIFIED': '未指定',
+    'UNKNOWN': '未知',
+    'LOW': '低',
+    'MEDIUM': '中',
+    'HIGH': '高'
+}
+
+def result_record(keyword_data, location_ids=None):
+    """
+    把关键词数据转换为机器可读格式的记录 (缺失的值为None)
+    
+    Args:
+        keyword_data: 关键词数据字典
+        location_ids: 需要单独输出搜索量的位置ID列表
+    
+    Returns:
+        dict: 字段名 -> 值
+    """
+    record = {
+        'keyword': keyword_data.get('keyword'),
+        'volume_us': keyword_data.get('volume_us'),
+        'volume_global': keyword_data.get('volume_global'),
+        'kd': keyword_data.get('kd'),
+        'cpc': keyword_data.get('cpc'),
+        'type': keyword_data.get('type'),
+        'competition': keyword_data.get('competition'),
+        'competition_index': keyword_data.get('competition_index'),
+    }
+    volumes = keyword_data.get('volumes') or {}
+    for location_id in location_ids or []:
+        record[f'volume_{location_id}'] = volumes.get(location_id)
+    return record
+
+class ResultWriter(ABC):
+    """
+    结果写入器基类
+    
+    在整个任务期间保持输出文件打开，写入的行先放入缓冲区，
+    每flush_rows行批量写入一次文件。写入器不是线程安全的，应只在一个线程中使用。
+    
+    每次缓冲区写入文件后调用on_flush(tags)，tags为这些行写入时传入的标记，
+    调用方可以据此在数据真正写入文件后再记录检查点。
+    """
+    
+    # 文件扩展名
+    extension = ''
+    # 是否支持追加到已有文件
+    supports_append = True
+    
+    def __init__(self, path, location_ids=None, flush_rows=DEFAULT_FLUSH_ROWS, fsync=FSYNC_CLOSE, append=False):
+        """
+        初始化结果写入器
+        
+        Args:
+            path: 输出文件路径
+            location_ids: 需要单独输出搜索量的位置ID列表 (多地区查询)
+            flush_rows: 每缓冲多少行写入一次文件
+            fsync: fsync策略 (never / close / flush)
+            append: 是否追加到已有文件 (不重复写入表头)
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"无效的fsync策略: {fsync}")
+        if append and not self.supports_append:
+            raise ValueError(f"{self.extension}格式不支持追加写入")
+        self.path = path
+        self.location_ids = location_ids
+        self.flush_rows = max(1, flush_rows)
+        self.fsync = fsync
+        self.append = append
+        self.on_flush = None
+        self.rows_written = 0
+        self._rows = []
+        self._tags = []
+        self._file = None
+    
+    @abstractmethod
+    def open(self):
+        """打开输出文件 (新文件时写入表头)"""
+    
+    @abstractmethod
+    def _write_rows(self, keyword_data_list):
+        """把缓冲的行写入文件"""
+    
+    def write(self, keyword_data, tag=None):
+        """
+        写入一行关键词数据 (缓冲区满时自动flush)
+        
+        Args:
+            keyword_data: 关键词数据字典
+            tag: 行标记，flush后传给on_flush
+        """
+        if self._file is None:
+            self.open()
+        self._rows.append(keyword_data)
+        if tag is not None:
+            self._tags.append(tag)
+        if len(self._rows) >= self.flush_rows:
+            self.flush()
+    
+    def flush(self):
+        """把缓冲区写入文件"""
+        if self._rows:
+            self._write_rows(self._rows)
+            self.rows_written += len(self._rows)
+            self._rows = []
+        if self._file is not None:
+            self._file.flush()
+            if self.fsync == FSYNC_FLUSH:
+                os.fsync(self._file.fileno())
+        if self._tags:
+            tags, self._tags = self._tags, []
+            if self.on_flush is not None:
+                self.on_flush(tags)
+    
+    def close(self):
+        """写入剩余的缓冲数据并关闭文件"""
+        if self._file is None:
+            return
+        self.flush()
+        self._finish()
+        if self.fsync != FSYNC_NEVER:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+    
+    def _finish(self):
+        """关闭文件前写入文件尾部 (默认没有)"""
+    
+    def _is_empty(self):
+        """输出文件是否不存在或为空"""
+        return not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+    
+    def __enter__(self):
+        self.open()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class CsvResultWriter(ResultWriter):
+    """CSV结果写入器 (中文表头，值转换为可读文本)"""
+    
+    extension = 'csv'
+    
+    def open(self):
+        write_header = not self.append or self._is_empty()
+        self._file = open(self.path, 'a' if self.append else 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        if write_header:
+            self._writer.writerow(self.header())
+    
+    def header(self):
+        """
+        获取CSV表头 (多地区查询时每个位置追加一列搜索量)
+        
+        Returns:
+            list: 表头列表
+        """
+        return [
+            '关键词',
+            '搜索量(美国)',
+            '搜索量(全球)',
+            '关键词难度(KD)',
+            'CPC($)',
+            '关键词类型',
+            '竞争度',
+            '竞争指数'
+        ] + [f'搜索量({location_id})' for location_id in self.location_ids or []]
+    
+    def format_row(self, keyword_data):
+        """
+        把关键词数据转换为CSV行
+        
+        Args:
+            keyword_data: 关键词数据字典
+        
+        Returns:
+            list: CSV行
+        """
+        cpc = keyword_data.get('cpc')
+        volumes = keyword_data.get('volumes') or {}
+        return [
+            keyword_data.get('keyword', 'N/A'),
+            keyword_data.get('volume_us', 'N/A'),
+            keyword_data.get('volume_global', 'N/A'),
+            keyword_data.get('kd', 'N/A'),
+            # CPC数据不可用时为None
+            f"{cpc:.2f}" if cpc is not None else 'N/A',
+            TYPE_NAMES.get(keyword_data.get('type', 'I'), '未知'),
+            COMPETITION_NAMES.get(keyword_data.get('competition', 'UNKNOWN'), '未知'),
+            keyword_data.get('competition_index', 'N/A')
+        ] + [
+            volumes.get(location_id, 'N/A')
+            for location_id in self.location_ids or []
+        ]
+    
+    def _write_rows(self, keyword_data_list):
+        self._writer.writerows(self.format_row(keyword_data) for keyword_data in keyword_data_list)
+
+class JsonLinesResultWriter(ResultWriter):
+    """JSON Lines结果写入器 (每行一个JSON对象，保留原始值)"""
+    
+    extension = 'jsonl'
+    
+    def open(self):
+        self._file = open(self.path, 'a' if self.append else 'w', encoding='utf-8')
+    
+    def _write_rows(self, keyword_data_list):
+        self._file.write("".join(
+            json.dumps(result_record(keyword_data, self.location_ids), ensure_ascii=False) + "\n"
+            for keyword_data in keyword_data_list
+        ))
+
+class ParquetResultWriter(ResultWriter):
+    """
+    Parquet结果写入器 (需要安装pyarrow)
+    
+    每次flush写入一个行组；Parquet文件在关闭时才写入元数据，因此不支持追加，
+    进程被终止时文件不可读。
+    """
+    
+    extension = 'parquet'
+    supports_append = False
+    
+    def __init__(self, path, location_ids=None, flush_rows=DEFAULT_PARQUET_FLUSH_ROWS, fsync=FSYNC_CLOSE, append=False):
+        super().__init__(path, location_ids, flush_rows, fsync, append)
+    
+    def open(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet输出需要安装pyarrow: pip install pyarrow")
+        self._pa = pa
+        fields = [
+            pa.field('keyword', pa.string()),
+            pa.field('volume_us', pa.int64()),
+            pa.field('volume_global', pa.int64()),
+            pa.field('kd', pa.float64()),
+            pa.field('cpc', pa.float64()),
+            pa.field('type', pa.string()),
+            pa.field('competition', pa.string()),
+            pa.field('competition_index', pa.int64()),
+        ] + [pa.field(f'volume_{location_id}', pa.int64()) for location_id in self.location_ids or []]
+        self._schema = pa.schema(fields)
+        self._file = open(self.path, 'wb')
+        self._writer = pq.ParquetWriter(self._file, self._schema)
+    
+    def _write_rows(self, keyword_data_list):
+        records = [result_record(keyword_data, self.location_ids) for keyword_data in keyword_data_list]
+        self._writer.write_table(self._pa.Table.from_pylist(records, schema=self._schema))
+    
+    def _finish(self):
+        # ParquetWriter关闭时写入文件尾部的元数据 (传入的文件对象不会被关闭)
+        self._writer.close()
+
+# 输出格式 -> 写入器类
+WRITERS = {
+    'csv': CsvResultWriter,
+    'jsonl': JsonLinesResultWriter,
+    'parquet': ParquetResultWriter,
+}
+
+def create_writer(output_format, path, **kwargs):
+    """
+    根据输出格式创建结果写入器
+    
+    Args:
+        output_format: 输出格式 (csv / jsonl / parquet)
+        path: 输出文件路径
+        **kwargs: 传给写入器的其他参数
+    
+    Returns:
+        ResultWriter: 结果写入器
+    
+    Raises:
+        ValueError: 如果输出格式无效
+    """
+    writer_class = WRITERS.get(output_format)
+    if writer_class is None:
+        raise ValueError(f"无效的输出格式: {output_format}")
+    return writer_class(path, **kwargs)
+
+class RowWriter(ResultWriter):
+    """
+    行写入器基类 (报表查询结果)
+    
+    与结果写入器相同的缓冲、flush和fsync行为，每行是与columns对应的值序列
+    (如GoogleAdsClient.execute_query_stream投影后的元组)。
+    """
+    
+    def __init__(self, path, columns, flush_rows=DEFAULT_FLUSH_ROWS, fsync=FSYNC_CLOSE, append=False):
+        """
+        初始化行写入器
+        
+        Args:
+            path: 输出文件路径
+            columns: 列名列表
+            flush_rows: 每缓冲多少行写入一次文件
+            fsync: fsync策略 (never / close / flush)
+            append: 是否追加到已有文件 (不重复写入表头)
+        """
+        super().__init__(path, flush_rows=flush_rows, fsync=fsync, append=append)
+        self.columns = list(columns)
+
+class CsvRowWriter(RowWriter):
+    """CSV行写入器 (表头为列名，列表值以JSON格式写入)"""
+    
+    extension = 'csv'
+    
+    def open(self):
+        write_header = not self.append or self._is_empty()
+        self._file = open(self.path, 'a' if self.append else 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        if write_header:
+            self._writer.writerow(self.columns)
+    
+    def _write_rows(self, rows):
+        self._writer.writerows(
+            [json.dumps(value, ensure_ascii=False) if isinstance(value, list) else value for value in row]
+            for row in rows
+        )
+
+class JsonLinesRowWriter(RowWriter):
+    """JSON Lines行写入器 (每行一个以列名为键的JSON对象)"""
+    
+    extension = 'jsonl'
+    
+    def open(self):
+        self._file = open(self.path, 'a' if self.append else 'w', encoding='utf-8')
+    
+    def _write_rows(self, rows):
+        self._file.write("".join(
+            json.dumps(dict(zip(self.columns, row)), ensure_ascii=False, default=str) + "\n"
+            for row in rows
+        ))
+
+class ParquetRowWriter(RowWriter):
+    """
+    Parquet行写入器 (需要安装pyarrow)
+    
+    列类型根据第一次flush的数据推断，之后的行组使用相同的类型。
+    """
+    
+    extension = 'parquet'
+    supports_append = False
+    
+    def __init__(self, path, columns, flush_rows=DEFAULT_PARQUET_FLUSH_ROWS, fsync=FSYNC_CLOSE, append=False):
+        super().__init__(path, columns, flush_rows, fsync, append)
+    
+    def open(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet输出需要安装pyarrow: pip install pyarrow")
+        self._pa = pa
+        self._pq = pq
+        self._writer = None
+        self._file = open(self.path, 'wb')
+    
+    def _write_rows(self, rows):
+        columns = list(zip(*rows))
+        if self._writer is None:
+            table = self._pa.table({name: list(values) for name, values in zip(self.columns, columns)})
+            self._schema = table.schema
+            self._writer = self._pq.ParquetWriter(self._file, self._schema)
+        else:
+            table = self._pa.Table.from_arrays(
+                [self._pa.array(values, type=field.type) for values, field in zip(columns, self._schema)],
+                schema=self._schema
+            )
+        self._writer.write_table(table)
+    
+    def _finish(self):
+        # 没有任何行时写入只有列名的空文件 (列类型为字符串)
+        if self._writer is None:
+            self._schema = self._pa.schema([(name, self._pa.string()) for name in self.columns])
+            self._writer = self._pq.ParquetWriter(self._file, self._schema)
+        self._writer.close()
+
+# 输出格式 -> 行写入器类
+ROW_WRITERS = {
+    'csv': CsvRowWriter,
+    'jsonl': JsonLinesRowWriter,
+    'parquet': ParquetRowWriter,
+}
+
+def create_row_writer(output_format, path, columns, **kwargs):
+    """
+    根据输出格式创建行写入器
+    
+    Args:
+        output_format: 输出格式 (csv / jsonl / parquet)
+        path: 输出文件路径
+        columns: 列名列表
+        **kwargs: 传给写入器的其他参数
+    
+    Returns:
+        RowWriter: 行写入器
+    
+    Raises:
+        ValueError: 如果输出格式无效
+    """
+    writer_class = ROW_WRITERS.get(output_format)
+    if writer_class is None:
+        raise ValueError(f"无效的输出格式: {output_format}")
+    return writer_class(path, columns, **kwargs)
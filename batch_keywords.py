@@ -1,16 +1,26 @@
 #!/usr/bin/env python
 """
 Google Ads 关键词分析工具 - 批量处理版本
-从文件中读取关键词列表，批量获取数据并输出到CSV文件
+从文件中读取关键词列表，批量获取数据并输出到CSV、JSON Lines或Parquet文件
 """
 
 import sys
 import os
-import csv
-import time
 import argparse
 import logging
-from ads_api import GoogleAdsClient, get_keyword_data
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from ads_api import GoogleAdsClient
+from ads_api.rate_limit import TokenBucket, parse_rate
+from ads_api.retry import default_retry_policy, default_circuit_breaker
+from ads_api.idea_cache import default_idea_cache, DEFAULT_IDEA_MAX_AGE
+from ads_api.result_cache import ResultCache, get_many_cached, DEFAULT_CACHE_TTL, DEFAULT_CACHE_PATH, DEFAULT_CACHE_MAX_ENTRIES
+from ads_api.checkpoint import CheckpointJournal, STATUS_DONE, STATUS_NO_DATA, STATUS_FAILED
+from ads_api.writers import WRITERS, FSYNC_POLICIES, FSYNC_CLOSE, create_writer
+from ads_api.ingest import STDIN_NAME, iter_keywords, iter_chunks
+from ads_api.dedup import KeywordDeduplicator
+from ads_api.log_utils import configure_logging
+from ads_api.account_pool import AccountPool, STRATEGIES, STRATEGY_LEAST_LOADED
 import config
 
 # 配置日志
@@ -23,82 +33,319 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 默认每个API请求之间的延迟秒数 (所有工作线程共享，即默认每秒最多1个请求)
+DEFAULT_DELAY = 1.0
+
 def setup_argparse():
     """设置命令行参数解析"""
     parser = argparse.ArgumentParser(description='Google Ads 关键词分析工具 - 批量处理版本')
-    parser.add_argument('input_file', help='包含关键词列表的输入文件 (每行一个关键词)')
-    parser.add_argument('-o', '--output', help='输出CSV文件路径 (默认: keywords_results.csv)')
+    parser.add_argument('input_file', help='包含关键词列表的输入文件 (每行一个关键词，支持.gz压缩文件，- 表示标准输入)')
+    parser.add_argument('-o', '--output', help='输出文件路径 (默认: keywords_results.<格式扩展名>)')
+    parser.add_argument('-f', '--format', choices=sorted(WRITERS), default='csv', help='输出格式 (默认: csv，parquet需要安装pyarrow)')
+    parser.add_argument('--flush-rows', type=int, help='每缓冲多少行写入一次输出文件 (默认: csv/jsonl 1000，parquet 50000)')
+    parser.add_argument('--fsync', choices=FSYNC_POLICIES, default=FSYNC_CLOSE,
+                        help='输出文件的fsync策略: never 不调用, close 关闭时调用, flush 每次写入后调用 (默认: close)')
     parser.add_argument('-l', '--language', default='1000', help='语言ID (默认: 1000 - 英语)')
-    parser.add_argument('-c', '--country', default='2840', help='国家ID (默认: 2840 - 美国)')
-    parser.add_argument('-d', '--delay', type=float, default=1.0, help='每个请求之间的延迟秒数 (默认: 1.0)')
+    parser.add_argument('-c', '--country', default='2840', help='国家ID，多个国家用逗号分隔，如 2840,2826,2276 (默认: 2840 - 美国)')
+    parser.add_argument('-d', '--delay', type=float, default=DEFAULT_DELAY,
+                        help=f'每个API请求之间的延迟秒数，所有工作线程共享 (默认: {DEFAULT_DELAY}，0表示不限速，指定--rate时忽略)')
+    parser.add_argument('-r', '--rate', help='所有工作线程共享的请求速率上限，如 5/s 或 300/m')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='并发查询的工作线程数 (默认: 1)')
+    parser.add_argument('--unordered', action='store_true', help='按完成顺序而不是输入顺序写入结果')
+    parser.add_argument('--no-dedup', action='store_true', help='不合并规范化后相同的关键词 (每一行都单独查询)')
+    parser.add_argument('--max-pending', type=int, help='同时在内存中的查询任务数上限，写入跟不上时暂停读取输入 (默认: 工作线程数的4倍)')
+    parser.add_argument('--max-retries', type=int, default=4, help='每个请求遇到配额或临时错误时的最大重试次数 (默认: 4)')
+    parser.add_argument('-b', '--batch-size', type=int, default=1,
+                        help='每个请求打包的种子关键词数量 (默认: 1, 最大: 20)')
+    parser.add_argument('-m', '--exact-metrics', action='store_true',
+                        help='使用历史指标接口批量获取精确匹配的关键词指标 (不生成关键词提示)')
     parser.add_argument('-v', '--verbose', action='store_true', help='显示详细日志')
+    parser.add_argument('--log-json', action='store_true', help='以JSON格式输出日志 (每行一条)')
+    parser.add_argument('--debug-sample', type=float, default=1.0,
+                        help='调试日志的采样率 (0-1)，如 0.01 只记录1%%的调试日志 (默认: 1，全部记录)')
+    parser.add_argument('--no-cache', action='store_true', help='不使用本地结果缓存')
+    parser.add_argument('--refresh', action='store_true', help='忽略已缓存的结果，重新查询并更新缓存')
+    parser.add_argument('--cache-ttl', type=float, help='结果缓存有效期秒数 (默认: config.CACHE_TIMEOUT)')
+    parser.add_argument('--cache-path', help='结果缓存文件路径 (默认: config.CACHE_PATH)')
+    parser.add_argument('--resume', action='store_true',
+                        help='根据检查点日志 (<输出文件>.journal) 跳过已完成的关键词，并追加写入已有的输出文件')
+    parser.add_argument('--checkpoint-fsync', action='store_true', help='每条检查点记录写入后调用fsync (更安全但更慢)')
+    parser.add_argument('--accounts', choices=['config', 'accessible'],
+                        help='使用多个账户分担请求: config 使用config.GOOGLE_ADS_ACCOUNTS, accessible 使用当前凭据可访问的所有客户账户')
+    parser.add_argument('--account-strategy', choices=STRATEGIES, default=STRATEGY_LEAST_LOADED,
+                        help='多账户的分配策略: least_loaded 最少负载, weighted_round_robin 加权轮询 (默认: least_loaded)')
     return parser
 
-def read_keywords(file_path):
-    """从文件中读取关键词列表"""
-    keywords = []
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                keyword = line.strip()
-                if keyword and not keyword.startswith('#'):
-                    keywords.append(keyword)
-        return keywords
-    except Exception as e:
-        logger.error(f"读取关键词文件时出错: {e}")
-        return []
-
-def write_csv_header(file_path):
-    """写入CSV文件头"""
+def setup_result_cache(args):
+    """根据命令行参数创建结果缓存，禁用或创建失败时返回None"""
+    if args.no_cache:
+        return None
     try:
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                '关键词',
-                '搜索量(美国)',
-                '搜索量(全球)',
-                '关键词难度(KD)',
-                'CPC($)',
-                '关键词类型',
-                '竞争度',
-                '竞争指数'
-            ])
-        return True
+        return ResultCache(
+            path=args.cache_path or getattr(config, 'CACHE_PATH', DEFAULT_CACHE_PATH),
+            ttl=args.cache_ttl if args.cache_ttl is not None else getattr(config, 'CACHE_TIMEOUT', DEFAULT_CACHE_TTL),
+            max_entries=getattr(config, 'CACHE_MAX_ENTRIES', DEFAULT_CACHE_MAX_ENTRIES)
+        )
     except Exception as e:
-        logger.error(f"创建CSV文件时出错: {e}")
-        return False
+        logger.warning(f"无法打开结果缓存，将直接查询API: {e}")
+        return None
 
-def append_to_csv(file_path, keyword_data):
-    """将关键词数据追加到CSV文件"""
-    try:
-        # 关键词类型映射
-        type_map = {'I': '信息型', 'C': '商业型', 'T': '交易型'}
+def build_lookup(ads_client, customer_id, args, cache=None, pool=None):
+    """
+    根据处理模式创建查询函数
+    
+    Args:
+        pool: AccountPool (指定时请求分配到池中的账户，忽略ads_client和customer_id)
+    
+    Returns:
+        tuple: (每个任务包含的关键词数量, 查询函数)
+               查询函数接收关键词列表，返回 关键词 -> 关键词数据 的字典
+    """
+    # 查询模块依赖google-ads库，只在真正查询时导入 (-h等不需要承担导入开销)
+    from ads_api.keyword_data import (
+        MAX_SEED_KEYWORDS, get_keyword_data, get_keyword_data_multi_location, get_keywords_data_batch, parse_location_ids
+    )
+    from ads_api.keyword_metrics import MAX_HISTORICAL_METRICS_KEYWORDS, get_keywords_metrics
+    
+    idea_cache = None if args.refresh else default_idea_cache
+    
+    def call(func, *call_args, **call_kwargs):
+        # 以 func(client, customer_id, ...) 的形式调用，使用账户池时由池选择账户
+        if pool is not None:
+            return pool.call(func, *call_args, **call_kwargs)
+        return func(ads_client, customer_id, *call_args, **call_kwargs)
+    
+    # 精确指标模式：所有关键词通过历史指标接口批量查询
+    if args.exact_metrics:
+        chunk_size = MAX_HISTORICAL_METRICS_KEYWORDS
+        
+        def fetch(keywords):
+            return call(
+                get_keywords_metrics,
+                keywords,
+                language_id=args.language,
+                location_id=args.country
+            )
+    # 批量模式：多个种子关键词打包到同一个请求中
+    elif args.batch_size > 1:
+        chunk_size = min(args.batch_size, MAX_SEED_KEYWORDS)
         
-        # 竞争度映射
-        competition_map = {
-            'UNSPECIFIED': '未指定',
-            'UNKNOWN': '未知',
-            'LOW': '低',
-            'MEDIUM': '中',
-            'HIGH': '高'
-        }
+        def fetch(keywords):
+            return call(
+                get_keywords_data_batch,
+                keywords,
+                language_id=args.language,
+                location_id=args.country,
+                batch_size=chunk_size,
+                idea_cache=idea_cache
+            )
+    # 多地区模式：每个关键词的所有地理位置请求并发发送
+    elif len(parse_location_ids(args.country)) > 1:
+        chunk_size = 1
+        location_ids = parse_location_ids(args.country)
         
-        with open(file_path, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                keyword_data.get('keyword', 'N/A'),
-                keyword_data.get('volume_us', 'N/A'),
-                keyword_data.get('volume_global', 'N/A'),
-                keyword_data.get('kd', 'N/A'),
-                f"{keyword_data.get('cpc', 0):.2f}",
-                f"{type_map.get(keyword_data.get('type', 'I'), '未知')}",
-                f"{competition_map.get(keyword_data.get('competition', 'UNKNOWN'), '未知')}",
-                keyword_data.get('competition_index', 'N/A')
-            ])
-        return True
+        def fetch(keywords):
+            return {
+                keyword: call(
+                    get_keyword_data_multi_location,
+                    keyword,
+                    location_ids,
+                    language_id=args.language,
+                    idea_cache=idea_cache
+                )
+                for keyword in keywords
+            }
+    # 逐个处理关键词，每个关键词单独发送请求
+    else:
+        chunk_size = 1
+        
+        def fetch(keywords):
+            return {
+                keyword: call(
+                    get_keyword_data,
+                    keyword,
+                    language_id=args.language,
+                    location_id=args.country,
+                    idea_cache=idea_cache
+                )
+                for keyword in keywords
+            }
+    
+    def lookup(keywords):
+        # 限速器由客户端在每个RPC发送前获取令牌，缓存命中不受限速影响
+        return get_many_cached(
+            fetch, keywords, args.language, args.country,
+            cache=cache, refresh=args.refresh
+        )
+    
+    return chunk_size, lookup
+
+def setup_account_pool(ads_client, args, limiter=None):
+    """
+    根据--accounts创建账户池，未指定时返回None
+    
+    Args:
+        limiter: 所有账户共享的TokenBucket (可选)
+    
+    Raises:
+        ValueError: 如果config.py中没有配置GOOGLE_ADS_ACCOUNTS
+    """
+    if not args.accounts:
+        return None
+    if args.accounts == 'accessible':
+        pool = AccountPool.from_accessible_customers(ads_client, config.GOOGLE_ADS, limiter=limiter, strategy=args.account_strategy)
+    else:
+        accounts = getattr(config, 'GOOGLE_ADS_ACCOUNTS', None)
+        if not accounts:
+            raise ValueError("config.py中没有配置GOOGLE_ADS_ACCOUNTS")
+        pool = AccountPool.from_config(config.GOOGLE_ADS, accounts, limiter=limiter, strategy=args.account_strategy)
+    logger.info(f"使用 {len(pool.members)} 个账户分担请求 (分配策略: {args.account_strategy})")
+    return pool
+
+def build_limiter(args):
+    """
+    根据--rate或--delay创建共享的令牌桶限速器，--delay 0 (且没有指定--rate) 时不限速，返回None
+    
+    每次API请求 (包括重试，分页读取计为一次) 获取一个令牌：单个关键词发送特定国家和全球两个请求，
+    批量模式和精确指标模式每批发送两个请求，多地区模式每个关键词发送地区数+1个请求。
+    """
+    if args.rate:
+        rate = parse_rate(args.rate)
+    elif args.delay and args.delay > 0:
+        rate = 1.0 / args.delay
+    else:
+        logger.warning("没有限制API请求速率，可能很快耗尽配额")
+        return None
+    logger.info(f"请求速率限制: 每秒 {rate:.2f} 个请求")
+    limiter = TokenBucket(rate)
+    # 配额耗尽时熔断器会降低共享限速器的速率
+    default_circuit_breaker.attach_limiter(limiter)
+    return limiter
+
+def run_chunk(lookup, chunk, args):
+    """执行一个查询任务，返回 (关键词列表, 查询结果)，出错时查询结果为None"""
+    try:
+        return chunk, lookup(chunk)
     except Exception as e:
-        logger.error(f"写入CSV文件时出错: {e}")
-        return False
+        if len(chunk) == 1:
+            logger.error(f"处理关键词时出错: {chunk[0]} - {e}")
+        else:
+            logger.error(f"处理关键词批次时出错: {chunk[0]} ... {chunk[-1]} - {e}")
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return chunk, None
+
+def write_chunk_results(writer, chunk, results, journal=None):
+    """
+    把一个任务的查询结果交给结果写入器，返回写入的关键词数量
+    
+    指定journal时，未找到数据和处理失败的关键词立即记录检查点；
+    写入成功的关键词在写入器把缓冲区写入文件后才记录 (见setup_writer)，
+    进程被终止时缓冲区中的关键词在恢复任务时会重新查询。
+    """
+    success_count = 0
+    if results is None:
+        if journal is not None:
+            journal.record_many(chunk, STATUS_FAILED)
+        return success_count
+    
+    no_data = []
+    for keyword in chunk:
+        keyword_data = results.get(keyword)
+        if keyword_data:
+            writer.write(keyword_data, tag=keyword)
+            success_count += 1
+            logger.info(f"成功获取关键词数据: {keyword}")
+        else:
+            no_data.append(keyword)
+            logger.warning(f"未找到关键词数据: {keyword}")
+    if journal is not None and no_data:
+        journal.record_many(no_data, STATUS_NO_DATA)
+    return success_count
+
+def setup_writer(args, output_file, append=False, journal=None):
+    """
+    根据命令行参数创建结果写入器
+    
+    指定journal时，写入器每次把缓冲区写入文件后，再把这些关键词记录为已完成。
+    """
+    options = {'location_ids': get_extra_location_ids(args), 'fsync': args.fsync, 'append': append}
+    if args.flush_rows:
+        options['flush_rows'] = args.flush_rows
+    writer = create_writer(args.format, output_file, **options)
+    if journal is not None:
+        writer.on_flush = lambda keywords: journal.record_many(keywords, STATUS_DONE)
+    return writer
+
+def get_extra_location_ids(args):
+    """多地区查询时返回需要单独输出搜索量的位置ID列表，否则返回None"""
+    from ads_api.keyword_data import parse_location_ids
+    
+    location_ids = parse_location_ids(args.country)
+    return location_ids if len(location_ids) > 1 else None
+
+def process_keywords(chunks, lookup, writer, args, journal=None):
+    """
+    执行所有查询任务并写入结果
+    
+    chunks是惰性生成的关键词列表序列，只在有空闲位置时才读取下一个任务，
+    同时在内存中的任务 (正在查询和等待写入的) 不超过--max-pending个，
+    因此无论输入多大内存占用都保持不变。
+    
+    多个工作线程并发查询时，默认仍按输入顺序写入结果；
+    指定--unordered时按完成顺序写入。结果只在主线程中写入。
+    
+    Returns:
+        tuple: (处理的关键词数量, 成功写入的关键词数量)
+    """
+    success_count = 0
+    done_count = 0
+    
+    if args.workers <= 1:
+        for chunk in chunks:
+            done_count += len(chunk)
+            logger.info(f"处理关键词 [{done_count}]: {chunk[0]}")
+            success_count += write_chunk_results(writer, *run_chunk(lookup, chunk, args), journal)
+        return done_count, success_count
+    
+    max_pending = max(args.workers, args.max_pending or args.workers * 4)
+    chunks = enumerate(chunks)
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        running = {}
+        # 按输入顺序写入时，先完成的任务暂存到pending中
+        pending = {}
+        next_index = 0
+        exhausted = False
+        while True:
+            # 填满任务窗口；窗口已满时不再读取输入 (背压)
+            while not exhausted and len(running) + len(pending) < max_pending:
+                item = next(chunks, None)
+                if item is None:
+                    exhausted = True
+                    break
+                index, chunk = item
+                running[executor.submit(run_chunk, lookup, chunk, args)] = index
+            if not running:
+                break
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                chunk, results = future.result()
+                done_count += len(chunk)
+                logger.info(f"处理关键词 [{done_count}]")
+                
+                if args.unordered:
+                    success_count += write_chunk_results(writer, chunk, results, journal)
+                else:
+                    pending[index] = (chunk, results)
+            
+            while next_index in pending:
+                success_count += write_chunk_results(writer, *pending.pop(next_index), journal)
+                next_index += 1
+    
+    return done_count, success_count
 
 def main():
     """主函数"""
@@ -111,73 +358,93 @@ def main():
     else:
         logging.getLogger().setLevel(logging.INFO)
     
+    # JSON格式日志或调试日志采样
+    if args.log_json or args.debug_sample < 1.0:
+        configure_logging(logging.getLogger().level, json_format=args.log_json, debug_sample_rate=args.debug_sample)
+    
     # 检查输入文件
-    if not os.path.exists(args.input_file):
+    if args.input_file != STDIN_NAME and not os.path.exists(args.input_file):
         logger.error(f"输入文件不存在: {args.input_file}")
         return 1
     
     # 设置输出文件
-    output_file = args.output or 'keywords_results.csv'
+    output_file = args.output or f"keywords_results.{WRITERS[args.format].extension}"
     
-    # 读取关键词列表
-    keywords = read_keywords(args.input_file)
-    if not keywords:
-        logger.error("没有找到有效的关键词")
+    if args.resume and not WRITERS[args.format].supports_append:
+        logger.error(f"{args.format}格式不支持追加写入，不能与 --resume 同时使用")
         return 1
     
-    logger.info(f"读取了 {len(keywords)} 个关键词")
+    # 多地区查询只支持逐个处理模式
+    if get_extra_location_ids(args) and (args.exact_metrics or args.batch_size > 1):
+        logger.error("多个国家ID只支持逐个查询模式，不能与 -b 或 -m 同时使用")
+        return 1
+    
+    # 按行惰性读取关键词，不把整个文件读入内存
+    keywords = iter_keywords(args.input_file)
+    try:
+        first_keyword = next(keywords, None)
+    except Exception as e:
+        logger.error(f"读取关键词文件时出错: {e}")
+        return 1
+    if first_keyword is None:
+        logger.error("没有找到有效的关键词")
+        return 1
+    keywords = chain([first_keyword], keywords)
     
     # 初始化Google Ads客户端
     try:
-        ads_client = GoogleAdsClient(config.GOOGLE_ADS)
+        # 限速器由客户端在每个RPC发送前获取令牌
+        limiter = build_limiter(args)
+        ads_client = GoogleAdsClient(config.GOOGLE_ADS, limiter=limiter)
         customer_id = config.GOOGLE_ADS.get('login_customer_id', '')
         
         if not customer_id:
             logger.error("未配置客户ID (login_customer_id)")
             return 1
         
-        # 创建CSV文件并写入表头
-        if not write_csv_header(output_file):
-            return 1
+        # 打开本地结果缓存；进程内关键词提示缓存的有效期与其相同
+        cache = setup_result_cache(args)
+        default_idea_cache.set_max_age(
+            args.cache_ttl if args.cache_ttl is not None else getattr(config, 'CACHE_TIMEOUT', DEFAULT_IDEA_MAX_AGE)
+        )
         
-        # 处理每个关键词
-        success_count = 0
-        for i, keyword in enumerate(keywords):
-            logger.info(f"处理关键词 [{i+1}/{len(keywords)}]: {keyword}")
-            
-            try:
-                # 获取关键词数据
-                keyword_data = get_keyword_data(
-                    ads_client, 
-                    customer_id, 
-                    keyword,
-                    language_id=args.language,
-                    location_id=args.country
-                )
-                
-                if keyword_data:
-                    # 将数据写入CSV
-                    if append_to_csv(output_file, keyword_data):
-                        success_count += 1
-                        logger.info(f"成功获取关键词数据: {keyword}")
-                    else:
-                        logger.warning(f"写入CSV失败: {keyword}")
-                else:
-                    logger.warning(f"未找到关键词数据: {keyword}")
-                
-                # 添加延迟，避免请求过快
-                if i < len(keywords) - 1 and args.delay > 0:
-                    time.sleep(args.delay)
-                    
-            except Exception as e:
-                logger.error(f"处理关键词时出错: {keyword} - {e}")
-                if args.verbose:
-                    import traceback
-                    traceback.print_exc()
+        # 打开检查点日志；恢复任务时跳过已完成的关键词并追加写入输出文件
+        journal = CheckpointJournal(CheckpointJournal.path_for(output_file), fsync=args.checkpoint_fsync)
+        resume = args.resume and os.path.exists(output_file)
+        if args.resume and not resume:
+            logger.warning(f"输出文件不存在，从头开始处理: {output_file}")
         
-        logger.info(f"批量处理完成。成功: {success_count}/{len(keywords)}")
-        logger.info(f"结果已保存到: {output_file}")
+        if resume:
+            journal.open(resume=True)
+            logger.info("恢复任务: 跳过检查点日志中已完成的关键词")
+            keywords = (keyword for keyword in keywords if not journal.is_finished(keyword))
+        else:
+            journal.open(resume=False)
+        
+        # 处理所有关键词
+        default_retry_policy.max_attempts = max(1, args.max_retries + 1)
+        pool = setup_account_pool(ads_client, args, limiter)
+        chunk_size, lookup = build_lookup(ads_client, customer_id, args, cache, pool)
+        # 大小写、全角/半角、空白或标点不同的重复关键词只查询一次
+        deduplicator = None
+        if not args.no_dedup:
+            deduplicator = KeywordDeduplicator(lookup)
+            lookup = deduplicator.lookup
+        # 先关闭写入器，最后一批结果写入文件后再关闭检查点日志
+        with journal, setup_writer(args, output_file, append=resume, journal=journal) as writer:
+            done_count, success_count = process_keywords(iter_chunks(keywords, chunk_size), lookup, writer, args, journal)
         
+        logger.info(f"批量处理完成。成功: {success_count}/{done_count}")
+        if deduplicator is not None and deduplicator.duplicate_count:
+            logger.info(f"合并了 {deduplicator.duplicate_count} 个重复关键词 (实际查询的关键词: {deduplicator.fetched_count})")
+        failed_count = journal.summary().get(STATUS_FAILED, 0)
+        if failed_count:
+            logger.info(f"{failed_count} 个关键词处理失败，可以使用 --resume 重新处理")
+        if pool is not None:
+            for member in pool.stats():
+                logger.info(f"账户 {member['name']}: {member['requests']} 个请求, {member['errors']} 个错误")
+        logger.info(f"结果已保存到: {output_file}")
+    
     except Exception as e:
         logger.error(f"初始化Google Ads客户端时出错: {e}")
         if args.verbose:
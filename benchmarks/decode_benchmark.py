@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""
+关键词提示响应解析性能测试
+比较proto-plus包装层逐个读取字段与原生protobuf解析 (use_proto_plus=False) 的耗时，
+并通过两种模式的GoogleAdsClient构建请求、发送到本地模拟服务器 (benchmarks/fake_ads_server.py)，
+测量完整的get_keyword_data调用并检查两种模式的结果相同
+
+用法:
+    python benchmarks/decode_benchmark.py --ideas 700 --repeat 20
+"""
+
+import os
+import sys
+import time
+import argparse
+import importlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ads_api.client import API_VERSION, GoogleAdsClient
+from ads_api.idea_cache import IdeaCache
+from ads_api.keyword_data import process_response, build_keyword_ideas_request, get_keyword_data
+from ads_api.keyword_metrics import get_keywords_metrics
+from benchmarks.fake_ads_server import FakeKeywordPlanIdeaService, create_server
+
+# 模拟服务器不校验客户ID
+CUSTOMER_ID = '1234567890'
+
+def build_results(count):
+    """
+    构建模拟的关键词提示结果
+    
+    Returns:
+        tuple: (proto-plus结果列表, 原生protobuf结果列表)
+    """
+    module = importlib.import_module(f"google.ads.googleads.{API_VERSION}.services.types.keyword_plan_idea_service")
+    result_class = module.GenerateKeywordIdeaResult
+    raw_class = result_class.pb()
+    
+    proto_plus_results = []
+    raw_results = []
+    for index in range(count):
+        result = result_class()
+        result.text = f"seo tools {index}"
+        metrics = result.keyword_idea_metrics
+        metrics.avg_monthly_searches = 1000 + index
+        metrics.competition = 2 + index % 3
+        metrics.competition_index = index % 100
+        metrics.average_cpc_micros = 1230000 + index
+        proto_plus_results.append(result)
+        # 与use_proto_plus=False时客户端返回的消息相同
+        raw_results.append(raw_class.FromString(result_class.serialize(result)))
+    return proto_plus_results, raw_results
+
+def decode_proto_plus_attributes(results, target_keyword):
+    """原来的解析方式：通过proto-plus包装层逐个读取每个关键词提示的字段"""
+    keyword_data = {}
+    for result in results:
+        text = result.text
+        cpc_micros = result.keyword_idea_metrics.average_cpc_micros
+        data = {
+            'keyword': text,
+            'volume': result.keyword_idea_metrics.avg_monthly_searches,
+            'competition': result.keyword_idea_metrics.competition.name,
+            'competition_index': result.keyword_idea_metrics.competition_index,
+            'cpc': cpc_micros / 1000000 if cpc_micros else None,
+        }
+        if not keyword_data and text.lower() == target_keyword.lower():
+            keyword_data = data
+    return keyword_data
+
+def measure(func, repeat):
+    """运行repeat次，返回最短耗时 (秒)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def build_client(endpoint, use_proto_plus):
+    """创建连接模拟服务器的GoogleAdsClient"""
+    return GoogleAdsClient({
+        'developer_token': 'fake-developer-token',
+        'client_id': 'fake-client-id',
+        'client_secret': 'fake-client-secret',
+        'refresh_token': 'fake-refresh-token',
+        'login_customer_id': CUSTOMER_ID,
+        'use_proto_plus': use_proto_plus,
+        'endpoint': endpoint,
+        'insecure': True,
+    })
+
+def build_request(client, keyword):
+    """构建一个指定地理位置的关键词提示请求 (与get_keyword_data发送的请求相同)"""
+    request = build_keyword_ideas_request(client, CUSTOMER_ID, "1000", "2840")
+    request.keyword_seed.keywords.append(keyword)
+    return request
+
+def check_modes(clients, target):
+    """
+    检查两种模式发送的请求和得到的结果相同
+    
+    Raises:
+        AssertionError: 如果结果不同
+    """
+    results = {}
+    for use_proto_plus, client in clients.items():
+        keyword_data = get_keyword_data(client, CUSTOMER_ID, target, idea_cache=None)
+        metrics_data = get_keywords_metrics(client, CUSTOMER_ID, [target])
+        assert keyword_data, f"use_proto_plus={use_proto_plus} 没有得到关键词数据"
+        results[use_proto_plus] = (keyword_data, metrics_data)
+    assert results[True] == results[False], f"两种模式的结果不同: {results}"
+
+def main():
+    parser = argparse.ArgumentParser(description='关键词提示响应解析性能测试')
+    parser.add_argument('--ideas', type=int, default=700, help='每个响应中的关键词提示数量 (默认: 700)')
+    parser.add_argument('--repeat', type=int, default=20, help='重复次数，取最短耗时 (默认: 20)')
+    args = parser.parse_args()
+    
+    proto_plus_results, raw_results = build_results(args.ideas)
+    target = f"seo tools {args.ideas - 1}"
+    
+    cases = [
+        ("proto-plus字段读取 (原方式)", lambda: decode_proto_plus_attributes(proto_plus_results, target)),
+        ("process_response (use_proto_plus=True)", lambda: process_response(proto_plus_results, target, IdeaCache(), "1000", "2840")),
+        ("process_response (use_proto_plus=False)", lambda: process_response(raw_results, target, IdeaCache(), "1000", "2840")),
+    ]
+    
+    print(f"每个响应 {args.ideas} 个关键词提示，重复 {args.repeat} 次取最短耗时")
+    for name, func in cases:
+        elapsed = measure(func, args.repeat)
+        print(f"{name:<45} {elapsed * 1000:8.2f} ms/响应  {elapsed / args.ideas * 1e6:7.2f} us/关键词提示")
+    
+    # 通过客户端构建请求并发送到模拟服务器
+    server, port = create_server(FakeKeywordPlanIdeaService(ideas=args.ideas), 0)
+    try:
+        clients = {use_proto_plus: build_client(f"localhost:{port}", use_proto_plus) for use_proto_plus in (True, False)}
+        check_modes(clients, target)
+        for use_proto_plus, client in clients.items():
+            elapsed = measure(lambda: build_request(client, target), args.repeat)
+            print(f"{f'构建请求 (use_proto_plus={use_proto_plus})':<45} {elapsed * 1e6:8.2f} us/请求")
+        for use_proto_plus, client in clients.items():
+            elapsed = measure(lambda: get_keyword_data(client, CUSTOMER_ID, target, idea_cache=None), args.repeat)
+            print(f"{f'get_keyword_data (use_proto_plus={use_proto_plus})':<45} {elapsed * 1000:8.2f} ms/关键词 (2个请求)")
+    finally:
+        server.stop(0)
+
+if __name__ == "__main__":
+    main()
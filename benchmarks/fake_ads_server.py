@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+"""
+本地模拟的KeywordPlanIdeaService gRPC服务器
+实现GenerateKeywordIdeas和GenerateKeywordHistoricalMetrics，可以配置响应大小、延迟分布、
+错误注入和配额耗尽，不需要Google凭据也不消耗API配额
+
+用法:
+    python benchmarks/fake_ads_server.py --port 50051 --ideas 700 --latency lognormal:80,0.5 --error-rate 0.01 --quota-qps 50
+
+客户端在GOOGLE_ADS配置中设置 'endpoint': 'localhost:50051' 和 'insecure': True
+(其他凭据字段可以是任意值)
+"""
+
+import os
+import sys
+import math
+import time
+import zlib
+import random
+import argparse
+import importlib
+import threading
+from concurrent import futures
+
+import grpc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ads_api.client import API_VERSION
+from ads_api.rate_limit import TokenBucket
+
+# 服务全名
+SERVICE_NAME = f"google.ads.googleads.{API_VERSION}.services.KeywordPlanIdeaService"
+# 每个响应默认包含的关键词提示数量 (真实API通常返回几百到上千个)
+DEFAULT_IDEAS = 700
+# 没有指定地理位置 (全球) 时搜索量放大的倍数
+GLOBAL_VOLUME_FACTOR = 3
+
+class LatencyModel:
+    """
+    服务器端延迟分布
+    
+    const:毫秒                固定延迟
+    uniform:最小毫秒,最大毫秒   均匀分布
+    lognormal:中位数毫秒,sigma 对数正态分布 (长尾，接近真实API)
+    """
+    
+    def __init__(self, spec="const:0"):
+        """
+        Args:
+            spec: 延迟分布描述 (见类说明)
+        
+        Raises:
+            ValueError: 如果描述无效
+        """
+        kind, _, params = spec.partition(':')
+        try:
+            values = [float(value) for value in params.split(',')] if params else []
+        except ValueError:
+            raise ValueError(f"无效的延迟分布: {spec}")
+        if kind == 'const' and len(values) == 1:
+            self._sample = lambda: values[0]
+        elif kind == 'uniform' and len(values) == 2:
+            self._sample = lambda: random.uniform(values[0], values[1])
+        elif kind == 'lognormal' and len(values) == 2 and values[0] > 0:
+            mu = math.log(values[0])
+            self._sample = lambda: random.lognormvariate(mu, values[1])
+        else:
+            raise ValueError(f"无效的延迟分布: {spec}")
+        self.spec = spec
+    
+    def sample(self):
+        """返回一次请求的延迟 (秒)"""
+        return max(0.0, self._sample()) / 1000
+
+def load_message_classes():
+    """
+    加载请求和响应的原生protobuf类
+    
+    Returns:
+        dict: 类型名称 -> protobuf类
+    """
+    module = importlib.import_module(f"google.ads.googleads.{API_VERSION}.services.types.keyword_plan_idea_service")
+    names = [
+        'GenerateKeywordIdeasRequest', 'GenerateKeywordIdeaResponse',
+        'GenerateKeywordHistoricalMetricsRequest', 'GenerateKeywordHistoricalMetricsResponse',
+    ]
+    return {name: getattr(module, name).pb() for name in names}
+
+def fill_metrics(metrics, text, global_scope):
+    """
+    按关键词文本生成确定的指标 (相同的关键词每次得到相同的数据)
+    
+    Args:
+        metrics: KeywordPlanHistoricalMetrics (原生protobuf)
+        text: 关键词文本
+        global_scope: 是否为全球数据 (没有指定地理位置)
+    """
+    seed = zlib.crc32(text.encode('utf-8'))
+    volume = 10 * (1 + seed % 50000)
+    metrics.avg_monthly_searches = volume * GLOBAL_VOLUME_FACTOR if global_scope else volume
+    # KeywordPlanCompetitionLevel: LOW=2, MEDIUM=3, HIGH=4
+    metrics.competition = 2 + (seed >> 8) % 3
+    metrics.competition_index = (seed >> 12) % 101
+    metrics.average_cpc_micros = 10000 * (1 + (seed >> 4) % 2000)
+    metrics.low_top_of_page_bid_micros = metrics.average_cpc_micros // 2
+    metrics.high_top_of_page_bid_micros = metrics.average_cpc_micros * 2
+
+class FakeKeywordPlanIdeaService:
+    """
+    模拟的KeywordPlanIdeaService
+    
+    每个请求先按延迟分布等待，再依次检查配额和注入的错误:
+    超过quota_qps时返回RESOURCE_EXHAUSTED，按error_rate的概率返回UNAVAILABLE。
+    关键词提示包含每个种子关键词本身和ideas个预先构建的其他关键词。
+    """
+    
+    def __init__(self, ideas=DEFAULT_IDEAS, latency=None, error_rate=0.0, quota_qps=None, page_size=None):
+        """
+        初始化模拟服务
+        
+        Args:
+            ideas: 每个GenerateKeywordIdeas响应包含的关键词提示数量
+            latency: LatencyModel (为None时没有延迟)
+            error_rate: 返回UNAVAILABLE的概率 (0-1)
+            quota_qps: 每秒允许的请求数，超过时返回RESOURCE_EXHAUSTED (为None时不限制)
+            page_size: 每页的关键词提示数量 (为None时一页返回全部)
+        """
+        self.classes = load_message_classes()
+        self.ideas = ideas
+        self.latency = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.quota = TokenBucket(quota_qps) if quota_qps else None
+        self.page_size = page_size
+        self.request_count = 0
+        self.error_count = 0
+        self.quota_error_count = 0
+        self._lock = threading.Lock()
+        # 预先构建的其他关键词提示 (是否全球 -> 响应)，每个请求只需要添加种子关键词
+        self._fillers = {global_scope: self._build_fillers(global_scope) for global_scope in (False, True)}
+    
+    def _admit(self, context):
+        """模拟延迟、配额和错误，请求被拒绝时中止RPC"""
+        with self._lock:
+            self.request_count += 1
+        delay = self.latency.sample()
+        if delay:
+            time.sleep(delay)
+        if self.quota is not None and not self.quota.acquire(timeout=0):
+            with self._lock:
+                self.quota_error_count += 1
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Resource has been exhausted (fake server quota)")
+        if self.error_rate and random.random() < self.error_rate:
+            with self._lock:
+                self.error_count += 1
+            context.abort(grpc.StatusCode.UNAVAILABLE, "Service unavailable (fake server error injection)")
+    
+    def _build_fillers(self, global_scope):
+        """构建ideas个其他关键词提示"""
+        response = self.classes['GenerateKeywordIdeaResponse']()
+        for index in range(self.ideas):
+            result = response.results.add()
+            result.text = f"keyword idea {index}"
+            fill_metrics(result.keyword_idea_metrics, result.text, global_scope)
+        return response
+    
+    def generate_keyword_ideas(self, request, context):
+        """GenerateKeywordIdeas"""
+        self._admit(context)
+        seeds = tuple(request.keyword_seed.keywords) or tuple(request.keyword_and_url_seed.keywords) or ('keyword',)
+        global_scope = not request.geo_target_constants
+        
+        full_response = self.classes['GenerateKeywordIdeaResponse']()
+        for seed in dict.fromkeys(seeds):
+            result = full_response.results.add()
+            result.text = seed
+            fill_metrics(result.keyword_idea_metrics, seed, global_scope)
+        # 重复字段的合并在protobuf的C实现中完成
+        full_response.MergeFrom(self._fillers[global_scope])
+        full_response.total_size = len(full_response.results)
+        if not self.page_size:
+            return full_response
+        
+        results = full_response.results
+        response = self.classes['GenerateKeywordIdeaResponse']()
+        start = int(request.page_token or 0)
+        end = min(len(results), start + self.page_size)
+        response.results.extend(results[start:end])
+        response.total_size = len(results)
+        if end < len(results):
+            response.next_page_token = str(end)
+        return response
+    
+    def generate_keyword_historical_metrics(self, request, context):
+        """GenerateKeywordHistoricalMetrics"""
+        self._admit(context)
+        response = self.classes['GenerateKeywordHistoricalMetricsResponse']()
+        global_scope = not request.geo_target_constants
+        for keyword in request.keywords:
+            result = response.results.add()
+            result.text = keyword
+            fill_metrics(result.keyword_metrics, keyword, global_scope)
+        return response
+    
+    def stats(self):
+        """
+        获取统计信息
+        
+        Returns:
+            dict: requests、errors (注入的UNAVAILABLE)、quota_errors
+        """
+        with self._lock:
+            return {
+                'requests': self.request_count,
+                'errors': self.error_count,
+                'quota_errors': self.quota_error_count,
+            }
+
+def create_server(service, port=0, host='localhost', max_workers=64):
+    """
+    创建并启动gRPC服务器
+    
+    Args:
+        service: FakeKeywordPlanIdeaService
+        port: 监听端口 (为0时自动选择空闲端口)
+        host: 监听地址
+        max_workers: 服务器线程数 (同时处理的请求数)
+    
+    Returns:
+        tuple: (grpc.Server, 实际监听的端口)
+    """
+    classes = service.classes
+    handlers = {
+        'GenerateKeywordIdeas': grpc.unary_unary_rpc_method_handler(
+            service.generate_keyword_ideas,
+            request_deserializer=classes['GenerateKeywordIdeasRequest'].FromString,
+            response_serializer=classes['GenerateKeywordIdeaResponse'].SerializeToString,
+        ),
+        'GenerateKeywordHistoricalMetrics': grpc.unary_unary_rpc_method_handler(
+            service.generate_keyword_historical_metrics,
+            request_deserializer=classes['GenerateKeywordHistoricalMetricsRequest'].FromString,
+            response_serializer=classes['GenerateKeywordHistoricalMetricsResponse'].SerializeToString,
+        ),
+    }
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(SERVICE_NAME, handlers),))
+    port = server.add_insecure_port(f"{host}:{port}")
+    server.start()
+    return server, port
+
+def add_server_arguments(parser):
+    """添加模拟服务器的命令行参数 (基准测试工具共用)"""
+    parser.add_argument('--ideas', type=int, default=DEFAULT_IDEAS, help=f'每个响应的关键词提示数量 (默认: {DEFAULT_IDEAS})')
+    parser.add_argument('--latency', default='const:0',
+                        help='服务器延迟分布: const:毫秒、uniform:最小,最大 或 lognormal:中位数,sigma (默认: const:0)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='返回UNAVAILABLE的概率 (默认: 0)')
+    parser.add_argument('--quota-qps', type=float, help='每秒允许的请求数，超过时返回RESOURCE_EXHAUSTED (默认: 不限制)')
+    parser.add_argument('--page-size', type=int, help='每页的关键词提示数量 (默认: 一页返回全部)')
+
+def service_from_args(args):
+    """根据命令行参数创建模拟服务"""
+    return FakeKeywordPlanIdeaService(
+        ideas=args.ideas,
+        latency=LatencyModel(args.latency),
+        error_rate=args.error_rate,
+        quota_qps=args.quota_qps,
+        page_size=args.page_size
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description='本地模拟的KeywordPlanIdeaService gRPC服务器')
+    parser.add_argument('--host', default='localhost', help='监听地址 (默认: localhost)')
+    parser.add_argument('--port', type=int, default=50051, help='监听端口 (默认: 50051)')
+    parser.add_argument('--workers', type=int, default=64, help='服务器线程数 (默认: 64)')
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    
+    try:
+        service = service_from_args(args)
+    except ValueError as e:
+        print(e)
+        return 1
+    server, port = create_server(service, args.port, args.host, args.workers)
+    print(f"模拟服务器已启动: {args.host}:{port} (API {API_VERSION}, 每个响应 {args.ideas} 个关键词提示, 延迟 {args.latency})")
+    try:
+        server.wait_for_termination()
+    except KeyboardInterrupt:
+        server.stop(grace=1)
+    print(f"统计: {service.stats()}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+启动耗时性能测试
+在新的解释器进程中导入ads_api或运行命令行工具的 -h，测量启动耗时，
+并检查不需要访问API的入口没有加载google-ads库、gRPC和protobuf模块
+
+用法:
+    python benchmarks/import_benchmark.py --repeat 10
+    python benchmarks/import_benchmark.py --max-ms 300    # 超过300毫秒或加载了重量级模块时返回1
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 启动时不应加载的重量级模块 (模块名前缀)
+HEAVY_MODULES = ('google.ads', 'google.protobuf', 'grpc', 'proto')
+
+# (名称, 解释器参数, 是否应保持轻量)
+CASES = [
+    ("import ads_api", ['-c', 'import ads_api'], True),
+    ("import ads_api.daemon", ['-c', 'import ads_api.daemon'], True),
+    ("import ads_api.scoring, intent, writers", ['-c', 'import ads_api.scoring, ads_api.intent, ads_api.writers'], True),
+    ("keyword_cli.py -h", [os.path.join(ROOT, 'keyword_cli.py'), '-h'], True),
+    ("batch_keywords.py -h", [os.path.join(ROOT, 'batch_keywords.py'), '-h'], True),
+    ("rescore.py -h", [os.path.join(ROOT, 'rescore.py'), '-h'], True),
+    ("report.py -h", [os.path.join(ROOT, 'report.py'), '-h'], True),
+    # 对照: 查询模块本身需要google-ads库
+    ("import ads_api.keyword_data", ['-c', 'import ads_api.keyword_data'], False),
+]
+
+def run_case(arguments, env):
+    """
+    在新的解释器进程中运行一次 (-X importtime)，记录导入的模块
+    
+    Returns:
+        tuple: (是否成功, 加载的模块名集合)
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + arguments, cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    modules = set()
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if line.startswith('import time:') and '|' in line:
+            modules.add(line.rsplit('|', 1)[1].strip())
+    return result.returncode == 0, modules
+
+def measure(arguments, env, repeat):
+    """
+    运行repeat次，返回最短的耗时 (不带-X importtime) 和加载的模块
+    
+    Returns:
+        tuple: (最短耗时秒数, 是否成功, 加载的模块名集合)
+    """
+    ok, modules = run_case(arguments, env)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + arguments, cwd=ROOT, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, ok, modules
+
+def heavy_modules_of(modules):
+    """返回加载的重量级模块的顶层名称"""
+    return sorted({
+        name.split('.')[0] if not name.startswith('google.') else '.'.join(name.split('.')[:2])
+        for name in modules
+        if any(name == prefix or name.startswith(prefix + '.') for prefix in HEAVY_MODULES)
+    })
+
+def build_env(config_dir):
+    """
+    构建子进程的环境变量
+    
+    没有config.py时使用config.example.py，命令行工具的 -h 才能运行
+    """
+    env = dict(os.environ)
+    paths = [ROOT]
+    if config_dir is not None:
+        paths.insert(0, config_dir)
+    if env.get('PYTHONPATH'):
+        paths.append(env['PYTHONPATH'])
+    env['PYTHONPATH'] = os.pathsep.join(paths)
+    return env
+
+def main():
+    parser = argparse.ArgumentParser(description='ads_api包和命令行工具的启动耗时测试')
+    parser.add_argument('--repeat', type=int, default=5, help='重复次数，取最短耗时 (默认: 5)')
+    parser.add_argument('--max-ms', type=float, help='轻量入口允许的最长启动耗时 (毫秒)，超过时返回1')
+    args = parser.parse_args()
+    
+    config_dir = None
+    if not os.path.exists(os.path.join(ROOT, 'config.py')):
+        config_dir = tempfile.mkdtemp(prefix='ads_api_bench_')
+        shutil.copy(os.path.join(ROOT, 'config.example.py'), os.path.join(config_dir, 'config.py'))
+    env = build_env(config_dir)
+    
+    # 空解释器的启动耗时作为基准
+    baseline, _, _ = measure(['-c', 'pass'], env, args.repeat)
+    print(f"重复 {args.repeat} 次取最短耗时，空解释器启动 {baseline * 1000:.1f} ms")
+    
+    failed = False
+    try:
+        for name, arguments, light in CASES:
+            elapsed, ok, modules = measure(arguments, env, args.repeat)
+            heavy = heavy_modules_of(modules)
+            status = "" if ok else "  (运行失败)"
+            if light and not ok:
+                # 轻量路径运行失败时没有加载到重型模块，不能当作通过
+                failed = True
+            if light and heavy:
+                status += f"  回归: 加载了 {', '.join(heavy)}"
+                failed = True
+            if light and args.max_ms is not None and elapsed * 1000 > args.max_ms:
+                status += f"  回归: 超过 {args.max_ms:.0f} ms"
+                failed = True
+            print(f"{name:<42} {elapsed * 1000:8.1f} ms  (+{(elapsed - baseline) * 1000:7.1f} ms){status}")
+    finally:
+        if config_dir is not None:
+            shutil.rmtree(config_dir, ignore_errors=True)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+#!/usr/bin/env python
+"""
+关键词查询端到端性能测试
+启动本地模拟的KeywordPlanIdeaService (benchmarks/fake_ads_server.py)，通过真实的gRPC调用
+测量库API和batch_keywords.py的吞吐量 (关键词/秒)、单次调用延迟 (p50/p99) 和内存占用，
+不需要Google凭据也不消耗API配额
+
+用法:
+    python benchmarks/keyword_benchmark.py --keywords 2000 --workers 16
+    python benchmarks/keyword_benchmark.py --scenario async --latency lognormal:80,0.5 --quota-qps 100
+    python benchmarks/keyword_benchmark.py --scenario cli --keywords 500 --cli-args "-w 8 -b 20"
+    python benchmarks/keyword_benchmark.py --endpoint localhost:50051    # 使用已经启动的模拟服务器
+"""
+
+import os
+import sys
+import time
+import shlex
+import socket
+import asyncio
+import argparse
+import resource
+import tempfile
+import threading
+import tracemalloc
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import grpc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ads_api.client import GoogleAdsClient
+from ads_api.retry import RetryPolicy, CircuitBreaker
+from ads_api.keyword_data import get_keyword_data, get_keywords_data_batch
+from ads_api.keyword_metrics import get_keywords_metrics
+from benchmarks.fake_ads_server import add_server_arguments
+
+SCENARIOS = ['sync', 'batch', 'metrics', 'async', 'cli']
+# 模拟服务器不校验客户ID
+CUSTOMER_ID = '1234567890'
+SERVER_SCRIPT = os.path.join(ROOT, 'benchmarks', 'fake_ads_server.py')
+
+def build_config(endpoint):
+    """
+    构建连接模拟服务器的GOOGLE_ADS配置 (凭据字段只需要非空)
+    
+    Args:
+        endpoint: 模拟服务器地址
+    
+    Returns:
+        dict: GOOGLE_ADS配置
+    """
+    return {
+        'developer_token': 'fake-developer-token',
+        'client_id': 'fake-client-id',
+        'client_secret': 'fake-client-secret',
+        'refresh_token': 'fake-refresh-token',
+        'login_customer_id': CUSTOMER_ID,
+        'use_proto_plus': False,
+        'endpoint': endpoint,
+        'insecure': True,
+    }
+
+def free_port():
+    """返回一个空闲的本地端口"""
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+def start_server(args):
+    """
+    在子进程中启动模拟服务器 (服务器的CPU和内存不计入测试结果)，等待其可以连接
+    
+    Returns:
+        tuple: (subprocess.Popen, 服务器地址)
+    
+    Raises:
+        RuntimeError: 如果服务器没有在10秒内启动
+    """
+    port = free_port()
+    command = [sys.executable, SERVER_SCRIPT, '--port', str(port), '--workers', str(args.server_workers),
+               '--ideas', str(args.ideas), '--latency', args.latency, '--error-rate', str(args.error_rate)]
+    if args.quota_qps:
+        command += ['--quota-qps', str(args.quota_qps)]
+    if args.page_size:
+        command += ['--page-size', str(args.page_size)]
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL)
+    
+    endpoint = f"localhost:{port}"
+    channel = grpc.insecure_channel(endpoint)
+    try:
+        grpc.channel_ready_future(channel).result(timeout=10)
+    except grpc.FutureTimeoutError:
+        process.kill()
+        raise RuntimeError(f"模拟服务器没有启动: {endpoint}")
+    finally:
+        channel.close()
+    return process, endpoint
+
+def percentile(values, fraction):
+    """返回排序后的values中fraction分位的值 (最近秩法)"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))
+    return values[index]
+
+class Measurement:
+    """一个场景的测量结果"""
+    
+    def __init__(self, name):
+        self.name = name
+        self.keywords = 0
+        self.errors = 0
+        self.latencies = []
+        self.elapsed = 0.0
+        self.peak_memory = None
+        self._lock = threading.Lock()
+    
+    def record(self, start, keywords=1, errors=0):
+        """记录一次从start开始的调用 (可以在多个线程中调用)"""
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.latencies.append(elapsed)
+            self.keywords += keywords
+            self.errors += errors
+    
+    def report(self):
+        """格式化一行结果"""
+        latencies = sorted(self.latencies)
+        rate = self.keywords / self.elapsed if self.elapsed else 0.0
+        line = f"{self.name:<8} {self.keywords:>7} 个关键词  {self.elapsed:7.2f} s  {rate:9.1f} 个/秒  "
+        if latencies:
+            line += f"p50 {percentile(latencies, 0.5) * 1000:8.1f} ms  p99 {percentile(latencies, 0.99) * 1000:8.1f} ms"
+        else:
+            # cli场景只测量总耗时
+            line += f"{'':<30}"
+        if self.errors:
+            line += f"  错误 {self.errors}"
+        if self.peak_memory is not None:
+            line += f"  内存峰值 {self.peak_memory / 1024 / 1024:.1f} MB"
+        return line
+    
+    def all_failed(self):
+        """是否所有关键词都失败 (此时吞吐量和延迟没有意义)"""
+        return self.keywords > 0 and self.errors >= self.keywords
+
+def run_sync(client, keywords, args, measurement):
+    """每个关键词调用一次get_keyword_data，用线程池并发"""
+    def lookup(keyword):
+        start = time.perf_counter()
+        try:
+            errors = 0 if get_keyword_data(client, CUSTOMER_ID, keyword, idea_cache=None) else 1
+        except Exception:
+            errors = 1
+        measurement.record(start, errors=errors)
+    
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(lookup, keywords))
+
+def run_batch(client, keywords, args, measurement):
+    """每batch_size个关键词调用一次get_keywords_data_batch，用线程池并发"""
+    def lookup(batch):
+        start = time.perf_counter()
+        try:
+            results = get_keywords_data_batch(client, CUSTOMER_ID, batch, batch_size=args.batch_size, idea_cache=None)
+            errors = sum(1 for keyword in batch if not results.get(keyword))
+        except Exception:
+            errors = len(batch)
+        measurement.record(start, len(batch), errors)
+    
+    batches = [keywords[i:i + args.batch_size] for i in range(0, len(keywords), args.batch_size)]
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(lookup, batches))
+
+def run_metrics(client, keywords, args, measurement):
+    """每1000个关键词调用一次get_keywords_metrics (GenerateKeywordHistoricalMetrics)，用线程池并发"""
+    def lookup(batch):
+        start = time.perf_counter()
+        try:
+            results = get_keywords_metrics(client, CUSTOMER_ID, batch)
+            errors = sum(1 for keyword in batch if not results.get(keyword))
+        except Exception:
+            errors = len(batch)
+        measurement.record(start, len(batch), errors)
+    
+    batches = [keywords[i:i + 1000] for i in range(0, len(keywords), 1000)]
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(lookup, batches))
+
+def run_async(config, keywords, args, measurement):
+    """用AsyncGoogleAdsClient并发查询所有关键词 (并发数为workers)"""
+    from ads_api.async_client import AsyncGoogleAdsClient
+    from ads_api.async_keyword_data import async_get_keyword_data
+    
+    async def run():
+        async with AsyncGoogleAdsClient(config, max_concurrency=args.workers) as client:
+            async def lookup(keyword):
+                start = time.perf_counter()
+                try:
+                    errors = 0 if await async_get_keyword_data(client, CUSTOMER_ID, keyword, idea_cache=None) else 1
+                except Exception:
+                    errors = 1
+                measurement.record(start, errors=errors)
+            
+            await asyncio.gather(*(lookup(keyword) for keyword in keywords))
+    
+    asyncio.run(run())
+
+def run_library(name, config, keywords, args):
+    """
+    在当前进程中运行一个库API场景
+    
+    Returns:
+        Measurement: 测量结果
+    """
+    measurement = Measurement(name)
+    # 模拟服务器的错误很快恢复，熔断和重试等待缩短到毫秒级
+    policy = RetryPolicy(max_attempts=args.max_retries + 1, base_delay=0.05, max_delay=1.0)
+    breaker = CircuitBreaker(cooldown=0.2, max_cooldown=2.0)
+    client = GoogleAdsClient(config, retry_policy=policy, breaker=breaker)
+    
+    if args.memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    if name == 'sync':
+        run_sync(client, keywords, args, measurement)
+    elif name == 'batch':
+        run_batch(client, keywords, args, measurement)
+    elif name == 'metrics':
+        run_metrics(client, keywords, args, measurement)
+    else:
+        run_async(config, keywords, args, measurement)
+    measurement.elapsed = time.perf_counter() - start
+    if args.memory:
+        measurement.peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return measurement
+
+def write_cli_config(directory, config):
+    """在directory中写入batch_keywords.py使用的config.py (config.example.py加上模拟服务器的GOOGLE_ADS)"""
+    with open(os.path.join(ROOT, 'config.example.py'), 'r', encoding='utf-8') as f:
+        content = f.read()
+    with open(os.path.join(directory, 'config.py'), 'w', encoding='utf-8') as f:
+        f.write(content)
+        f.write(f"\n# 连接模拟服务器\nGOOGLE_ADS = {config!r}\n")
+
+def run_cli(config, keywords, args):
+    """
+    在子进程中运行batch_keywords.py，测量总耗时和子进程的最大常驻内存
+    
+    Returns:
+        Measurement: 测量结果 (没有单次调用延迟)
+    """
+    measurement = Measurement('cli')
+    with tempfile.TemporaryDirectory(prefix='ads_api_bench_') as directory:
+        write_cli_config(directory, config)
+        input_file = os.path.join(directory, 'keywords.txt')
+        output_file = os.path.join(directory, 'results.csv')
+        with open(input_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(keywords) + '\n')
+        
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join([directory, ROOT] + ([env['PYTHONPATH']] if env.get('PYTHONPATH') else []))
+        command = [sys.executable, os.path.join(ROOT, 'batch_keywords.py'), input_file, '-o', output_file,
+                   '--no-cache', '-d', '0', '--max-retries', str(args.max_retries)] + shlex.split(args.cli_args)
+        
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=directory, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        measurement.elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            print(result.stderr[-2000:], file=sys.stderr)
+            measurement.errors = len(keywords)
+        measurement.keywords = len(keywords)
+        # Linux上ru_maxrss的单位是KB
+        measurement.peak_memory = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+    return measurement
+
+def main():
+    parser = argparse.ArgumentParser(description='基于本地模拟服务器的关键词查询性能测试')
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS,
+                        help=f'测试场景，可以重复指定 (默认: 全部 {", ".join(SCENARIOS)})')
+    parser.add_argument('--keywords', type=int, default=1000, help='每个场景查询的关键词数量 (默认: 1000)')
+    parser.add_argument('--workers', type=int, default=8, help='并发线程数或异步并发数 (默认: 8)')
+    parser.add_argument('--batch-size', type=int, default=20, help='batch场景每个请求的关键词数量 (默认: 20)')
+    parser.add_argument('--max-retries', type=int, default=4, help='每个请求的最大重试次数 (默认: 4)')
+    parser.add_argument('--memory', action='store_true', help='用tracemalloc记录库API场景的内存峰值 (会降低吞吐量)')
+    parser.add_argument('--cli-args', default='-w 8', help='cli场景传给batch_keywords.py的额外参数 (默认: "-w 8")')
+    parser.add_argument('--endpoint', help='使用已经启动的模拟服务器 (默认: 自动启动)')
+    parser.add_argument('--server-workers', type=int, default=64, help='自动启动的模拟服务器线程数 (默认: 64)')
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    
+    scenarios = args.scenario or SCENARIOS
+    server = None
+    endpoint = args.endpoint
+    if endpoint is None:
+        server, endpoint = start_server(args)
+    config = build_config(endpoint)
+    
+    print(f"模拟服务器 {endpoint}: 每个响应 {args.ideas} 个关键词提示, 延迟 {args.latency}, "
+          f"错误率 {args.error_rate}, 配额 {args.quota_qps or '不限制'} 请求/秒")
+    failed = []
+    try:
+        for name in scenarios:
+            # 每个场景使用不同的关键词，避免命中上一个场景的缓存
+            keywords = [f"benchmark {name} keyword {index}" for index in range(args.keywords)]
+            if name == 'cli':
+                measurement = run_cli(config, keywords, args)
+            else:
+                measurement = run_library(name, config, keywords, args)
+            print(measurement.report())
+            if measurement.all_failed():
+                print(f"警告: {name} 场景的所有关键词都查询失败，结果无效", file=sys.stderr)
+                failed.append(name)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
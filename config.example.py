@@ -14,9 +14,34 @@ GOOGLE_ADS = {
     'client_secret': 'YOUR_CLIENT_SECRET',
     'refresh_token': 'YOUR_REFRESH_TOKEN',
     'login_customer_id': 'YOUR_CUSTOMER_ID_WITHOUT_DASHES',  # 可选
-    'use_proto_plus': True  # 使用Proto Plus库进行序列化/反序列化
+    'use_proto_plus': True  # 使用Proto Plus库进行序列化/反序列化 (设为False时直接解析原生protobuf，大批量查询时更快)
+    # 'endpoint': 'localhost:50051',  # 可选，自定义服务地址
+    # 'insecure': True,  # 可选，使用不加密的通道且不发送OAuth凭据 (只用于benchmarks/fake_ads_server.py等本地模拟服务器)
 }
 
 # 应用配置
 DEFAULT_COUNTRY = 'US'  # 默认国家
-CACHE_TIMEOUT = 3600  # 缓存超时时间（秒） 
\ No newline at end of file
+CACHE_TIMEOUT = 3600  # 缓存超时时间（秒），同时用于结果缓存和进程内关键词提示缓存
+CACHE_PATH = '.keyword_cache.sqlite3'  # 关键词结果缓存文件 (SQLite)
+CACHE_MAX_ENTRIES = 500000  # 关键词结果缓存最多保存的条目数 
+SERVICE_BATCH_WINDOW = 0  # HTTP服务的微批处理收集窗口（秒），如0.05；0表示不合并单个关键词查询
+
+# 关键词类型特征词 (可选，配置的类型替换默认特征词，未配置的类型使用默认值)
+# 英文等以空格分词的特征词按整词匹配 (允许复数、-er/-est、-ing/-ed等词尾，best/top/vs/versus除外；字母和数字之间视为边界)，中日韩文字的特征词按子串匹配
+# KEYWORD_INTENT_INDICATORS = {
+#     'T': ['buy', 'price', 'cheap', 'discount', 'deal', 'coupon', 'purchase', 'shop', 'order', '购买', '价格'],
+#     'C': ['best', 'top', 'review', 'compare', 'vs', 'versus', '推荐', '评测'],
+#     'I': ['what', 'how', 'why', 'guide', 'tutorial', '如何', '教程'],
+# }
+
+
+# 多账户配置 (可选，配合batch_keywords.py --accounts config使用)
+# 每项覆盖GOOGLE_ADS中的字段，可以使用不同的开发者令牌和客户账户分担API配额；
+# name用于日志，weight为分配权重 (默认为1)
+# GOOGLE_ADS_ACCOUNTS = [
+#     {'name': 'main', 'login_customer_id': '1234567890', 'weight': 2},
+#     {'name': 'backup', 'developer_token': 'YOUR_OTHER_DEVELOPER_TOKEN', 'login_customer_id': '0987654321'},
+# ]
+
+# 查询守护进程 (keyword_daemon.py) 的套接字路径 (可选，默认为 ~/.cache/ads_api/keyword_daemon.sock)
+# DAEMON_SOCKET_PATH = '/tmp/ads_api_keyword_daemon.sock'
\ No newline at end of file
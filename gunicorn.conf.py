@@ -0,0 +1,33 @@
+"""
+gunicorn配置 (关键词查询HTTP服务)
+
+    gunicorn -c gunicorn.conf.py keyword_service:app
+
+可以通过环境变量覆盖: KEYWORD_SERVICE_BIND、KEYWORD_SERVICE_WORKERS、KEYWORD_SERVICE_THREADS
+
+服务没有身份验证，任何能访问它的人都可以消耗账户的关键词规划配额，因此默认只监听本机；
+需要对外提供时显式设置 KEYWORD_SERVICE_BIND (如 0.0.0.0:8000)，并放在有身份验证的反向代理之后。
+"""
+
+import os
+import logging
+
+bind = os.environ.get('KEYWORD_SERVICE_BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('KEYWORD_SERVICE_WORKERS', '2'))
+# 每个工作进程用多个线程处理请求，同一进程中的并发请求才能合并为一次查询
+worker_class = 'gthread'
+threads = int(os.environ.get('KEYWORD_SERVICE_THREADS', '16'))
+# 关键词查询可能因为重试而耗时较长
+timeout = 120
+# 每个工作进程在fork之后才创建GoogleAdsClient，不能预加载应用
+preload_app = False
+
+def post_worker_init(worker):
+    """工作进程启动后创建并预热GoogleAdsClient"""
+    from keyword_service import get_service
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    try:
+        get_service()
+    except Exception as e:
+        # 预热失败时在第一个请求时重试
+        worker.log.error(f"关键词查询服务预热失败: {e}")
@@ -8,7 +8,6 @@ import sys
 import argparse
 import json
 import logging
-from ads_api import GoogleAdsClient, get_keyword_data
 import config
 
 # 配置日志
@@ -26,12 +25,70 @@ def setup_argparse():
     parser = argparse.ArgumentParser(description='Google Ads 关键词分析工具 - 命令行版本')
     parser.add_argument('keyword', nargs='?', help='要分析的关键词')
     parser.add_argument('-l', '--language', default='1000', help='语言ID (默认: 1000 - 英语)')
-    parser.add_argument('-c', '--country', default='2840', help='国家ID (默认: 2840 - 美国)')
+    parser.add_argument('-c', '--country', default='2840', help='国家ID，多个国家用逗号分隔，如 2840,2826,2276 (默认: 2840 - 美国)')
     parser.add_argument('-j', '--json', action='store_true', help='以JSON格式输出结果')
     parser.add_argument('-v', '--verbose', action='store_true', help='显示详细日志')
     parser.add_argument('-d', '--debug', action='store_true', help='显示调试级别的日志（比verbose更详细）')
+    parser.add_argument('--log-json', action='store_true', help='以JSON格式输出日志 (每行一条)')
+    parser.add_argument('--debug-sample', type=float, default=1.0,
+                        help='调试日志的采样率 (0-1)，如 0.01 只记录1%%的调试日志 (默认: 1，全部记录)')
+    parser.add_argument('--no-cache', action='store_true', help='不使用本地结果缓存')
+    parser.add_argument('--refresh', action='store_true', help='忽略已缓存的结果，重新查询并更新缓存')
+    parser.add_argument('--cache-ttl', type=float, help='结果缓存有效期秒数 (默认: config.CACHE_TIMEOUT)')
+    parser.add_argument('--cache-path', help='结果缓存文件路径 (默认: config.CACHE_PATH)')
+    parser.add_argument('--no-daemon', action='store_true', help='不使用查询守护进程，始终在当前进程中查询')
+    parser.add_argument('--socket', help='查询守护进程的套接字路径 (默认: config.DAEMON_SOCKET_PATH 或 ~/.cache/ads_api/keyword_daemon.sock)')
     return parser
 
+def setup_result_cache(args):
+    """根据命令行参数创建结果缓存，禁用或创建失败时返回None"""
+    from ads_api.result_cache import ResultCache, DEFAULT_CACHE_TTL, DEFAULT_CACHE_PATH, DEFAULT_CACHE_MAX_ENTRIES
+    
+    if args.no_cache:
+        return None
+    try:
+        return ResultCache(
+            path=args.cache_path or getattr(config, 'CACHE_PATH', DEFAULT_CACHE_PATH),
+            ttl=args.cache_ttl if args.cache_ttl is not None else getattr(config, 'CACHE_TIMEOUT', DEFAULT_CACHE_TTL),
+            max_entries=getattr(config, 'CACHE_MAX_ENTRIES', DEFAULT_CACHE_MAX_ENTRIES)
+        )
+    except Exception as e:
+        logger.warning(f"无法打开结果缓存，将直接查询API: {e}")
+        return None
+
+def lookup_via_daemon(args):
+    """
+    通过查询守护进程 (keyword_daemon.py) 查询关键词
+    
+    守护进程没有运行、指定了--no-daemon或自定义了结果缓存选项时不处理，由调用方在当前进程中查询。
+    
+    Returns:
+        tuple: (是否由守护进程处理, 关键词数据)
+    
+    Raises:
+        RuntimeError: 如果守护进程查询失败
+    """
+    # 守护进程使用自己的缓存设置，自定义缓存路径或有效期时在当前进程中查询
+    if args.no_daemon or args.cache_path or args.cache_ttl is not None:
+        return False, None
+    from ads_api.daemon import daemon_lookup, DaemonUnavailable, DEFAULT_SOCKET_PATH
+    
+    socket_path = args.socket or getattr(config, 'DAEMON_SOCKET_PATH', None) or DEFAULT_SOCKET_PATH
+    try:
+        keyword_data = daemon_lookup(
+            args.keyword,
+            language_id=args.language,
+            location_id=args.country,
+            use_cache=not args.no_cache,
+            refresh=args.refresh,
+            socket_path=socket_path
+        )
+    except DaemonUnavailable as e:
+        logger.debug(f"{e}，在当前进程中查询")
+        return False, None
+    logger.info(f"通过守护进程获取关键词数据: {args.keyword}")
+    return True, keyword_data
+
 def format_output(keyword_data, json_output=False):
     """格式化输出结果"""
     if json_output:
@@ -46,6 +103,11 @@ def format_output(keyword_data, json_output=False):
     output.append("-" * 50)
     output.append(f"搜索量 (美国): {keyword_data.get('volume_us', 'N/A'):,}")
     output.append(f"搜索量 (全球): {keyword_data.get('volume_global', 'N/A'):,}")
+    
+    # 多地区搜索量
+    for location_id, volume in keyword_data.get('volumes', {}).items():
+        volume_display = f"{volume:,}" if volume is not None else "数据不可用"
+        output.append(f"搜索量 (位置 {location_id}): {volume_display}")
     output.append(f"关键词难度 (KD): {keyword_data.get('kd', 'N/A')}")
     
     # 处理CPC显示
@@ -83,11 +145,14 @@ def format_output(keyword_data, json_output=False):
     
     return "\n".join(output)
 
-def interactive_mode():
+def interactive_mode(cache=None, refresh=False):
     """交互模式"""
     print("\n=== Google Ads 关键词分析工具 - 交互模式 ===")
     print("输入关键词进行分析，输入 'q' 或 'exit' 退出\n")
     
+    from ads_api import GoogleAdsClient
+    from ads_api.result_cache import get_keyword_data_cached
+    
     # 初始化Google Ads客户端
     try:
         ads_client = GoogleAdsClient(config.GOOGLE_ADS)
@@ -106,10 +171,12 @@ def interactive_mode():
             print(f"\n正在分析关键词: {keyword}...")
             
             try:
-                keyword_data = get_keyword_data(
+                keyword_data = get_keyword_data_cached(
                     ads_client, 
                     customer_id, 
-                    keyword
+                    keyword,
+                    cache=cache,
+                    refresh=refresh
                 )
                 
                 if keyword_data:
@@ -141,28 +208,45 @@ def main():
     else:
         logging.getLogger().setLevel(logging.WARNING)
     
+    # JSON格式日志或调试日志采样
+    if args.log_json or args.debug_sample < 1.0:
+        from ads_api.log_utils import configure_logging
+        configure_logging(logging.getLogger().level, json_format=args.log_json, debug_sample_rate=args.debug_sample)
+    
     # 如果没有提供关键词，进入交互模式
     if not args.keyword:
-        return interactive_mode()
+        return interactive_mode(setup_result_cache(args), args.refresh)
     
-    # 初始化Google Ads客户端
     try:
-        ads_client = GoogleAdsClient(config.GOOGLE_ADS)
-        customer_id = config.GOOGLE_ADS.get('login_customer_id', '')
+        # 查询守护进程正在运行时由它查询，不需要在当前进程中初始化客户端
+        handled, keyword_data = lookup_via_daemon(args)
         
-        if not customer_id:
-            logger.error("未配置客户ID (login_customer_id)")
-            return 1
+        if not handled:
+            from ads_api import GoogleAdsClient
+            from ads_api.result_cache import get_keyword_data_cached
             
-        # 获取关键词数据
-        logger.info(f"开始获取关键词数据: {args.keyword}")
-        keyword_data = get_keyword_data(
-            ads_client, 
-            customer_id, 
-            args.keyword,
-            language_id=args.language,
-            location_id=args.country
-        )
+            # 打开本地结果缓存
+            cache = setup_result_cache(args)
+            
+            # 初始化Google Ads客户端
+            ads_client = GoogleAdsClient(config.GOOGLE_ADS)
+            customer_id = config.GOOGLE_ADS.get('login_customer_id', '')
+            
+            if not customer_id:
+                logger.error("未配置客户ID (login_customer_id)")
+                return 1
+                
+            # 获取关键词数据
+            logger.info(f"开始获取关键词数据: {args.keyword}")
+            keyword_data = get_keyword_data_cached(
+                ads_client, 
+                customer_id, 
+                args.keyword,
+                language_id=args.language,
+                location_id=args.country,
+                cache=cache,
+                refresh=args.refresh
+            )
         
         if keyword_data:
             print(format_output(keyword_data, args.json))
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Google Ads 关键词分析工具 - 查询守护进程
+在后台保持一个已预热的GoogleAdsClient，keyword_cli.py检测到守护进程时通过本地Unix套接字查询，
+每次调用只需要一次API请求的时间:
+
+    python keyword_daemon.py &              # 启动
+    python keyword_daemon.py --status       # 查看状态
+    python keyword_daemon.py --stop         # 停止
+
+修改config.py后需要重启守护进程。
+"""
+
+import sys
+import signal
+import argparse
+import logging
+import threading
+from ads_api.daemon import KeywordDaemon, DEFAULT_SOCKET_PATH, daemon_request, daemon_running, DaemonUnavailable
+from ads_api.idea_cache import default_idea_cache, DEFAULT_IDEA_MAX_AGE
+from ads_api.result_cache import ResultCache, DEFAULT_CACHE_TTL, DEFAULT_CACHE_PATH, DEFAULT_CACHE_MAX_ENTRIES
+import config
+
+# 配置日志
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+def setup_argparse():
+    """设置命令行参数解析"""
+    parser = argparse.ArgumentParser(description='Google Ads 关键词分析工具 - 查询守护进程')
+    parser.add_argument('--socket', help='套接字路径 (默认: config.DAEMON_SOCKET_PATH 或 ~/.cache/ads_api/keyword_daemon.sock)')
+    parser.add_argument('--stop', action='store_true', help='停止正在运行的守护进程')
+    parser.add_argument('--status', action='store_true', help='查看守护进程是否正在运行')
+    parser.add_argument('--no-cache', action='store_true', help='不使用本地结果缓存')
+    parser.add_argument('--no-warm-up', action='store_true', help='启动时不预先建立gRPC连接 (第一个请求时再建立连接)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='显示详细日志')
+    return parser
+
+def setup_result_cache(args):
+    """根据配置创建结果缓存，禁用或创建失败时返回None"""
+    if args.no_cache:
+        return None
+    try:
+        return ResultCache(
+            path=getattr(config, 'CACHE_PATH', DEFAULT_CACHE_PATH),
+            ttl=getattr(config, 'CACHE_TIMEOUT', DEFAULT_CACHE_TTL),
+            max_entries=getattr(config, 'CACHE_MAX_ENTRIES', DEFAULT_CACHE_MAX_ENTRIES)
+        )
+    except Exception as e:
+        logger.warning(f"无法打开结果缓存，将直接查询API: {e}")
+        return None
+
+def setup_idea_cache():
+    """进程内关键词提示缓存的有效期与结果缓存相同，结果缓存过期后不会再从内存中返回旧数据"""
+    default_idea_cache.set_max_age(getattr(config, 'CACHE_TIMEOUT', DEFAULT_IDEA_MAX_AGE))
+
+def main():
+    """主函数"""
+    parser = setup_argparse()
+    args = parser.parse_args()
+    socket_path = args.socket or getattr(config, 'DAEMON_SOCKET_PATH', None) or DEFAULT_SOCKET_PATH
+    
+    if args.verbose:
+        logging.getLogger('ads_api').setLevel(logging.DEBUG)
+    
+    if args.stop or args.status:
+        try:
+            response = daemon_request({'op': 'shutdown' if args.stop else 'ping'}, socket_path)
+        except DaemonUnavailable:
+            print(f"守护进程没有运行: {socket_path}")
+            return 1
+        if args.stop:
+            print("守护进程已停止")
+        else:
+            print(f"守护进程正在运行: {socket_path} (PID {response.get('pid')}, 已处理 {response.get('requests')} 个请求)")
+        return 0
+    
+    # 在创建客户端和预热之前检查，避免重复启动时白白交换OAuth令牌和建立连接
+    if daemon_running(socket_path):
+        print(f"守护进程已在运行: {socket_path}")
+        return 1
+    
+    setup_idea_cache()
+    try:
+        daemon = KeywordDaemon(config.GOOGLE_ADS, socket_path, cache=setup_result_cache(args))
+        if not args.no_warm_up:
+            daemon.warm_up()
+    except Exception as e:
+        logger.error(f"初始化Google Ads客户端时出错: {e}")
+        return 1
+    
+    # SIGTERM时正常停止并删除套接字文件 (shutdown需要在其他线程中调用)
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=daemon.shutdown).start())
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        logger.error(f"守护进程出错: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+"""
+Google Ads 关键词分析工具 - HTTP服务
+提供单个和批量关键词查询接口，可以直接运行 (开发用) 或通过gunicorn部署:
+
+    gunicorn -c gunicorn.conf.py keyword_service:app
+
+每个工作进程只创建一个GoogleAdsClient并在启动时预热，同一个 (关键词, 语言, 位置) 的并发请求
+合并为一次查询。
+"""
+
+import sys
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, jsonify, request
+from ads_api import GoogleAdsClient
+from ads_api.normalize import normalize_keyword
+from ads_api.result_cache import ResultCache, get_keyword_data_cached, DEFAULT_CACHE_TTL, DEFAULT_CACHE_PATH, DEFAULT_CACHE_MAX_ENTRIES
+from ads_api.idea_cache import default_idea_cache, DEFAULT_IDEA_MAX_AGE
+from ads_api.singleflight import SingleFlight
+from ads_api.batcher import KeywordBatcher
+from ads_api.keyword_data import parse_location_ids
+import config
+
+logger = logging.getLogger(__name__)
+
+# 默认的语言ID和位置ID
+DEFAULT_LANGUAGE_ID = '1000'
+DEFAULT_LOCATION_ID = '2840'
+# 批量接口每个请求最多包含的关键词数量
+MAX_BULK_KEYWORDS = 1000
+# 每个工作进程中并发查询批量接口关键词的线程数
+BULK_WORKERS = 8
+
+class KeywordService:
+    """
+    关键词查询服务
+    
+    在每个工作进程中保持一个已初始化的GoogleAdsClient、结果缓存和请求合并器。
+    """
+    
+    def __init__(self, ads_config, cache=None, bulk_workers=BULK_WORKERS, batch_window=0):
+        """
+        初始化关键词查询服务
+        
+        Args:
+            ads_config: Google Ads API配置字典
+            cache: ResultCache实例 (为None时不使用结果缓存)
+            bulk_workers: 批量接口的并发线程数
+            batch_window: 微批处理的收集窗口 (秒)，大于0时把并发的单个关键词查询合并为多种子关键词请求
+        """
+        self.ads_config = ads_config
+        self.customer_id = ads_config.get('login_customer_id', '')
+        self.cache = cache
+        self.client = GoogleAdsClient(ads_config)
+        self.flights = SingleFlight()
+        self.executor = ThreadPoolExecutor(max_workers=bulk_workers, thread_name_prefix='keyword-bulk')
+        self.batcher = None
+        if batch_window > 0:
+            self.batcher = KeywordBatcher(self.client, self.customer_id, max_wait=batch_window)
+    
+    def warm_up(self):
+        """预先创建服务、枚举和资源名称，第一个请求不再承担这些开销"""
+        self.client.get_service("KeywordPlanIdeaService")
+        self.client.new_keyword_ideas_request(self.customer_id, DEFAULT_LANGUAGE_ID, DEFAULT_LOCATION_ID)
+        self.client.new_keyword_ideas_request(self.customer_id, DEFAULT_LANGUAGE_ID, None)
+        logger.info("关键词查询服务已预热")
+    
+    def lookup(self, keyword, language_id=DEFAULT_LANGUAGE_ID, location_id=DEFAULT_LOCATION_ID, refresh=False):
+        """
+        查询单个关键词的数据 (并发的相同查询合并为一次)
+        
+        Args:
+            keyword: 关键词
+            language_id: 语言ID
+            location_id: 位置ID (逗号分隔的多个位置ID时查询所有位置)
+            refresh: 为True时忽略已缓存的数据
+        
+        Returns:
+            dict: 关键词数据 (未找到数据时为空字典)
+        """
+        key = (normalize_keyword(keyword), language_id, location_id, refresh)
+        keyword_data = self.flights.do(key, self._fetch, keyword, language_id, location_id, refresh)
+        # 合并的请求共享同一个结果，返回副本
+        return dict(keyword_data or {})
+    
+    def _fetch(self, keyword, language_id, location_id, refresh):
+        """查询单个关键词 (启用微批处理时单地区查询交给微批处理器)"""
+        if self.batcher is None or refresh or len(parse_location_ids(location_id)) > 1:
+            return get_keyword_data_cached(
+                self.client, self.customer_id, keyword,
+                language_id=language_id,
+                location_id=location_id,
+                cache=self.cache,
+                refresh=refresh
+            )
+        
+        if self.cache is not None:
+            keyword_data = self.cache.get(keyword, language_id, location_id)
+            if keyword_data is not None:
+                return keyword_data
+        keyword_data = self.batcher.lookup(keyword, language_id, location_id)
+        if self.cache is not None and keyword_data:
+            self.cache.set(keyword, language_id, location_id, keyword_data)
+        return keyword_data
+    
+    def lookup_many(self, keywords, language_id=DEFAULT_LANGUAGE_ID, location_id=DEFAULT_LOCATION_ID, refresh=False):
+        """
+        并发查询多个关键词的数据
+        
+        Args:
+            keywords: 关键词列表
+            language_id: 语言ID
+            location_id: 位置ID
+            refresh: 为True时忽略已缓存的数据
+        
+        Returns:
+            tuple: (关键词 -> 关键词数据, 关键词 -> 错误信息)
+        """
+        futures = {
+            keyword: self.executor.submit(self.lookup, keyword, language_id, location_id, refresh)
+            for keyword in dict.fromkeys(keywords)
+        }
+        results = {}
+        errors = {}
+        for keyword, future in futures.items():
+            try:
+                results[keyword] = future.result()
+            except Exception as e:
+                logger.error(f"查询关键词 '{keyword}' 时出错: {e}")
+                errors[keyword] = str(e)
+        return results, errors
+
+def setup_result_cache():
+    """根据配置创建结果缓存，创建失败时返回None"""
+    try:
+        return ResultCache(
+            path=getattr(config, 'CACHE_PATH', DEFAULT_CACHE_PATH),
+            ttl=getattr(config, 'CACHE_TIMEOUT', DEFAULT_CACHE_TTL),
+            max_entries=getattr(config, 'CACHE_MAX_ENTRIES', DEFAULT_CACHE_MAX_ENTRIES)
+        )
+    except Exception as e:
+        logger.warning(f"无法打开结果缓存，将直接查询API: {e}")
+        return None
+
+def setup_idea_cache():
+    """进程内关键词提示缓存的有效期与结果缓存相同，结果缓存过期后不会再从内存中返回旧数据"""
+    default_idea_cache.set_max_age(getattr(config, 'CACHE_TIMEOUT', DEFAULT_IDEA_MAX_AGE))
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_service():
+    """
+    获取当前进程的关键词查询服务 (第一次调用时创建并预热)
+    
+    gunicorn的工作进程在fork之后才创建服务，gRPC连接不会在进程之间共享。
+    
+    Returns:
+        KeywordService
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                setup_idea_cache()
+                service = KeywordService(
+                    config.GOOGLE_ADS,
+                    cache=setup_result_cache(),
+                    batch_window=getattr(config, 'SERVICE_BATCH_WINDOW', 0)
+                )
+                service.warm_up()
+                _service = service
+    return _service
+
+def request_options(params):
+    """
+    读取请求中的语言、位置和刷新选项
+    
+    Args:
+        params: 查询参数或JSON请求体
+    
+    Returns:
+        tuple: (语言ID, 位置ID, 是否刷新)
+    """
+    language_id = str(params.get('language') or DEFAULT_LANGUAGE_ID)
+    location_id = str(params.get('location') or DEFAULT_LOCATION_ID)
+    refresh = str(params.get('refresh', '')).lower() in ('1', 'true', 'yes')
+    return language_id, location_id, refresh
+
+def create_app():
+    """
+    创建Flask应用
+    
+    Returns:
+        Flask
+    """
+    app = Flask(__name__)
+    app.config['JSON_AS_ASCII'] = False
+    
+    @app.route('/healthz')
+    def healthz():
+        """健康检查 (包含请求合并的统计信息)"""
+        stats = {}
+        if _service is not None:
+            stats['singleflight'] = _service.flights.stats()
+            if _service.batcher is not None:
+                stats['batcher'] = {'batches': _service.batcher.batch_count, 'keywords': _service.batcher.keyword_count}
+        return jsonify({'status': 'ok', **stats})
+    
+    @app.route('/api/keyword')
+    def keyword_endpoint():
+        """查询单个关键词: GET /api/keyword?keyword=seo+tools&language=1000&location=2840"""
+        keyword = (request.args.get('keyword') or '').strip()
+        if not keyword:
+            return jsonify({'error': '缺少keyword参数'}), 400
+        language_id, location_id, refresh = request_options(request.args)
+        
+        try:
+            keyword_data = get_service().lookup(keyword, language_id, location_id, refresh)
+        except Exception as e:
+            logger.error(f"查询关键词 '{keyword}' 时出错: {e}")
+            return jsonify({'error': str(e)}), 502
+        if not keyword_data:
+            return jsonify({'error': '未找到关键词数据', 'keyword': keyword}), 404
+        return jsonify(keyword_data)
+    
+    @app.route('/api/keywords', methods=['POST'])
+    def keywords_endpoint():
+        """批量查询关键词: POST /api/keywords {"keywords": [...], "language": "1000", "location": "2840"}"""
+        body = request.get_json(silent=True) or {}
+        keywords = body.get('keywords')
+        if not isinstance(keywords, list) or not all(isinstance(keyword, str) for keyword in keywords):
+            return jsonify({'error': 'keywords必须是字符串列表'}), 400
+        keywords = [keyword.strip() for keyword in keywords if keyword.strip()]
+        if not keywords:
+            return jsonify({'error': '没有有效的关键词'}), 400
+        if len(keywords) > MAX_BULK_KEYWORDS:
+            return jsonify({'error': f'每个请求最多包含 {MAX_BULK_KEYWORDS} 个关键词'}), 400
+        language_id, location_id, refresh = request_options(body)
+        
+        try:
+            service = get_service()
+        except Exception as e:
+            logger.error(f"初始化关键词查询服务时出错: {e}")
+            return jsonify({'error': str(e)}), 502
+        results, errors = service.lookup_many(keywords, language_id, location_id, refresh)
+        return jsonify({
+            'results': {keyword: data for keyword, data in results.items() if data},
+            'not_found': [keyword for keyword, data in results.items() if not data],
+            'errors': errors,
+        })
+    
+    return app
+
+app = create_app()
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Google Ads 关键词分析工具 - HTTP服务 (开发用，生产环境请使用gunicorn)')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址 (默认: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='监听端口 (默认: 8000)')
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+    get_service()
+    app.run(host=args.host, port=args.port, debug=getattr(config, 'DEBUG', False), use_reloader=False, threaded=True)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Google Ads 关键词分析工具 - 报表导出
+流式执行GAQL查询 (search_stream)，把结果逐行写入CSV、JSON Lines或Parquet文件，
+内存占用与报表大小无关
+"""
+
+import os
+import sys
+import argparse
+import logging
+from ads_api import GoogleAdsClient
+from ads_api.reports import parse_select_fields, export_query
+from ads_api.writers import ROW_WRITERS, FSYNC_POLICIES, FSYNC_CLOSE, create_row_writer
+import config
+
+# 配置日志
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+def setup_argparse():
+    """设置命令行参数解析"""
+    parser = argparse.ArgumentParser(description='Google Ads 关键词分析工具 - 报表导出')
+    parser.add_argument('query', nargs='?', help='GAQL查询语句')
+    parser.add_argument('-q', '--query-file', help='从文件读取GAQL查询语句')
+    parser.add_argument('-o', '--output', help='输出文件路径 (默认: report.<格式>)')
+    parser.add_argument('-f', '--format', choices=sorted(ROW_WRITERS), default='csv', help='输出格式 (默认: csv)')
+    parser.add_argument('--customer-id', help='查询的客户ID (默认: config.GOOGLE_ADS中的login_customer_id)')
+    parser.add_argument('--flush-rows', type=int, help='每缓冲多少行写入一次文件 (默认: CSV/JSON Lines为1000，Parquet为50000)')
+    parser.add_argument('--fsync', choices=FSYNC_POLICIES, default=FSYNC_CLOSE,
+                        help='fsync策略: never 不调用, close 关闭文件时调用一次, flush 每次写入后调用 (默认: close)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='显示详细日志')
+    return parser
+
+def read_query(args):
+    """
+    读取GAQL查询语句
+    
+    Returns:
+        str: 查询语句 (没有指定时为None)
+    """
+    if args.query_file:
+        with open(args.query_file, 'r', encoding='utf-8') as f:
+            return f.read()
+    return args.query
+
+def main():
+    """主函数"""
+    parser = setup_argparse()
+    args = parser.parse_args()
+    
+    # 设置日志级别
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+    else:
+        logging.getLogger().setLevel(logging.INFO)
+    
+    try:
+        query = read_query(args)
+    except OSError as e:
+        logger.error(f"无法读取查询文件: {e}")
+        return 1
+    if not query or not query.strip():
+        parser.print_help()
+        return 1
+    
+    try:
+        fields = parse_select_fields(query)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    
+    output_file = args.output or f"report.{args.format}"
+    options = {'fsync': args.fsync}
+    if args.flush_rows:
+        options['flush_rows'] = args.flush_rows
+    
+    try:
+        ads_client = GoogleAdsClient(config.GOOGLE_ADS)
+        customer_id = args.customer_id or config.GOOGLE_ADS.get('login_customer_id', '')
+        
+        if not customer_id:
+            logger.error("未配置客户ID (login_customer_id)")
+            return 1
+        
+        logger.info(f"开始导出报表: {len(fields)} 个字段 -> {output_file}")
+        with create_row_writer(args.format, output_file, fields, **options) as writer:
+            count = export_query(ads_client, customer_id, query, writer, fields)
+    
+    except Exception as e:
+        logger.error(f"导出报表时出错: {e}")
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+    
+    logger.info(f"导出完成! 共 {count} 行")
+    logger.info(f"结果已保存到: {os.path.abspath(output_file)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
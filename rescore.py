@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+"""
+Google Ads 关键词分析工具 - 离线重新评分
+使用指定的评分模型重新计算已有结果文件 (CSV、JSON Lines或Parquet) 中的关键词难度 (KD)，
+按块流式读取和写入，不调用API
+"""
+
+import os
+import sys
+import csv
+import json
+import argparse
+import logging
+from ads_api.scoring import SCORING_MODELS, DEFAULT_MODEL_VERSION, LinearScoringModel, get_model, score_columns
+from ads_api.writers import WRITERS
+from ads_api.ingest import iter_chunks
+
+# 配置日志
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# 默认每块处理的行数
+DEFAULT_CHUNK_ROWS = 50000
+
+# CSV结果文件中评分用到的列 (与CsvResultWriter的表头一致)
+CSV_VOLUME_COLUMN = '搜索量(美国)'
+CSV_KD_COLUMN = '关键词难度(KD)'
+CSV_CPC_COLUMN = 'CPC($)'
+CSV_COMPETITION_INDEX_COLUMN = '竞争指数'
+
+def setup_argparse():
+    """设置命令行参数解析"""
+    parser = argparse.ArgumentParser(description='Google Ads 关键词分析工具 - 离线重新评分')
+    parser.add_argument('input_file', help='batch_keywords.py输出的结果文件')
+    parser.add_argument('-o', '--output', help='输出文件路径 (默认: 在输入文件名的扩展名前加上模型版本)')
+    parser.add_argument('-f', '--format', choices=sorted(WRITERS), help='结果文件格式 (默认: 根据扩展名判断)')
+    parser.add_argument('--model', default=DEFAULT_MODEL_VERSION,
+                        help=f'评分模型版本 (可用: {", ".join(sorted(SCORING_MODELS))}，默认: {DEFAULT_MODEL_VERSION})')
+    parser.add_argument('--weights', help='自定义线性模型的权重: 竞争指数,搜索量,CPC (如 0.6,0.3,0.1)，指定时忽略--model')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help=f'每块处理的行数 (默认: {DEFAULT_CHUNK_ROWS})')
+    parser.add_argument('-v', '--verbose', action='store_true', help='显示详细日志')
+    return parser
+
+def parse_number(value):
+    """把结果文件中的文本转换为数值，N/A或空值返回None"""
+    if value is None or value in ('', 'N/A'):
+        return None
+    return float(value)
+
+def detect_format(path):
+    """
+    根据扩展名判断结果文件格式
+    
+    Returns:
+        str: 格式名称，无法判断时返回None
+    """
+    extension = os.path.splitext(path)[1].lstrip('.').lower()
+    for name, writer_class in WRITERS.items():
+        if writer_class.extension == extension:
+            return name
+    return None
+
+def build_model(args):
+    """
+    根据命令行参数获取评分模型
+    
+    Raises:
+        ValueError: 如果模型版本或权重无效
+    """
+    if not args.weights:
+        return get_model(args.model)
+    weights = [float(weight) for weight in args.weights.split(',')]
+    if len(weights) != 3:
+        raise ValueError(f"权重需要3个数值: {args.weights}")
+    return LinearScoringModel('custom', *weights)
+
+def rescore_csv(input_file, output_file, model, chunk_rows):
+    """
+    重新计算CSV结果文件的关键词难度 (其他列原样输出)
+    
+    Returns:
+        int: 处理的行数
+    """
+    count = 0
+    with open(input_file, newline='', encoding='utf-8') as source, \
+            open(output_file, 'w', newline='', encoding='utf-8') as target:
+        reader = csv.reader(source)
+        writer = csv.writer(target)
+        header = next(reader, None)
+        if header is None:
+            return 0
+        writer.writerow(header)
+        try:
+            volume_column = header.index(CSV_VOLUME_COLUMN)
+            kd_column = header.index(CSV_KD_COLUMN)
+            cpc_column = header.index(CSV_CPC_COLUMN)
+            competition_index_column = header.index(CSV_COMPETITION_INDEX_COLUMN)
+        except ValueError as e:
+            raise ValueError(f"CSV表头缺少评分需要的列: {e}")
+        
+        for rows in iter_chunks(reader, chunk_rows):
+            kds = score_columns(
+                [parse_number(row[competition_index_column]) for row in rows],
+                [parse_number(row[volume_column]) for row in rows],
+                [parse_number(row[cpc_column]) for row in rows],
+                model
+            )
+            for row, kd in zip(rows, kds):
+                row[kd_column] = kd
+            writer.writerows(rows)
+            count += len(rows)
+            logger.debug(f"已处理 {count} 行")
+    return count
+
+def rescore_jsonl(input_file, output_file, model, chunk_rows):
+    """
+    重新计算JSON Lines结果文件的关键词难度
+    
+    Returns:
+        int: 处理的行数
+    """
+    count = 0
+    with open(input_file, encoding='utf-8') as source, open(output_file, 'w', encoding='utf-8') as target:
+        records = (json.loads(line) for line in source if line.strip())
+        for chunk in iter_chunks(records, chunk_rows):
+            kds = score_columns(
+                [record.get('competition_index') for record in chunk],
+                [record.get('volume_us') for record in chunk],
+                [record.get('cpc') for record in chunk],
+                model
+            )
+            for record, kd in zip(chunk, kds):
+                record['kd'] = kd
+            target.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in chunk))
+            count += len(chunk)
+            logger.debug(f"已处理 {count} 行")
+    return count
+
+def rescore_parquet(input_file, output_file, model, chunk_rows):
+    """
+    重新计算Parquet结果文件的关键词难度 (每块写入一个行组，保留原有的schema)
+    
+    Returns:
+        int: 处理的行数
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet文件需要安装pyarrow: pip install pyarrow")
+    
+    count = 0
+    source = pq.ParquetFile(input_file)
+    schema = source.schema_arrow
+    kd_column = schema.get_field_index('kd')
+    if kd_column < 0:
+        raise ValueError("Parquet文件缺少kd列")
+    with pq.ParquetWriter(output_file, schema) as writer:
+        for batch in source.iter_batches(batch_size=chunk_rows):
+            # 含空值的整数列转换为带NaN的浮点数组
+            kds = score_columns(
+                batch.column('competition_index').to_numpy(zero_copy_only=False),
+                batch.column('volume_us').to_numpy(zero_copy_only=False),
+                batch.column('cpc').to_numpy(zero_copy_only=False),
+                model
+            )
+            columns = list(batch.columns)
+            columns[kd_column] = pa.array(kds, type=schema.field(kd_column).type)
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            count += batch.num_rows
+            logger.debug(f"已处理 {count} 行")
+    return count
+
+# 格式 -> 重新评分函数
+RESCORERS = {
+    'csv': rescore_csv,
+    'jsonl': rescore_jsonl,
+    'parquet': rescore_parquet,
+}
+
+def main():
+    """主函数"""
+    parser = setup_argparse()
+    args = parser.parse_args()
+    
+    # 设置日志级别
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+    else:
+        logging.getLogger().setLevel(logging.INFO)
+    
+    # 检查输入文件
+    if not os.path.exists(args.input_file):
+        logger.error(f"输入文件不存在: {args.input_file}")
+        return 1
+    
+    output_format = args.format or detect_format(args.input_file)
+    if output_format is None:
+        logger.error(f"无法根据扩展名判断文件格式，请使用 -f 指定: {args.input_file}")
+        return 1
+    
+    try:
+        model = build_model(args)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    
+    # 设置输出文件 (不覆盖输入文件)
+    base, extension = os.path.splitext(args.input_file)
+    output_file = args.output or f"{base}.{model.version}{extension}"
+    if os.path.abspath(output_file) == os.path.abspath(args.input_file):
+        logger.error("输出文件不能与输入文件相同")
+        return 1
+    
+    logger.info(f"使用评分模型 {model!r} 重新计算关键词难度: {args.input_file} -> {output_file}")
+    try:
+        count = RESCORERS[output_format](args.input_file, output_file, model, args.chunk_rows)
+    except (ValueError, ImportError) as e:
+        logger.error(f"重新评分失败: {e}")
+        return 1
+    
+    logger.info(f"处理完成! 共重新评分 {count} 个关键词")
+    logger.info(f"结果已保存到: {output_file}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+测试公共配置
+测试不需要Google凭据: 需要API的测试连接进程内启动的模拟服务器 (benchmarks/fake_ads_server.py)
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+class FakeClock:
+    """代替retry模块中的time: monotonic返回模拟时间，sleep只推进模拟时间并记录等待秒数"""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+    
+    def advance(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    """让retry模块使用模拟时钟，熔断和重试等待不需要真正等待"""
+    from ads_api import retry
+    
+    fake = FakeClock()
+    monkeypatch.setattr(retry, 'time', fake)
+    return fake
+
+@pytest.fixture(scope='session')
+def fake_server():
+    """
+    启动进程内的模拟KeywordPlanIdeaService
+    
+    Yields:
+        (FakeKeywordPlanIdeaService, endpoint)
+    """
+    from benchmarks.fake_ads_server import FakeKeywordPlanIdeaService, create_server
+    
+    service = FakeKeywordPlanIdeaService(ideas=20)
+    server, port = create_server(service, 0, max_workers=8)
+    yield service, f'localhost:{port}'
+    server.stop(0)
+
+@pytest.fixture
+def fake_config(fake_server):
+    """连接模拟服务器的GOOGLE_ADS配置"""
+    from benchmarks.keyword_benchmark import build_config
+    
+    return build_config(fake_server[1])
+
+@pytest.fixture
+def ads_client(fake_config):
+    """连接模拟服务器的GoogleAdsClient (使用单独的熔断器，不影响其他测试)"""
+    from ads_api.client import GoogleAdsClient
+    from ads_api.retry import RetryPolicy, CircuitBreaker
+    
+    return GoogleAdsClient(
+        fake_config,
+        retry_policy=RetryPolicy(max_attempts=2, base_delay=0.01, max_delay=0.05),
+        breaker=CircuitBreaker(cooldown=0.01, max_cooldown=0.05)
+    )
@@ -0,0 +1,112 @@
+"""
+检查点日志和batch_keywords.py恢复任务的测试
+"""
+
+import os
+import csv
+import sys
+import json
+import subprocess
+
+from ads_api.checkpoint import CheckpointJournal, STATUS_DONE, STATUS_NO_DATA, STATUS_FAILED
+
+from conftest import ROOT
+
+def test_path_for():
+    assert CheckpointJournal.path_for('out/results.csv') == 'out/results.csv.journal'
+
+def test_resume_skips_finished_keywords(tmp_path):
+    path = str(tmp_path / 'results.csv.journal')
+    with CheckpointJournal(path) as journal:
+        journal.open()
+        journal.record('seo tools', STATUS_DONE)
+        journal.record_many(['no data keyword', 'another'], STATUS_NO_DATA)
+        journal.record('broken keyword', STATUS_FAILED)
+        assert journal.summary() == {STATUS_DONE: 1, STATUS_NO_DATA: 2, STATUS_FAILED: 1}
+    
+    with CheckpointJournal(path) as journal:
+        journal.open(resume=True)
+        assert journal.is_finished('seo tools')
+        assert journal.is_finished('no data keyword')
+        # 失败的关键词在恢复时重新处理
+        assert not journal.is_finished('broken keyword')
+        assert not journal.is_finished('new keyword')
+        # 本次写入的记录只计数
+        assert journal.summary() == {}
+
+def test_last_record_wins(tmp_path):
+    path = str(tmp_path / 'journal')
+    with CheckpointJournal(path) as journal:
+        journal.open()
+        journal.record('seo tools', STATUS_FAILED)
+        journal.record('seo tools', STATUS_DONE)
+        journal.record('keyword research', STATUS_DONE)
+        journal.record('keyword research', STATUS_FAILED)
+    statuses = CheckpointJournal(path).load()
+    assert statuses == {'seo tools': STATUS_DONE, 'keyword research': STATUS_FAILED}
+
+def test_truncated_last_line_ignored(tmp_path):
+    path = tmp_path / 'journal'
+    path.write_text(
+        json.dumps({'keyword': 'seo tools', 'status': STATUS_DONE}) + '\n' + '{"keyword": "keyword res',
+        encoding='utf-8'
+    )
+    assert CheckpointJournal(str(path)).load() == {'seo tools': STATUS_DONE}
+
+def test_open_without_resume_truncates(tmp_path):
+    path = str(tmp_path / 'journal')
+    with CheckpointJournal(path) as journal:
+        journal.open()
+        journal.record('seo tools', STATUS_DONE)
+    with CheckpointJournal(path) as journal:
+        journal.open(resume=False)
+        assert not journal.is_finished('seo tools')
+    assert CheckpointJournal(path).load() == {}
+
+def test_non_ascii_keywords_round_trip(tmp_path):
+    path = str(tmp_path / 'journal')
+    with CheckpointJournal(path) as journal:
+        journal.open()
+        journal.record('东京 酒店', STATUS_DONE)
+    assert CheckpointJournal(path).load() == {'东京 酒店': STATUS_DONE}
+
+def run_batch(directory, input_file, output_file, *extra):
+    """在子进程中对模拟服务器运行batch_keywords.py"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([str(directory), ROOT])
+    command = [sys.executable, os.path.join(ROOT, 'batch_keywords.py'), str(input_file), '-o', str(output_file),
+               '--no-cache', '-d', '0', '-w', '1'] + list(extra)
+    result = subprocess.run(command, cwd=str(directory), env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stdout[-2000:] + result.stderr[-2000:]
+
+def read_rows(output_file):
+    with open(output_file, 'r', encoding='utf-8-sig', newline='') as f:
+        return list(csv.reader(f))
+
+def test_batch_resume_only_queries_unfinished_keywords(tmp_path, fake_server, fake_config):
+    from benchmarks.keyword_benchmark import write_cli_config
+    
+    service, _ = fake_server
+    write_cli_config(str(tmp_path), fake_config)
+    input_file = tmp_path / 'keywords.txt'
+    output_file = tmp_path / 'results.csv'
+    
+    input_file.write_text('seo tools\nkeyword research\n', encoding='utf-8')
+    before = service.stats()['requests']
+    run_batch(tmp_path, input_file, output_file)
+    # 每个关键词查询特定国家和全球数据两个请求
+    assert service.stats()['requests'] - before == 4
+    assert len(read_rows(output_file)) == 3
+    
+    input_file.write_text('seo tools\nkeyword research\nbacklink checker\n', encoding='utf-8')
+    before = service.stats()['requests']
+    run_batch(tmp_path, input_file, output_file, '--resume')
+    assert service.stats()['requests'] - before == 2
+    
+    rows = read_rows(output_file)
+    # 追加写入，不重复写入表头
+    assert len(rows) == 4
+    assert [row[0] for row in rows[1:]] == ['seo tools', 'keyword research', 'backlink checker']
+    assert CheckpointJournal(CheckpointJournal.path_for(str(output_file))).load() == {
+        'seo tools': STATUS_DONE, 'keyword research': STATUS_DONE, 'backlink checker': STATUS_DONE,
+    }
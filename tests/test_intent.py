@@ -0,0 +1,67 @@
+"""
+关键词意图分类的测试
+"""
+
+import pytest
+
+from ads_api.intent import IntentClassifier, INFORMATIONAL, COMMERCIAL, TRANSACTIONAL
+
+@pytest.fixture(scope='module')
+def classifier():
+    return IntentClassifier()
+
+@pytest.mark.parametrize('keyword, expected', [
+    # 特征词只按整词匹配
+    ('workshop near me', INFORMATIONAL),
+    ('pizza topping ideas', INFORMATIONAL),
+    ('laptop stand', INFORMATIONAL),
+    ('bestow meaning', INFORMATIONAL),
+    ('howard stern', INFORMATIONAL),
+    ('recorder lessons', INFORMATIONAL),
+    # 整词匹配
+    ('shop shoes', TRANSACTIONAL),
+    ('best laptops', COMMERCIAL),
+    ('top laptops', COMMERCIAL),
+    ('laptop vs tablet', COMMERCIAL),
+    # 常见的词形变化
+    ('shopping mall', TRANSACTIONAL),
+    ('cheapest flights', TRANSACTIONAL),
+    ('ordering pizza', TRANSACTIONAL),
+    ('coupons for pizza', TRANSACTIONAL),
+    ('laptop reviews', COMMERCIAL),
+    # 字母和数字之间视为单词边界
+    ('top10 laptops', COMMERCIAL),
+    ('2024best phones', COMMERCIAL),
+    # 标点视为单词边界
+    ('buy-now pay later', TRANSACTIONAL),
+    # 没有特征词时为信息型
+    ('seo tools', INFORMATIONAL),
+])
+def test_word_boundaries(classifier, keyword, expected):
+    assert classifier.classify(keyword) == expected
+
+def test_case_insensitive(classifier):
+    assert classifier.classify('BEST Laptops') == COMMERCIAL
+
+def test_priority_transactional_first(classifier):
+    assert classifier.classify('best price laptops') == TRANSACTIONAL
+    assert classifier.classify('how to compare laptops') == COMMERCIAL
+
+def test_cjk_indicators_match_substrings(classifier):
+    assert classifier.classify('手机价格多少') == TRANSACTIONAL
+    assert classifier.classify('笔记本电脑推荐') == COMMERCIAL
+    assert classifier.classify('如何学习编程') == INFORMATIONAL
+
+def test_custom_indicators():
+    classifier = IntentClassifier({TRANSACTIONAL: ['hire'], COMMERCIAL: ['alternatives']})
+    assert classifier.classify('hire a plumber') == TRANSACTIONAL
+    assert classifier.classify('notion alternatives') == COMMERCIAL
+    assert classifier.classify('buy shoes') == INFORMATIONAL
+
+def test_invalid_type_rejected():
+    with pytest.raises(ValueError):
+        IntentClassifier({'X': ['foo']})
+
+def test_classify_batch_keeps_order(classifier):
+    keywords = ['buy shoes', 'best shoes', 'shoe sizes']
+    assert classifier.classify_batch(keywords) == [TRANSACTIONAL, COMMERCIAL, INFORMATIONAL]
@@ -0,0 +1,94 @@
+"""
+通过模拟服务器测试关键词数据查询 (不需要Google凭据)
+"""
+
+import zlib
+
+import pytest
+
+from ads_api.client import GoogleAdsClient
+from ads_api.idea_cache import IdeaCache
+from ads_api.keyword_data import get_keyword_data, get_keywords_data_batch
+from ads_api.retry import RetryPolicy, CircuitBreaker, classify_error
+from benchmarks.fake_ads_server import FakeKeywordPlanIdeaService, GLOBAL_VOLUME_FACTOR, create_server
+from benchmarks.keyword_benchmark import CUSTOMER_ID, build_config
+
+def expected_volume(keyword):
+    """模拟服务器为关键词生成的美国搜索量 (与fill_metrics相同)"""
+    return 10 * (1 + zlib.crc32(keyword.encode('utf-8')) % 50000)
+
+@pytest.fixture
+def start_server():
+    """启动指定参数的模拟服务器，返回 (服务, GoogleAdsClient)"""
+    servers = []
+    
+    def start(**options):
+        service = FakeKeywordPlanIdeaService(ideas=5, **options)
+        server, port = create_server(service, 0, max_workers=4)
+        servers.append(server)
+        client = GoogleAdsClient(
+            build_config(f'localhost:{port}'),
+            retry_policy=RetryPolicy(max_attempts=2, base_delay=0.01, max_delay=0.05),
+            breaker=CircuitBreaker(cooldown=0.01, max_cooldown=0.05)
+        )
+        return service, client
+    
+    yield start
+    for server in servers:
+        server.stop(0)
+
+def test_get_keyword_data(ads_client):
+    data = get_keyword_data(ads_client, CUSTOMER_ID, 'seo tools', idea_cache=None)
+    assert data['keyword'] == 'seo tools'
+    assert data['volume_us'] == expected_volume('seo tools')
+    assert data['volume_global'] == expected_volume('seo tools') * GLOBAL_VOLUME_FACTOR
+    assert data['competition'] in ('LOW', 'MEDIUM', 'HIGH')
+    assert data['type'] == 'I'
+
+@pytest.mark.parametrize('use_proto_plus', [True, False])
+def test_proto_plus_and_raw_modes_agree(fake_config, use_proto_plus):
+    client = GoogleAdsClient(dict(fake_config, use_proto_plus=use_proto_plus))
+    data = get_keyword_data(client, CUSTOMER_ID, 'buy running shoes', idea_cache=None)
+    assert data['volume_us'] == expected_volume('buy running shoes')
+    assert data['type'] == 'T'
+
+def test_idea_cache_answers_repeated_lookups(fake_server, ads_client):
+    service, _ = fake_server
+    idea_cache = IdeaCache()
+    get_keyword_data(ads_client, CUSTOMER_ID, 'keyword research', idea_cache=idea_cache)
+    before = service.stats()['requests']
+    # 响应中的其他关键词提示也已经缓存
+    data = get_keyword_data(ads_client, CUSTOMER_ID, 'keyword idea 3', idea_cache=idea_cache)
+    assert data['volume_us'] == expected_volume('keyword idea 3')
+    assert service.stats()['requests'] == before
+
+def test_batch_returns_every_keyword(fake_server, ads_client):
+    service, _ = fake_server
+    keywords = ['seo tools', 'keyword research', 'backlink checker']
+    before = service.stats()['requests']
+    results = get_keywords_data_batch(ads_client, CUSTOMER_ID, keywords, idea_cache=None)
+    assert set(results) == set(keywords)
+    assert all(results[keyword]['volume_us'] == expected_volume(keyword) for keyword in keywords)
+    # 一批关键词只发送特定国家和全球两个请求
+    assert service.stats()['requests'] - before == 2
+
+def test_unavailable_is_retried_then_raised(start_server):
+    service, client = start_server(error_rate=1.0)
+    with pytest.raises(Exception) as excinfo:
+        get_keyword_data(client, CUSTOMER_ID, 'seo tools', idea_cache=None)
+    info = classify_error(excinfo.value)
+    assert info.retryable and not info.quota_exhausted
+    # 特定国家和全球请求各尝试max_attempts次
+    assert service.stats()['errors'] == 4
+
+def test_quota_error_classified_as_quota_exhausted(start_server):
+    service, client = start_server(quota_qps=0.001)
+    ideas_service = client.get_service('KeywordPlanIdeaService')
+    request = client.new_keyword_ideas_request(CUSTOMER_ID, '1000', '2840')
+    request.keyword_seed.keywords.append('seo tools')
+    ideas_service.generate_keyword_ideas(request=request)
+    with pytest.raises(Exception) as excinfo:
+        ideas_service.generate_keyword_ideas(request=request)
+    info = classify_error(excinfo.value)
+    assert info.retryable and info.quota_exhausted
+    assert service.stats()['quota_errors'] == 1
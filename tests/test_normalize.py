@@ -0,0 +1,41 @@
+"""
+关键词规范化的测试
+"""
+
+import pytest
+
+from ads_api.normalize import normalize_keyword
+
+@pytest.mark.parametrize('keyword, expected', [
+    ('SEO Tools', 'seo tools'),
+    ('  seo \t tools\n', 'seo tools'),
+    ("men's shoes", 'mens shoes'),
+    ('don’t stop', 'dont stop'),
+    ('what-is seo?', 'what is seo'),
+    ('e.g. foo/bar', 'e g foo bar'),
+    ('c++ tutorial', 'c++ tutorial'),
+    ('C# vs Java', 'c# vs java'),
+    ('AT&T plans', 'at&t plans'),
+    ('Straße', 'strasse'),
+    ('Café', 'café'),
+])
+def test_normalize_keyword(keyword, expected):
+    assert normalize_keyword(keyword) == expected
+
+def test_fullwidth_characters_folded():
+    assert normalize_keyword('ＳＥＯ　Ｔｏｏｌｓ') == 'seo tools'
+
+def test_cjk_text_kept():
+    assert normalize_keyword('東京　ホテル') == '東京 ホテル'
+
+def test_cjk_punctuation_replaced():
+    assert normalize_keyword('如何学习，编程？') == '如何学习 编程'
+
+def test_ascii_and_unicode_paths_agree():
+    # 纯ASCII关键词走快速路径，加入一个非ASCII字符后应得到相同的规范化结果
+    assert normalize_keyword("Men's SEO-Tools!") + ' é' == normalize_keyword("Men's SEO-Tools! É")
+
+def test_idempotent():
+    for keyword in ("Men's SEO-Tools!", 'ＳＥＯ　ツール', 'c++ / c#'):
+        once = normalize_keyword(keyword)
+        assert normalize_keyword(once) == once
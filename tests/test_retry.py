@@ -0,0 +1,270 @@
+"""
+重试策略、错误分类和配额熔断器的测试
+"""
+
+import asyncio
+
+import grpc
+import pytest
+from google.api_core import exceptions as core_exceptions
+
+from ads_api.rate_limit import TokenBucket
+from ads_api.retry import (
+    RetryPolicy, CircuitBreaker, CircuitOpenError, classify_error, call_with_retry,
+    async_call_with_retry, should_fail_over,
+)
+
+class FakeRpcError(grpc.RpcError):
+    """带状态码的gRPC错误 (与grpc库在通道上抛出的错误相同)"""
+    
+    def __init__(self, code):
+        super().__init__(code.name)
+        self._code = code
+    
+    def code(self):
+        return self._code
+
+class CountingLimiter:
+    """记录获取次数的限速器"""
+    
+    def __init__(self):
+        self.acquired = 0
+    
+    def acquire(self):
+        self.acquired += 1
+        return True
+
+def failing(errors, result='ok'):
+    """依次抛出errors中的异常，之后返回result"""
+    calls = []
+    
+    def func():
+        calls.append(None)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    func.calls = calls
+    return func
+
+class TestComputeDelay:
+    """RetryPolicy.compute_delay"""
+    
+    def test_grows_exponentially_without_jitter(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=60.0, jitter=0)
+        assert [policy.compute_delay(attempt) for attempt in range(1, 5)] == [1.0, 2.0, 4.0, 8.0]
+    
+    def test_capped_at_max_delay(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=10.0, jitter=0)
+        assert policy.compute_delay(20) == 10.0
+    
+    def test_jitter_stays_within_range(self):
+        policy = RetryPolicy(base_delay=4.0, max_delay=60.0, jitter=0.5)
+        for _ in range(200):
+            assert 2.0 <= policy.compute_delay(1) <= 4.0
+    
+    def test_server_retry_delay_is_lower_bound(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=60.0, jitter=0)
+        assert policy.compute_delay(1, retry_delay=5.0) == 5.0
+        assert policy.compute_delay(4, retry_delay=0.5) == 8.0
+    
+    def test_server_retry_delay_clamped_to_max_delay(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=60.0, jitter=0)
+        assert policy.compute_delay(1, retry_delay=6 * 3600) == 60.0
+    
+    def test_exceeds_max_delay(self):
+        policy = RetryPolicy(max_delay=60.0)
+        assert policy.exceeds_max_delay(3600)
+        assert not policy.exceeds_max_delay(60.0)
+        assert not policy.exceeds_max_delay(None)
+    
+    def test_max_attempts_at_least_one(self):
+        assert RetryPolicy(max_attempts=0).max_attempts == 1
+
+class TestClassifyError:
+    """classify_error"""
+    
+    @pytest.mark.parametrize('code, retryable, quota', [
+        (grpc.StatusCode.UNAVAILABLE, True, False),
+        (grpc.StatusCode.DEADLINE_EXCEEDED, True, False),
+        (grpc.StatusCode.RESOURCE_EXHAUSTED, True, True),
+        (grpc.StatusCode.INVALID_ARGUMENT, False, False),
+        (grpc.StatusCode.PERMISSION_DENIED, False, False),
+    ])
+    def test_rpc_error(self, code, retryable, quota):
+        info = classify_error(FakeRpcError(code))
+        assert (info.retryable, info.quota_exhausted) == (retryable, quota)
+    
+    @pytest.mark.parametrize('error, retryable, quota', [
+        (core_exceptions.ServiceUnavailable('unavailable'), True, False),
+        (core_exceptions.ResourceExhausted('quota'), True, True),
+        (core_exceptions.InvalidArgument('bad request'), False, False),
+    ])
+    def test_api_core_error(self, error, retryable, quota):
+        info = classify_error(error)
+        assert (info.retryable, info.quota_exhausted) == (retryable, quota)
+    
+    def test_circuit_open_error(self):
+        info = classify_error(CircuitOpenError(12.5))
+        assert info.retryable and info.quota_exhausted
+        assert info.retry_delay == 12.5
+    
+    def test_unknown_error_not_retryable(self):
+        info = classify_error(ValueError('bug'))
+        assert not info.retryable and not info.quota_exhausted
+
+class TestCircuitBreaker:
+    """CircuitBreaker的状态变化"""
+    
+    def test_closed_until_quota_error(self, clock):
+        breaker = CircuitBreaker(cooldown=30.0)
+        assert breaker.remaining() == 0
+        breaker.wait()
+        assert clock.sleeps == []
+    
+    def test_quota_error_opens_for_cooldown(self, clock):
+        breaker = CircuitBreaker(cooldown=30.0)
+        breaker.record_quota_error()
+        assert breaker.remaining() == 30.0
+        breaker.wait()
+        assert clock.sleeps == [30.0]
+        assert breaker.remaining() == 0
+    
+    def test_consecutive_trips_double_up_to_max_cooldown(self, clock):
+        breaker = CircuitBreaker(cooldown=30.0, max_cooldown=100.0)
+        durations = []
+        for _ in range(4):
+            breaker.record_quota_error()
+            durations.append(breaker.remaining())
+            clock.advance(breaker.remaining())
+        assert durations == [30.0, 60.0, 100.0, 100.0]
+    
+    def test_errors_while_open_do_not_double(self, clock):
+        breaker = CircuitBreaker(cooldown=30.0)
+        breaker.record_quota_error()
+        clock.advance(10.0)
+        breaker.record_quota_error()
+        assert breaker.remaining() == 30.0
+    
+    def test_success_resets_consecutive_trips(self, clock):
+        breaker = CircuitBreaker(cooldown=30.0)
+        breaker.record_quota_error()
+        clock.advance(30.0)
+        breaker.record_success()
+        breaker.record_quota_error()
+        assert breaker.remaining() == 30.0
+    
+    def test_server_retry_delay_extends_cooldown(self, clock):
+        breaker = CircuitBreaker(cooldown=30.0, max_cooldown=600.0)
+        breaker.record_quota_error(retry_delay=90.0)
+        assert breaker.remaining() == 90.0
+    
+    def test_server_retry_delay_clamped_to_max_cooldown(self, clock):
+        breaker = CircuitBreaker(cooldown=30.0, max_cooldown=600.0)
+        breaker.record_quota_error(retry_delay=6 * 3600)
+        assert breaker.remaining() == 600.0
+    
+    def test_fail_fast_raises_while_open(self, clock):
+        breaker = CircuitBreaker(cooldown=30.0, fail_fast=True)
+        breaker.record_quota_error()
+        with pytest.raises(CircuitOpenError) as excinfo:
+            breaker.wait()
+        assert excinfo.value.remaining == 30.0
+        assert clock.sleeps == []
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(breaker.wait_async())
+    
+    def test_limiter_rate_halves_and_recovers(self, clock):
+        limiter = TokenBucket(10.0)
+        breaker = CircuitBreaker(cooldown=1.0, limiter=limiter, min_rate_ratio=0.3, recovery=2.0)
+        breaker.record_quota_error()
+        assert limiter.rate == 5.0
+        clock.advance(1.0)
+        breaker.record_quota_error()
+        assert limiter.rate == 3.0
+        breaker.record_success()
+        assert limiter.rate == 6.0
+        breaker.record_success()
+        assert limiter.rate == 10.0
+    
+    def test_should_fail_over(self):
+        quota_error = core_exceptions.ResourceExhausted('quota')
+        assert should_fail_over(quota_error, CircuitBreaker(fail_fast=True))
+        assert not should_fail_over(quota_error, CircuitBreaker())
+        assert not should_fail_over(quota_error, None)
+        assert not should_fail_over(core_exceptions.ServiceUnavailable('unavailable'), CircuitBreaker(fail_fast=True))
+
+class TestCallWithRetry:
+    """call_with_retry"""
+    
+    def test_retries_transient_errors(self, clock):
+        func = failing([FakeRpcError(grpc.StatusCode.UNAVAILABLE)] * 2)
+        policy = RetryPolicy(max_attempts=3, base_delay=1.0, jitter=0)
+        assert call_with_retry(func, policy=policy, breaker=CircuitBreaker()) == 'ok'
+        assert len(func.calls) == 3
+        assert clock.sleeps == [1.0, 2.0]
+    
+    def test_non_retryable_error_raised_immediately(self, clock):
+        func = failing([FakeRpcError(grpc.StatusCode.INVALID_ARGUMENT)])
+        with pytest.raises(FakeRpcError):
+            call_with_retry(func, policy=RetryPolicy(max_attempts=5), breaker=CircuitBreaker())
+        assert len(func.calls) == 1
+    
+    def test_raises_after_max_attempts(self, clock):
+        func = failing([FakeRpcError(grpc.StatusCode.UNAVAILABLE)] * 5)
+        with pytest.raises(FakeRpcError):
+            call_with_retry(func, policy=RetryPolicy(max_attempts=3), breaker=CircuitBreaker())
+        assert len(func.calls) == 3
+    
+    def test_quota_error_trips_breaker(self, clock):
+        breaker = CircuitBreaker(cooldown=30.0)
+        func = failing([core_exceptions.ResourceExhausted('quota')])
+        policy = RetryPolicy(max_attempts=2, base_delay=1.0, jitter=0)
+        assert call_with_retry(func, policy=policy, breaker=breaker) == 'ok'
+        # 先按重试策略等待1秒，再等待熔断结束
+        assert clock.sleeps == [1.0, 29.0]
+    
+    def test_long_server_retry_delay_not_retried(self, clock):
+        func = failing([CircuitOpenError(3600.0)])
+        with pytest.raises(CircuitOpenError):
+            call_with_retry(func, policy=RetryPolicy(max_attempts=5, max_delay=60.0), breaker=CircuitBreaker())
+        assert len(func.calls) == 1
+        assert clock.sleeps == []
+    
+    def test_limiter_charged_per_attempt(self, clock):
+        limiter = CountingLimiter()
+        func = failing([FakeRpcError(grpc.StatusCode.UNAVAILABLE)])
+        call_with_retry(func, policy=RetryPolicy(max_attempts=3), breaker=CircuitBreaker(), limiter=limiter)
+        assert limiter.acquired == 2
+
+class TestAsyncCallWithRetry:
+    """async_call_with_retry"""
+    
+    def test_retries_transient_errors(self):
+        errors = [FakeRpcError(grpc.StatusCode.UNAVAILABLE)]
+        calls = []
+        
+        async def func():
+            calls.append(None)
+            if len(calls) <= len(errors):
+                raise errors[len(calls) - 1]
+            return 'ok'
+        
+        policy = RetryPolicy(max_attempts=3, base_delay=0.01, jitter=0)
+        assert asyncio.run(async_call_with_retry(func, policy=policy, breaker=CircuitBreaker())) == 'ok'
+        assert len(calls) == 2
+    
+    def test_stops_retrying_at_deadline(self):
+        calls = []
+        
+        async def func():
+            calls.append(None)
+            raise FakeRpcError(grpc.StatusCode.UNAVAILABLE)
+        
+        async def run():
+            loop = asyncio.get_running_loop()
+            policy = RetryPolicy(max_attempts=10, base_delay=5.0, jitter=0)
+            await async_call_with_retry(func, policy=policy, breaker=CircuitBreaker(), deadline=loop.time() + 1.0)
+        
+        with pytest.raises(FakeRpcError):
+            asyncio.run(run())
+        assert len(calls) == 1